@@ -73,6 +73,17 @@ class Analysis:
             self.runner.start(num_workers=num_workers, overwrite=overwrite)
             return self.analysis_in_progress
 
+    def get_connection_arguments(self):
+        """Get the arguments that let a worker on another machine join
+
+        Run python -m cellprofiler_core.worker with these arguments. The
+        analysis must be listening on a network interface that the other
+        machine can reach, see get_worker_interface.
+        """
+        with self.runner_lock:
+            assert self.analysis_in_progress
+            return self.runner.get_connection_arguments()
+
     def pause(self):
         with self.runner_lock:
             assert self.analysis_in_progress
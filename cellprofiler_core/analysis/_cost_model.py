@@ -0,0 +1,126 @@
+import time
+
+import numpy
+
+"""The prefix of the per-module execution time measurements"""
+EXECUTION_TIME_PREFIX = "ExecutionTime_"
+
+
+def get_execution_times(measurements, image_numbers):
+    """Get the time each image set took to run
+
+    measurements - measurements holding the ExecutionTime_ features of the
+                   image sets, for instance from a previous run
+
+    image_numbers - the image numbers of the image sets
+
+    Returns a list of the total execution time of each image set's modules
+    in seconds, or None for image sets with no execution times.
+    """
+    times = [None] * len(image_numbers)
+    if len(image_numbers) == 0:
+        return times
+    for feature in measurements.get_feature_names("Image"):
+        if not feature.startswith(EXECUTION_TIME_PREFIX):
+            continue
+        values = measurements["Image", feature, list(image_numbers)]
+        for i, value in enumerate(values):
+            if value is None or numpy.isnan(value):
+                continue
+            times[i] = (times[i] or 0.0) + float(value)
+    return times
+
+
+class CostModel:
+    """Estimate the time taken by the image sets of a run
+
+    An image set's cost is its execution time in an earlier run, if the
+    initial measurements hold one, and otherwise the mean cost of the image
+    sets whose cost is known. Costs are updated with the execution times
+    of image sets as they finish. A job's cost is the sum of its image
+    sets' costs, so a group is estimated from its length when nothing is
+    known about it.
+
+    The remaining time of the run is predicted from the cost of the image
+    sets still to be done and the rate at which cost has been completed
+    since the run started, which accounts for the number of workers.
+    """
+
+    def __init__(self, measurements, image_numbers):
+        image_numbers = [int(image_number) for image_number in image_numbers]
+        self.costs = dict(
+            zip(image_numbers, get_execution_times(measurements, image_numbers))
+        )
+        known = [cost for cost in self.costs.values() if cost is not None]
+        self.known_total = sum(known)
+        self.known_count = len(known)
+        self.remaining_known_cost = self.known_total
+        self.remaining_unknown_count = len(self.costs) - len(known)
+        self.done = set()
+        self.done_cost = 0.0
+        self.start_time = time.time()
+
+    @property
+    def mean_cost(self):
+        """The mean cost of the image sets whose cost is known"""
+        if self.known_count == 0:
+            return 1.0
+        return self.known_total / self.known_count
+
+    def get_image_set_cost(self, image_number):
+        cost = self.costs.get(image_number)
+        return self.mean_cost if cost is None else cost
+
+    def get_job_cost(self, job):
+        """The estimated cost of a job's image sets"""
+        return sum([self.get_image_set_cost(image_number) for image_number in job])
+
+    def sort_jobs(self, jobs):
+        """Order jobs longest first
+
+        Dispatching the longest jobs first keeps a long job from starting
+        last and running on alone after the other workers are done. Jobs
+        of equal cost keep their order.
+        """
+        return sorted(jobs, key=self.get_job_cost, reverse=True)
+
+    def record(self, image_numbers, execution_times):
+        """Update the costs with finished image sets
+
+        image_numbers - the image numbers of the finished image sets
+
+        execution_times - their execution times, see get_execution_times
+        """
+        for image_number, cost in zip(image_numbers, execution_times):
+            if image_number not in self.costs or image_number in self.done:
+                continue
+            self.done.add(image_number)
+            old_cost = self.costs[image_number]
+            if old_cost is None:
+                self.remaining_unknown_count -= 1
+            else:
+                self.remaining_known_cost -= old_cost
+            if cost is None:
+                self.done_cost += self.get_image_set_cost(image_number)
+                continue
+            if old_cost is None:
+                self.known_total += cost
+                self.known_count += 1
+            else:
+                self.known_total += cost - old_cost
+            self.costs[image_number] = cost
+            self.done_cost += cost
+
+    def get_remaining_seconds(self):
+        """Predict the time until the run finishes
+
+        Returns None until an image set has finished.
+        """
+        if self.done_cost <= 0:
+            return None
+        remaining_cost = (
+            max(self.remaining_known_cost, 0)
+            + self.remaining_unknown_count * self.mean_cost
+        )
+        elapsed = time.time() - self.start_time
+        return remaining_cost * elapsed / self.done_cost
@@ -0,0 +1,138 @@
+import collections
+import logging
+import math
+import threading
+
+from ..preferences import get_max_job_batch_size
+
+LOGGER = logging.getLogger(__name__)
+
+"""Estimated cost of a job apart from its image sets and merge, in seconds
+
+This covers the work request and reply, the shared dictionary fetch and
+the copy of the initial measurements in the worker.
+"""
+JOB_OVERHEAD_SECONDS = 0.05
+
+"""The largest share of a job's time that may go to per-job overhead"""
+MAX_OVERHEAD_FRACTION = 0.1
+
+"""The longest a batch of image sets should take to run, in seconds"""
+MAX_JOB_SECONDS = 30.0
+
+"""The weight of the latest observation in the running estimates"""
+SMOOTHING = 0.3
+
+"""Each worker should get at least this many more jobs before the run ends"""
+TAIL_JOBS_PER_WORKER = 2
+
+
+class JobBatcher:
+    """Group the image sets of an ungrouped run into jobs
+
+    Each job costs a round trip to a worker, a fetch of the shared
+    dictionaries, a copy of the initial measurements in the worker and a
+    merge of the reported measurements, whatever the number of image sets
+    in the job. For pipelines that take well under a second per image set,
+    these costs dominate unless several image sets are sent per job.
+
+    The batcher keeps running estimates of the time taken per image set,
+    from the ExecutionTime_ measurements, and of the time taken to merge
+    a job's measurements. It chooses a batch size that keeps the per-job
+    costs below MAX_OVERHEAD_FRACTION of a job's time without making jobs
+    longer than MAX_JOB_SECONDS. Until the first measurements arrive, jobs
+    hold a single image set.
+
+    Batches shrink as the run nears its end so that no job is more than
+    1 / TAIL_JOBS_PER_WORKER of a worker's share of the remaining image
+    sets, and all workers finish at about the same time.
+    """
+
+    def __init__(self, image_numbers=(), max_batch_size=None):
+        self.lock = threading.Lock()
+        self.pending = collections.deque(image_numbers)
+        self.__max_batch_size = max_batch_size
+        self.image_seconds = None
+        self.merge_seconds = None
+
+    @property
+    def max_batch_size(self):
+        if self.__max_batch_size is not None:
+            return self.__max_batch_size
+        return get_max_job_batch_size()
+
+    def add(self, image_numbers):
+        """Add image sets to be dispatched"""
+        with self.lock:
+            self.pending.extend(image_numbers)
+
+    def __len__(self):
+        return len(self.pending)
+
+    def get_batch_size(self, worker_count):
+        """The number of image sets to put in the next job
+
+        worker_count - the number of workers sharing the remaining image sets
+        """
+        with self.lock:
+            return self.__get_batch_size(worker_count)
+
+    def __get_batch_size(self, worker_count):
+        if self.image_seconds is None:
+            return 1
+        image_seconds = max(self.image_seconds, 1e-6)
+        overhead = JOB_OVERHEAD_SECONDS + (self.merge_seconds or 0)
+        batch_size = math.ceil(overhead / (MAX_OVERHEAD_FRACTION * image_seconds))
+        batch_size = min(
+            batch_size,
+            int(MAX_JOB_SECONDS / image_seconds),
+            math.ceil(
+                len(self.pending) / (TAIL_JOBS_PER_WORKER * max(worker_count, 1))
+            ),
+            self.max_batch_size,
+        )
+        return max(batch_size, 1)
+
+    def next_job(self, worker_count):
+        """Take the image numbers of the next job
+
+        worker_count - the number of workers sharing the remaining image sets
+
+        Returns None if there are no image sets left.
+        """
+        with self.lock:
+            if len(self.pending) == 0:
+                return None
+            batch_size = self.__get_batch_size(worker_count)
+            return [self.pending.popleft() for _ in range(batch_size)]
+
+    def record(self, execution_times, merge_seconds):
+        """Update the estimates with a finished job
+
+        execution_times - the execution times of the job's image sets, see
+                          get_execution_times
+
+        merge_seconds - the time it took to merge the job's measurements
+
+        Image sets whose execution time isn't known are left out, and the
+        estimates are unchanged if no times are known.
+        """
+        execution_times = [
+            seconds for seconds in execution_times if seconds is not None
+        ]
+        if len(execution_times) == 0:
+            return
+        image_seconds = sum(execution_times) / len(execution_times)
+        with self.lock:
+            self.image_seconds = self.__smooth(self.image_seconds, image_seconds)
+            self.merge_seconds = self.__smooth(self.merge_seconds, merge_seconds)
+        LOGGER.debug(
+            f"Estimated {self.image_seconds:.3f} sec per image set and "
+            f"{self.merge_seconds:.3f} sec per merge"
+        )
+
+    @staticmethod
+    def __smooth(estimate, value):
+        if estimate is None:
+            return value
+        return estimate + SMOOTHING * (value - estimate)
@@ -1,4 +1,5 @@
 import collections
+import copy
 import io
 import logging
 import os
@@ -7,12 +8,16 @@ import subprocess
 import sys
 import tempfile
 import threading
+import time
 from typing import List, Any
 import re
+import secrets
 
 import numpy
 import psutil
 
+from ._cost_model import CostModel, get_execution_times
+from ._job_batcher import JobBatcher
 from .event import Finished
 from .event import Paused
 from .event import Progress
@@ -22,6 +27,7 @@ from . import reply as anareply
 from . import request as anarequest
 from ..image import ImageSetList
 from ..measurement import Measurements
+from ..measurement import MeasurementsDelta
 from ..utilities.measurement import load_measurements_from_buffer
 from ..pipeline import dump
 from ..preferences import get_plugin_directory
@@ -29,11 +35,14 @@ from ..preferences import get_conserve_memory
 from ..preferences import get_temporary_directory
 from ..preferences import get_always_continue
 from ..preferences import preferences_as_dict
+from ..preferences import get_worker_advertised_host
+from ..preferences import get_worker_interface
 from ..utilities.analysis import close_all_on_exec, start_daemon_thread
 from ..utilities.analysis import find_analysis_worker_source
 from ..utilities.analysis import find_python
 from ..utilities.analysis import find_worker_env
 from ..utilities.zmq import start_boundary, Boundary
+from ..utilities.zmq import get_supported_codecs, get_transfer_statistics
 from ..utilities.zmq.communicable.reply import Reply
 from ..workspace import Workspace
 
@@ -74,6 +83,9 @@ class Runner:
         STATUS_FINISHED_WAITING,
         STATUS_DONE,
     ]
+    # number of status changes to accumulate before writing them to the
+    # measurements
+    STATUS_BATCH_SIZE = 1000
 
     def __init__(
         self, analysis_id, pipeline, initial_measurements_buf, event_listener,
@@ -95,18 +107,31 @@ class Runner:
 
         self.workers = []
 
+        # The routing IDs of the workers, local or remote, that asked for work
+        self.worker_ids = set()
+
         # We use a queue size of 10 because we keep measurements in memory (as
-        # their HDF5 file contents) until they get merged into the full
-        # measurements set.  If at some point, this size is too limiting, we
-        # should have jobserver() call load_measurements_from_buffer() rather
-        # than interface() doing so.  Currently, passing measurements in this
-        # way seems like it might be buggy:
-        # http://code.google.com/p/h5py/issues/detail?id=244
+        # measurement deltas or, from older workers, their HDF5 file contents)
+        # until they get merged into the full measurements set.
         self.received_measurements_queue = queue.Queue(maxsize=10)
 
         self.shared_dicts = None
 
+        # Changes whenever shared_dicts does, so that workers holding the
+        # current dictionaries don't have to fetch them again
+        self.shared_dicts_version = 0
+
+        # Groups image sets into jobs for ungrouped runs
+        self.job_batcher = None
+
+        # Estimates the time taken by each image set
+        self.cost_model = None
+
+        self.reset_image_set_status([])
+
         self.boundary = None
+        # The secret that workers send with each request, new for each start
+        self.token = None
         self.interface_thread = None
         self.jobserver_thread = None
 
@@ -128,7 +153,15 @@ class Runner:
         # that their stdin has closed.
         self.stop_workers()
 
-        self.boundary = Boundary("tcp://127.0.0.1")
+        # Only the workers given the token can talk to the boundary, which
+        # may be listening on all of this machine's interfaces.
+        self.token = secrets.token_hex(16)
+        self.boundary = Boundary(
+            f"tcp://{get_worker_interface()}",
+            advertised_host=get_worker_advertised_host(),
+            token=self.token,
+        )
+        self.worker_ids = set()
 
         start_signal = threading.Semaphore(0)
         self.interface_thread = start_daemon_thread(
@@ -220,6 +253,7 @@ class Runner:
         acknowledged_thread_start = False
         measurements = None
         workspace = None
+        self.job_batcher = None
         try:
             # listen for pipeline events, and pass them upstream
             self.pipeline.add_listener(lambda pipe, evt: self.post_event(evt))
@@ -242,6 +276,7 @@ class Runner:
 
             # The shared dicts are needed in jobserver()
             self.shared_dicts = [m.get_dictionary() for m in self.pipeline.modules()]
+            self.shared_dicts_version += 1
             workspace = Workspace(
                 self.pipeline, None, None, None, measurements, ImageSetList(),
             )
@@ -306,6 +341,8 @@ class Runner:
             measurements["Image", self.STATUS, new_image_sets_to_process] = \
                 [self.STATUS_UNPROCESSED] * len(new_image_sets_to_process)
             image_sets_to_process = new_image_sets_to_process
+            self.reset_image_set_status(image_sets_to_process)
+            self.cost_model = CostModel(measurements, image_sets_to_process)
 
             # Find image groups.  These are written into measurements prior to
             # analysis.  Groups are processed as a single job.
@@ -326,11 +363,15 @@ class Runner:
                     [isn for _, isn in sorted(job_groups[group_number])]
                     for group_number in sorted(job_groups)
                 ]
+                job_groups = self.cost_model.sort_jobs(job_groups)
             else:
                 worker_runs_post_group = False  # prepare_group will be run in worker, but post_group is below.
                 job_groups = [
                     [image_set_number] for image_set_number in image_sets_to_process
                 ]
+                # The jobserver takes batches of image sets from the job
+                # batcher once the first image set is done.
+                self.job_batcher = JobBatcher()
 
             # XXX - check that any constructed groups are complete, i.e.,
             # image_set_start and image_set_end shouldn't carve them up.
@@ -356,54 +397,73 @@ class Runner:
 
                 # gather measurements
                 while not self.received_measurements_queue.empty():
-                    image_numbers, buf = self.received_measurements_queue.get()
+                    (
+                        image_numbers,
+                        buf,
+                        delta,
+                    ) = self.received_measurements_queue.get()
                     image_numbers = [int(i) for i in image_numbers]
-                    recd_measurements = load_measurements_from_buffer(buf)
+                    merge_start = time.perf_counter()
+                    if delta is not None:
+                        recd_measurements = MeasurementsDelta.from_state(delta)
+                    else:
+                        recd_measurements = load_measurements_from_buffer(buf)
                     self.copy_recieved_measurements(
                         recd_measurements, measurements, image_numbers
                     )
-                    recd_measurements.close()
+                    if delta is None:
+                        recd_measurements.close()
                     del recd_measurements
+                    merge_seconds = time.perf_counter() - merge_start
+                    execution_times = get_execution_times(measurements, image_numbers)
+                    self.cost_model.record(image_numbers, execution_times)
+                    if self.job_batcher is not None:
+                        self.job_batcher.record(execution_times, merge_seconds)
 
                 # check for jobs in progress
                 while not self.in_process_queue.empty():
                     image_set_numbers = self.in_process_queue.get()
-                    for image_set_number in image_set_numbers:
-                        measurements[
-                            "Image", self.STATUS, int(image_set_number),
-                        ] = self.STATUS_IN_PROCESS
+                    self.set_image_set_status(
+                        image_set_numbers, self.STATUS_IN_PROCESS
+                    )
 
                 # check for finished jobs that haven't returned measurements, yet
                 while not self.finished_queue.empty():
                     finished_req = self.finished_queue.get()
-                    measurements[
-                        "Image", self.STATUS, int(finished_req.image_set_number),
-                    ] = self.STATUS_FINISHED_WAITING
+                    self.set_image_set_status(
+                        [finished_req.image_set_number], self.STATUS_FINISHED_WAITING
+                    )
                     if waiting_for_first_imageset:
                         assert isinstance(
                             finished_req, anareply.ImageSetSuccessWithDictionary,
                         )
                         self.shared_dicts = finished_req.shared_dicts
+                        self.shared_dicts_version += 1
                         waiting_for_first_imageset = False
                         assert len(self.shared_dicts) == len(self.pipeline.modules())
                         for worker_dict, module in zip(self.shared_dicts, self.pipeline.modules()):
-                            # Apply those imported states to the master pipeline
-                            module.get_dictionary().update(worker_dict)
+                            # Apply those imported states to the master pipeline.
+                            # The received arrays are read-only, so the modules
+                            # get copies they can change.
+                            module.get_dictionary().update(copy.deepcopy(worker_dict))
                         # if we had jobs waiting for the first image set to finish,
                         # queue them now that the shared state is available.
-                        for job in job_groups:
-                            self.work_queue.put((job, worker_runs_post_group, False))
+                        self.job_batcher.add(
+                            [image_set_number for job in job_groups for image_set_number in job]
+                        )
+                        with self.jobserver_work_cv:
+                            self.jobserver_work_cv.notify()
                     finished_req.reply(anareply.Ack())
 
                 # check progress and report
-                counts = collections.Counter(
-                    measurements["Image", self.STATUS, image_set_number,]
-                    for image_set_number in image_sets_to_process
+                counts = self.get_status_counts()
+                self.post_event(
+                    Progress(counts, self.cost_model.get_remaining_seconds())
                 )
-                self.post_event(Progress(counts))
 
                 # Are we finished?
                 if counts[self.STATUS_DONE] == len(image_sets_to_process):
+                    self.flush_image_set_status(measurements, force=True)
                     last_image_number = measurements.get_image_numbers()[-1]
                     measurements.image_set_number = last_image_number
                     if not worker_runs_post_group:
@@ -416,6 +476,7 @@ class Runner:
                     self.pipeline.post_run(workspace)
                     break
 
+                self.flush_image_set_status(measurements)
                 measurements.flush()
                 # not done, wait for more work
                 with self.interface_work_cv:
@@ -434,9 +495,12 @@ class Runner:
             #
             if not acknowledged_thread_start:
                 start_signal.release()
+            if measurements is not None:
+                self.flush_image_set_status(measurements, force=True)
             if posted_analysis_started:
                 was_cancelled = self.cancelled
                 self.post_event(Finished(measurements, was_cancelled))
+            LOGGER.info(f"Worker messages so far: {get_transfer_statistics()}")
         self.analysis_id = False  # this will cause the jobserver thread to exit
 
     def copy_recieved_measurements(
@@ -444,7 +508,8 @@ class Runner:
     ):
         """Copy the received measurements to the local process' measurements
 
-        recd_measurements - measurements received from worker
+        recd_measurements - measurements received from worker, either a
+                            Measurements or a MeasurementsDelta
 
         measurements - local measurements = destination for copy
 
@@ -485,8 +550,79 @@ class Runner:
                     measurements[o, feature, image_numbers] = recd_measurements[
                         o, feature, image_numbers
                     ]
-        for image_set_number in image_numbers:
-            measurements["Image", self.STATUS, image_set_number] = self.STATUS_DONE
+        self.set_image_set_status(image_numbers, self.STATUS_DONE)
+
+    def reset_image_set_status(self, image_numbers):
+        """Start tracking the processing status of the given image sets
+
+        image_numbers - the image numbers to be processed. Their status
+                        should already be STATUS_UNPROCESSED in the
+                        measurements.
+
+        The status of each image set is kept in a table indexed by image
+        number and changes are written to the measurements in batches by
+        flush_image_set_status.
+        """
+        image_numbers = numpy.asarray(image_numbers, int)
+        size = 0 if len(image_numbers) == 0 else numpy.max(image_numbers) + 1
+        self.image_set_status = numpy.full(size, -1, numpy.int8)
+        code = self.STATUSES.index(self.STATUS_UNPROCESSED)
+        self.image_set_status[image_numbers] = code
+        self.status_counts = numpy.zeros(len(self.STATUSES), int)
+        self.status_counts[code] = len(image_numbers)
+        self.pending_status = {}
+
+    def set_image_set_status(self, image_numbers, status):
+        """Record a change in the processing status of some image sets
+
+        image_numbers - the image numbers whose status changed
+
+        status - one of STATUSES
+        """
+        code = self.STATUSES.index(status)
+        for image_number in image_numbers:
+            image_number = int(image_number)
+            self.pending_status[image_number] = status
+            if image_number >= len(self.image_set_status):
+                continue
+            old_code = self.image_set_status[image_number]
+            if old_code >= 0:
+                self.status_counts[old_code] -= 1
+                self.status_counts[code] += 1
+                self.image_set_status[image_number] = code
+
+    def flush_image_set_status(self, measurements, force=False):
+        """Write pending status changes to the measurements
+
+        measurements - the measurements for the analysis
+
+        force - write the changes even if there are fewer than
+                STATUS_BATCH_SIZE of them.
+        """
+        if len(self.pending_status) == 0 or (
+            not force and len(self.pending_status) < self.STATUS_BATCH_SIZE
+        ):
+            return
+        image_numbers_by_status = {}
+        for image_number, status in self.pending_status.items():
+            image_numbers_by_status.setdefault(status, []).append(image_number)
+        for status, image_numbers in image_numbers_by_status.items():
+            measurements["Image", self.STATUS, image_numbers] = [status] * len(
+                image_numbers
+            )
+        self.pending_status = {}
+
+    def get_status_counts(self):
+        """Return a Counter of the number of image sets in each status"""
+        return collections.Counter(
+            dict(
+                [
+                    (status, int(count))
+                    for status, count in zip(self.STATUSES, self.status_counts)
+                    if count > 0
+                ]
+            )
+        )
 
     def jobserver(self, start_signal):
         # this server subthread should be very lightweight, as it has to handle
@@ -534,6 +670,7 @@ class Runner:
                     Reply(
                         pipeline_blob=numpy.array(self.pipeline_as_string()),
                         preferences=preferences_as_dict(),
+                        codecs=get_supported_codecs(),
                     )
                 )
                 LOGGER.debug("Replied to pipeline preferences request")
@@ -542,13 +679,15 @@ class Runner:
                 req.reply(Reply(buf=self.initial_measurements_buf))
                 LOGGER.debug("Replied to initial measurements request")
             elif isinstance(req, anarequest.Work):
-                if not self.work_queue.empty():
+                self.worker_ids.add(tuple(getattr(req, "_routing", ())))
+                next_job = self.get_next_job()
+                if next_job is not None:
                     LOGGER.debug("Received work request")
                     (
                         job,
                         worker_runs_post_group,
                         wants_dictionary,
-                    ) = self.work_queue.get()
+                    ) = next_job
                     req.reply(
                         anareply.Work(
                             image_set_numbers=job,
@@ -573,11 +712,24 @@ class Runner:
                 LOGGER.debug("Enqueued ImageSetSuccess")
             elif isinstance(req, anarequest.SharedDictionary):
                 LOGGER.debug("Received shared dictionary request")
-                req.reply(anareply.SharedDictionary(dictionaries=self.shared_dicts))
+                # Read the version before the dictionaries. If they change
+                # in between, the worker gets the new dictionaries with the
+                # old version and fetches them again next time.
+                version = self.shared_dicts_version
+                if getattr(req, "version", None) == version:
+                    req.reply(anareply.SharedDictionaryUnchanged())
+                else:
+                    req.reply(
+                        anareply.SharedDictionary(
+                            dictionaries=self.shared_dicts, version=version
+                        )
+                    )
                 LOGGER.debug("Sent shared dictionary reply")
             elif isinstance(req, anarequest.MeasurementsReport):
                 LOGGER.debug("Received measurements report")
-                self.queue_received_measurements(req.image_set_numbers, req.buf)
+                self.queue_received_measurements(
+                    req.image_set_numbers, req.buf, req.delta
+                )
                 req.reply(anareply.Ack())
                 LOGGER.debug("Acknowledged measurements report")
             elif isinstance(req, anarequest.AnalysisCancel):
@@ -615,6 +767,29 @@ class Runner:
     def queue_job(self, image_set_number):
         self.work_queue.put(image_set_number)
 
+    def get_next_job(self):
+        """Get the next job to dispatch to a worker
+
+        Returns a tuple of the image set numbers, whether the worker runs
+        post_group and whether it should send its shared dictionaries, or
+        None if there's no work to be done at the moment.
+        """
+        if not self.work_queue.empty():
+            return self.work_queue.get()
+        if self.job_batcher is not None:
+            job = self.job_batcher.next_job(self.get_worker_count())
+            if job is not None:
+                return job, False, False
+        return None
+
+    def get_worker_count(self):
+        """The number of workers sharing the analysis
+
+        This counts the workers started by the runner and the workers that
+        joined from other machines once they have asked for work.
+        """
+        return max(len(self.workers), len(self.worker_ids))
+
     def queue_dispatched_job(self, job):
         self.in_process_queue.put(job)
         # notify interface thread
@@ -627,8 +802,8 @@ class Runner:
         with self.interface_work_cv:
             self.interface_work_cv.notify()
 
-    def queue_received_measurements(self, image_set_numbers, measurements):
-        self.received_measurements_queue.put((image_set_numbers, measurements))
+    def queue_received_measurements(self, image_set_numbers, measurements, delta=None):
+        self.received_measurements_queue.put((image_set_numbers, measurements, delta))
         # notify interface thread
         with self.interface_work_cv:
             self.interface_work_cv.notify()
@@ -638,6 +813,23 @@ class Runner:
         dump(self.pipeline, s, version=5, save_image_plane_details=False)
         return s.getvalue()
 
+    def get_connection_arguments(self):
+        """The worker arguments that connect a worker to this analysis
+
+        A worker on another machine can join the analysis by running
+        python -m cellprofiler_core.worker with these arguments.
+        """
+        return [
+            "--analysis-id",
+            self.analysis_id,
+            "--work-server",
+            self.boundary.request_address,
+            "--notify-server",
+            self.boundary.keepalive_address,
+            "--token",
+            self.token,
+        ]
+
     def start_workers(self, num=None):
         if self.workers:
             return
@@ -648,16 +840,16 @@ class Runner:
         boundary = self.boundary
 
         LOGGER.info("Starting workers on address %s" % boundary.request_address)
+        if not boundary.advertised_host.startswith("127."):
+            LOGGER.info(
+                "Workers on other machines can join with: "
+                "python -m cellprofiler_core.worker "
+                + " ".join(self.get_connection_arguments())
+            )
 
         close_fds = False
 
-        aw_args = [
-            "--analysis-id",
-            self.analysis_id,
-            "--work-server",
-            boundary.request_address,
-            "--notify-server",
-            boundary.keepalive_address,
+        aw_args = self.get_connection_arguments() + [
             "--plugins-directory",
             get_plugin_directory(),
             "--conserve-memory",
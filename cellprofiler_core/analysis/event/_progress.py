@@ -1,3 +1,5 @@
 class Progress:
-    def __init__(self, counts):
+    def __init__(self, counts, remaining_seconds=None):
         self.counts = counts
+        # The predicted time until the analysis finishes or None if unknown
+        self.remaining_seconds = remaining_seconds
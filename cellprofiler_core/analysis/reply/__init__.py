@@ -9,4 +9,5 @@ from ._no_work import NoWork
 from ._omero_login import OmeroLogin
 from ._server_exited import ServerExited
 from ._shared_dictionary import SharedDictionary
+from ._shared_dictionary_unchanged import SharedDictionaryUnchanged
 from ._work import Work
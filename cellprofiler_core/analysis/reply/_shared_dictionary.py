@@ -2,8 +2,8 @@ from ...utilities.zmq.communicable.reply import Reply
 
 
 class SharedDictionary(Reply):
-    def __init__(self, dictionaries=None):
-        Reply.__init__(self, dictionaries=dictionaries)
+    def __init__(self, dictionaries=None, version=None):
+        Reply.__init__(self, dictionaries=dictionaries, version=version)
 
         if dictionaries is None:
             dictionaries = [{}]
@@ -0,0 +1,7 @@
+from ...utilities.zmq.communicable.reply import Reply
+
+
+class SharedDictionaryUnchanged(Reply):
+    """The worker's copy of the shared dictionaries is current"""
+
+    pass
@@ -2,4 +2,5 @@ from ...utilities.zmq.communicable.request import AnalysisRequest
 
 
 class Display(AnalysisRequest):
-    pass
+    # The UI's module may change the data in place
+    copy_arrays = True
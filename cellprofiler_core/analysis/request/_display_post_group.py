@@ -6,6 +6,9 @@ class DisplayPostGroup(AnalysisRequest):
 
     This is a message sent to the UI from the analysis worker"""
 
+    # The UI's module may change the display data in place
+    copy_arrays = True
+
     def __init__(self, analysis_id, module_num, display_data, image_set_number):
         AnalysisRequest.__init__(
             self,
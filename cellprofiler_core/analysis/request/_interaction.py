@@ -2,4 +2,5 @@ from ...utilities.zmq.communicable.request import AnalysisRequest
 
 
 class Interaction(AnalysisRequest):
-    pass
+    # The UI's module may change the data in place
+    copy_arrays = True
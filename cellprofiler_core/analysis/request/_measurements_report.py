@@ -2,9 +2,23 @@ from ...utilities.zmq.communicable.request import AnalysisRequest
 
 
 class MeasurementsReport(AnalysisRequest):
-    def __init__(self, analysis_id, buf, image_set_numbers=None):
+    """Report the measurements for a job's image sets
+
+    buf - the contents of a complete measurements HDF5 file or None
+
+    image_set_numbers - the image numbers processed by the job
+
+    delta - the state of a MeasurementsDelta holding only the measurements
+            written during the job. If supplied, buf is ignored.
+    """
+
+    def __init__(self, analysis_id, buf, image_set_numbers=None, delta=None):
         AnalysisRequest.__init__(
-            self, analysis_id, buf=buf, image_set_numbers=image_set_numbers
+            self,
+            analysis_id,
+            buf=buf,
+            image_set_numbers=image_set_numbers,
+            delta=delta,
         )
         if image_set_numbers is None:
             image_set_numbers = []
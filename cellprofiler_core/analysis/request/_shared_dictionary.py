@@ -2,5 +2,13 @@ from ...utilities.zmq.communicable.request import AnalysisRequest
 
 
 class SharedDictionary(AnalysisRequest):
-    def __init__(self, analysis_id, module_num=-1):
-        AnalysisRequest.__init__(self, analysis_id, module_num=module_num)
+    def __init__(self, analysis_id, module_num=-1, version=None):
+        """Request the modules' shared dictionaries
+
+        version - the version of the dictionaries that the worker already
+                  holds, if any. The reply is SharedDictionaryUnchanged if
+                  they are still current.
+        """
+        AnalysisRequest.__init__(
+            self, analysis_id, module_num=module_num, version=version
+        )
@@ -54,6 +54,8 @@ C_C = "C"
 C_Z = "Z"
 C_T = "T"
 C_TILE = "TileXYWH"
+C_TILE_X = "TileX"
+C_TILE_Y = "TileY"
 C_CHANNEL_NAME = "ChannelName"
 C_COLOR_FORMAT = "ColorFormat"
 C_MONOCHROME = "monochrome"
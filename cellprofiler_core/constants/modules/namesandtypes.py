@@ -156,7 +156,9 @@ IDX_FIRST_ASSIGNMENT_V4 = 7
 IDX_FIRST_ASSIGNMENT_V5 = 8
 IDX_FIRST_ASSIGNMENT_V6 = 9
 IDX_FIRST_ASSIGNMENT_V7 = 13
-IDX_FIRST_ASSIGNMENT = 13
+IDX_FIRST_ASSIGNMENT_V9 = 13
+IDX_FIRST_ASSIGNMENT_V10 = 14
+IDX_FIRST_ASSIGNMENT = 17
 
 NUM_ASSIGNMENT_SETTINGS_V2 = 4
 NUM_ASSIGNMENT_SETTINGS_V3 = 5
@@ -2,6 +2,7 @@ from ._grayscale_image import GrayscaleImage
 from ._image import Image
 from ._image_set import ImageSet
 from ._image_set_list import ImageSetList
+from ._plane_cache import PlaneCache, get_plane_cache
 from ._rgb_image import RGBImage
 from .abstract_image import AbstractImage
 from .abstract_image import CallbackImage
@@ -35,6 +35,11 @@ class Image:
     scale - the scaling suggested by the initial image format (e.g., 4095 for
     a 12-bit a/d converter).
 
+    lazy - true to keep an integer image in its native dtype and convert it
+    to float only when pixel_data is first read. The native array stays
+    available through raw_pixel_data, so that modules which can work on
+    integers never pay for the conversion.
+
     Resolution of mask and cropping_mask properties:
 
     The Image class looks for the mask and cropping_mask in the following
@@ -66,10 +71,19 @@ class Image:
         scale=None,
         dimensions=2,
         spacing=None,
-        channelstack=False
+        channelstack=False,
+        lazy=False,
     ):
         self.__image = None
 
+        self.__raw_image = None
+
+        self.__raw_offset = 0.0
+
+        self.__raw_scale = 1.0
+
+        self.__raw_fix_range = False
+
         self.__mask = None
 
         self.__has_mask = False
@@ -88,7 +102,7 @@ class Image:
         self.__scale = scale
 
         if image is not None:
-            self.set_image(image, convert)
+            self.set_image(image, convert, lazy)
 
         if mask is not None:
             self.mask = mask
@@ -107,7 +121,7 @@ class Image:
 
     @property
     def multichannel(self):
-        return True if self.pixel_data.ndim == self.dimensions + 1 else False
+        return True if self.raw_pixel_data.ndim == self.dimensions + 1 else False
 
     @property
     def volumetric(self):
@@ -131,10 +145,21 @@ class Image:
         self.__spacing = spacing
 
     def get_image(self):
-        """Return the primary image"""
+        """Return the primary image
+
+        A lazily converted integer image is converted to float the first
+        time it is read and the float image is kept for later reads.
+        """
+        if self.__image is None and self.__raw_image is not None:
+            img = self.__raw_image.astype(numpy.float32)
+            img -= self.__raw_offset
+            img /= self.__raw_scale
+            if self.__raw_fix_range:
+                numpy.clip(img, 0, 1, out=img)
+            self.__image = img
         return self.__image
 
-    def set_image(self, image, convert=True):
+    def set_image(self, image, convert=True, lazy=False):
         """Set the primary image
 
         Convert the image to a numpy array of dtype = np.float64.
@@ -143,56 +168,109 @@ class Image:
         * uint8/16/32/64: scale 0 to max to 0 to 1
         * int8/16/32/64: scale min to max to 0 to 1
         * logical: save as is (and get if must_be_binary)
+
+        If lazy is True, an integer image is kept as is and only converted
+        when it is read, see get_image.
         """
         img = numpy.asanyarray(image)
+        self.__raw_image = None
         if img.dtype.name == "bool" or not convert:
             self.__image = img
             return
+        mval, scale, fix_range = self.get_conversion(img.dtype)
+        if lazy and issubclass(img.dtype.type, numpy.integer):
+            self.__image = None
+            self.__raw_image = img
+            self.__raw_offset = mval
+            self.__raw_scale = scale
+            self.__raw_fix_range = fix_range
+            return
+        # Avoid temporaries by doing the shift/scale in place.
+        img = img.astype(numpy.float32)
+        img -= mval
+        img /= scale
+        if fix_range:
+            # These types will always have ranges between 0 and 1. Make it so.
+            numpy.clip(img, 0, 1, out=img)
+        self.__image = img
+
+    @staticmethod
+    def get_conversion(dtype):
+        """Get the offset and scale that map a dtype's values to 0 to 1
+
+        Returns a tuple of the offset to subtract, the scale to divide by
+        and whether the result needs to be clipped to 0 to 1.
+        """
         mval = 0.0
         scale = 1.0
         fix_range = False
-        if issubclass(img.dtype.type, numpy.floating):
+        if issubclass(dtype.type, numpy.floating):
             pass
-        elif img.dtype.type is numpy.uint8:
+        elif dtype.type is numpy.uint8:
             scale = math.pow(2.0, 8.0) - 1
-        elif img.dtype.type is numpy.uint16:
+        elif dtype.type is numpy.uint16:
             scale = math.pow(2.0, 16.0) - 1
-        elif img.dtype.type is numpy.uint32:
+        elif dtype.type is numpy.uint32:
             scale = math.pow(2.0, 32.0) - 1
-        elif img.dtype.type is numpy.uint64:
+        elif dtype.type is numpy.uint64:
             scale = math.pow(2.0, 64.0) - 1
-        elif img.dtype.type is numpy.int8:
+        elif dtype.type is numpy.int8:
             scale = math.pow(2.0, 8.0)
             mval = -scale / 2.0
             scale -= 1
             fix_range = True
-        elif img.dtype.type is numpy.int16:
+        elif dtype.type is numpy.int16:
             scale = math.pow(2.0, 16.0)
             mval = -scale / 2.0
             scale -= 1
             fix_range = True
-        elif img.dtype.type is numpy.int32:
+        elif dtype.type is numpy.int32:
             scale = math.pow(2.0, 32.0)
             mval = -scale / 2.0
             scale -= 1
             fix_range = True
-        elif img.dtype.type is numpy.int64:
+        elif dtype.type is numpy.int64:
             scale = math.pow(2.0, 64.0)
             mval = -scale / 2.0
             scale -= 1
             fix_range = True
-        # Avoid temporaries by doing the shift/scale in place.
-        img = img.astype(numpy.float32)
-        img -= mval
-        img /= scale
-        if fix_range:
-            # These types will always have ranges between 0 and 1. Make it so.
-            numpy.clip(img, 0, 1, out=img)
-        self.__image = img
+        return mval, scale, fix_range
 
     image = property(get_image, set_image)
     pixel_data = property(get_image, set_image)
 
+    @property
+    def raw_pixel_data(self):
+        """The image in the dtype it was set with
+
+        For a lazily converted integer image, this is the native integer
+        array, which is not converted to float. pixel_data is
+        (raw_pixel_data - raw_offset) / raw_scale. For any other image, this
+        is pixel_data.
+        """
+        if self.__raw_image is not None:
+            return self.__raw_image
+        return self.get_image()
+
+    @property
+    def raw_offset(self):
+        """The offset subtracted from raw_pixel_data to make pixel_data"""
+        if self.__raw_image is not None:
+            return self.__raw_offset
+        return 0.0
+
+    @property
+    def raw_scale(self):
+        """The divisor that scales raw_pixel_data to pixel_data"""
+        if self.__raw_image is not None:
+            return self.__raw_scale
+        return 1.0
+
+    @property
+    def is_converted(self):
+        """False if the image is an integer image that hasn't been converted yet"""
+        return self.__image is not None or self.__raw_image is None
+
     @property
     def has_parent_image(self):
         """True if this image has a defined parent"""
@@ -234,7 +312,7 @@ class Image:
 
             return self.crop_image_similarly(mask)
 
-        image = self.image
+        image = self.raw_pixel_data
 
         #
         # Exclude channel, if present, from shape
@@ -311,18 +389,18 @@ class Image:
 
         image - a np.ndarray to be cropped (of any type)
         """
-        if image.shape[:2] == self.pixel_data.shape[:2]:
+        if image.shape[:2] == self.raw_pixel_data.shape[:2]:
             # Same size - no cropping needed
             return image
         if any(
             [
                 my_size > other_size
-                for my_size, other_size in zip(self.pixel_data.shape, image.shape)
+                for my_size, other_size in zip(self.raw_pixel_data.shape, image.shape)
             ]
         ):
             raise ValueError(
                 "Image to be cropped is smaller: %s vs %s"
-                % (repr(image.shape), repr(self.pixel_data.shape))
+                % (repr(image.shape), repr(self.raw_pixel_data.shape))
             )
         if not self.has_crop_mask:
             raise RuntimeError(
@@ -330,10 +408,10 @@ class Image:
                 "Use the Crop and Align modules to match images of different sizes."
             )
         cropped_image = crop_image(image, self.crop_mask)
-        if cropped_image.shape[0:2] != self.pixel_data.shape[0:2]:
+        if cropped_image.shape[0:2] != self.raw_pixel_data.shape[0:2]:
             raise ValueError(
                 "Cropped image is not the same size as the reference image: %s vs %s"
-                % (repr(cropped_image.shape), repr(self.pixel_data.shape))
+                % (repr(cropped_image.shape), repr(self.raw_pixel_data.shape))
             )
         return cropped_image
 
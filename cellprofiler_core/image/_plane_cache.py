@@ -0,0 +1,125 @@
+import collections
+import logging
+import threading
+
+from ..preferences import get_prefetch_memory_mb
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PlaneCache:
+    """A bounded, thread-safe cache of decoded image planes
+
+    Planes are stored under the key returned by FileImage.get_plane_key
+    as the (pixel data, scale, channel names) tuple read by
+    FileImage.read_plane. A plane is decoded ahead of time, for instance
+    by an ImagePrefetcher thread, and handed over to the provider that
+    needs it, which takes it out of the cache.
+
+    A key can be reserved while its plane is being read so that a provider
+    that asks for it in the meantime waits for the read to finish instead
+    of reading the plane a second time.
+
+    The total size of the cached planes is kept below max_bytes. Planes
+    that don't fit are dropped.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.__max_bytes = max_bytes
+        self.lock = threading.Condition()
+        self.planes = collections.OrderedDict()
+        self.pending = set()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self):
+        if self.__max_bytes is not None:
+            return self.__max_bytes
+        return get_prefetch_memory_mb() * 1024 * 1024
+
+    def reserve(self, key):
+        """Mark a plane as being read
+
+        Returns False if the plane is already cached or being read.
+        """
+        with self.lock:
+            if key in self.planes or key in self.pending:
+                return False
+            self.pending.add(key)
+            return True
+
+    def cancel(self, key):
+        """Give up a reservation without storing a plane"""
+        with self.lock:
+            self.pending.discard(key)
+            self.lock.notify_all()
+
+    def put(self, key, plane):
+        """Store a plane
+
+        key - the plane's key
+
+        plane - the (pixel data, scale, channel names) tuple
+
+        Returns True if the plane was stored, False if it didn't fit.
+        """
+        nbytes = plane[0].nbytes
+        with self.lock:
+            self.pending.discard(key)
+            stored = key not in self.planes and self.nbytes + nbytes <= self.max_bytes
+            if stored:
+                self.planes[key] = plane
+                self.nbytes += nbytes
+            else:
+                LOGGER.debug(f"No room to cache plane {key}")
+            self.lock.notify_all()
+            return stored
+
+    def pop(self, key):
+        """Take a plane out of the cache
+
+        Waits for the plane if it is being read. Returns None if the
+        plane is not cached.
+        """
+        if key is None:
+            return None
+        with self.lock:
+            while key in self.pending:
+                self.lock.wait()
+            plane = self.planes.pop(key, None)
+            if plane is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.nbytes -= plane[0].nbytes
+            return plane
+
+    def discard(self, key):
+        """Drop a plane if it is cached"""
+        with self.lock:
+            plane = self.planes.pop(key, None)
+            if plane is not None:
+                self.nbytes -= plane[0].nbytes
+
+    def clear(self):
+        """Drop all cached planes"""
+        with self.lock:
+            self.planes.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self.planes)
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.planes
+
+
+__plane_cache = PlaneCache()
+
+
+def get_plane_cache():
+    """Get the process-wide plane cache"""
+    return __plane_cache
@@ -2,9 +2,7 @@ import atexit
 import hashlib
 import logging
 import os
-import tempfile
 import urllib.parse
-import urllib.request
 import weakref
 
 import numpy
@@ -12,12 +10,13 @@ import numpy
 import cellprofiler_core.preferences
 from .._abstract_image import AbstractImage
 from ..._image import Image
-from ....reader import get_image_reader, get_image_reader_class
+from ..._plane_cache import get_plane_cache
+from ....reader import get_image_reader_class, get_reader_pool
 from ....utilities.image import is_numpy_file, download_to_temp_file
 from ....utilities.image import is_matlab_file
 from ....utilities.image import loadmat
 from ....utilities.image import load_data_file
-from ....utilities.image import generate_presigned_url
+from ....utilities.download_cache import is_cached_download
 from ....constants.image import FILE_SCHEME, PASSTHROUGH_SCHEMES
 from ....utilities.pathname import pathname2url, url2pathname
 
@@ -26,6 +25,9 @@ LOGGER = logging.getLogger(__name__)
 # A set of readers with open file locks.
 ACTIVE_READERS = weakref.WeakSet()
 
+"""The bytes per pixel and channel assumed when estimating the size of a plane"""
+PLANE_ITEMSIZE = 4
+
 
 class FileImage(AbstractImage):
     """Base for image providers: handle pathname and filename & URLs"""
@@ -42,7 +44,9 @@ class FileImage(AbstractImage):
         volume=False,
         spacing=None,
         z=None,
-        t=None
+        t=None,
+        resolution=0,
+        xywh=None,
     ):
         """
         :param name: Name of image to be provided
@@ -63,6 +67,12 @@ class FileImage(AbstractImage):
         :type volume:
         :param spacing:
         :type spacing:
+        :param resolution: the resolution level to read from a multi-resolution
+                           file, 0 being the full resolution
+        :type resolution: int
+        :param xywh: the (x, y, width, height) of a tile to read rather than
+                     the whole plane, in full resolution pixels
+        :type xywh: tuple
         """
         if pathname.startswith(FILE_SCHEME):
             pathname = url2pathname(pathname)
@@ -94,6 +104,8 @@ class FileImage(AbstractImage):
         self.__index = index
         self.__volume = volume
         self.__spacing = spacing
+        self.__resolution = resolution
+        self.__xywh = xywh
         if volume:
             if z is not None and t is not None:
                 raise ValueError(f"T- and Z-plane indexes were specified while in 3D mode."
@@ -105,6 +117,9 @@ class FileImage(AbstractImage):
             self.__z = z if z is not None else 0
             self.__t = t if t is not None else 0
         self.scale = None
+        # The (height, width, channels) of the plane in its file, if known
+        # from the file's metadata
+        self.plane_shape = None
 
     @property
     def series(self):
@@ -144,10 +159,19 @@ class FileImage(AbstractImage):
     def t(self):
         return self.__t
 
+    @property
+    def resolution(self):
+        return self.__resolution
+
+    @property
+    def xywh(self):
+        return self.__xywh
+
     def get_reader(self, create=True, volume=False):
         if self.__reader is None and create:
             image_file = self.get_image_file()
-            self.__reader = get_image_reader(image_file, volume=volume)
+            reader_class = get_image_reader_class(image_file, volume=volume)
+            self.__reader = get_reader_pool().checkout(image_file, reader_class)
             ACTIVE_READERS.add(self)
         return self.__reader
 
@@ -196,21 +220,13 @@ class FileImage(AbstractImage):
                 )
         if parsed_path.scheme == "file":
             self.__cached_file = url2pathname(path)
-        elif is_numpy_file(self.__filename):
-            #
-            # urlretrieve uses the suffix of the path component of the URL
-            # to name the temporary file, so we replicate that behavior
-            #
-            temp_dir = cellprofiler_core.preferences.get_temporary_directory()
-            tempfd, temppath = tempfile.mkstemp(suffix=".npy", dir=temp_dir)
-            self.__cached_file = temppath
-            try:
-                url = generate_presigned_url(url)
-                self.__cached_file, headers = urllib.request.urlretrieve(
-                    url, filename=temppath
-                )
-            finally:
-                os.close(tempfd)
+        elif is_numpy_file(self.__filename) or is_matlab_file(self.__filename):
+            # Illumination functions and other data files are used by many
+            # image sets, so they are kept in the download cache.
+            cached_file = download_to_temp_file(url)
+            if cached_file is None:
+                raise IOError(f"Unable to download {url}")
+            self.__cached_file = cached_file
         else:
             from ....pipeline import ImageFile
             image_file = self.get_image_file()
@@ -274,7 +290,9 @@ class FileImage(AbstractImage):
 
         Possibly delete the temporary file"""
         if self.__is_cached:
-            if is_matlab_file(self.__filename) or is_numpy_file(self.__filename):
+            if (
+                is_matlab_file(self.__filename) or is_numpy_file(self.__filename)
+            ) and not is_cached_download(self.__cached_file):
                 try:
                     os.remove(self.__cached_file)
                 except:
@@ -287,7 +305,9 @@ class FileImage(AbstractImage):
 
         rdr = self.get_reader(create=False)
         if rdr is not None:
-            rdr.close()
+            # Hand the reader back to the pool so that later image sets
+            # from the same file don't have to open it again.
+            get_reader_pool().checkin(rdr)
             self.__reader = None
             if self in ACTIVE_READERS:
                 ACTIVE_READERS.remove(self)
@@ -319,19 +339,15 @@ class FileImage(AbstractImage):
             img = load_data_file(self.get_full_name(), numpy.load)
             self.scale = 1.0
         else:
-            rdr = self.get_reader()
             if numpy.isscalar(self.index) or self.index is None:
-                img, self.scale = rdr.read(
-                    c=self.channel,
-                    z=self.z,
-                    t=self.t,
-                    series=self.series,
-                    index=self.index,
-                    rescale=self.rescale if isinstance(self.rescale, bool) else False,
-                    wants_max_intensity=True,
-                    channel_names=channel_names,
-                )
+                # Use the plane if it was read ahead of time.
+                plane = get_plane_cache().pop(self.get_plane_key())
+                if plane is None:
+                    plane = self.read_plane()
+                img, self.scale, plane_channel_names = plane
+                channel_names += plane_channel_names
             else:
+                rdr = self.get_reader()
                 # It's a stack
                 stack = []
                 if numpy.isscalar(self.series):
@@ -354,6 +370,8 @@ class FileImage(AbstractImage):
                         rescale=self.rescale if isinstance(self.rescale, bool) else False,
                         wants_max_intensity=True,
                         channel_names=channel_names,
+                        xywh=self.get_xywh(rdr),
+                        **self.get_resolution_args(rdr),
                     )
                     stack.append(img)
                 img = numpy.dstack(stack)
@@ -365,11 +383,109 @@ class FileImage(AbstractImage):
             path_name=self.get_pathname(),
             file_name=self.get_filename(),
             scale=self.scale,
-            channelstack=img.ndim == 3 and img.shape[-1]>3
+            channelstack=img.ndim == 3 and img.shape[-1]>3,
+            lazy=cellprofiler_core.preferences.get_lazy_image_conversion(),
         )
         if img.ndim == 3 and len(channel_names) == img.shape[2]:
             self.__image.channel_names = list(channel_names)
 
+    def get_plane_key(self):
+        """The key of this provider's plane in the plane cache
+
+        Returns None if the provider reads a volume, a stack of planes or
+        a MATLAB or numpy file rather than a single plane.
+        """
+        if (
+            self.__volume
+            or is_matlab_file(self.__filename)
+            or is_numpy_file(self.__filename)
+            or not (numpy.isscalar(self.index) or self.index is None)
+        ):
+            return None
+        return (
+            self.get_url(),
+            self.series,
+            self.index,
+            self.channel,
+            self.z,
+            self.t,
+            self.rescale if isinstance(self.rescale, bool) else False,
+            self.__resolution,
+            self.__xywh,
+        )
+
+    def get_plane_nbytes(self):
+        """Estimate the size of the plane returned by read_plane
+
+        The estimate assumes four bytes per pixel and channel, the size of
+        rescaled float32 data and an upper bound for most integer formats.
+        Returns None if the plane's shape isn't known.
+        """
+        if self.plane_shape is None or self.__resolution:
+            return None
+        height, width, channels = self.plane_shape
+        if self.__xywh is not None:
+            width, height = self.__xywh[2:]
+        if self.channel is not None:
+            channels = 1
+        return int(height) * int(width) * int(channels) * PLANE_ITEMSIZE
+
+    def read_plane(self):
+        """Read this provider's plane from its file
+
+        Returns a tuple of the pixel data, the scale and the channel names.
+        """
+        self.cache_file()
+        channel_names = []
+        reader = self.get_reader()
+        img, scale = reader.read(
+            c=self.channel,
+            z=self.z,
+            t=self.t,
+            series=self.series,
+            index=self.index,
+            rescale=self.rescale if isinstance(self.rescale, bool) else False,
+            wants_max_intensity=True,
+            channel_names=channel_names,
+            xywh=self.get_xywh(reader),
+            **self.get_resolution_args(reader),
+        )
+        return img, scale, channel_names
+
+    def get_resolution_args(self, reader):
+        """The keyword arguments that select this provider's resolution level
+
+        Only readers of multi-resolution formats take a resolution, so other
+        files are read at full resolution.
+        """
+        if not self.__resolution:
+            return {}
+        if reader.get_resolution_count(self.series) <= 1:
+            LOGGER.debug(f"{self.get_url()} has a single resolution level, reading it at full resolution")
+            return {}
+        return {"resolution": self.__resolution}
+
+    def get_xywh(self, reader):
+        """The tile to read, in the pixels of the resolution level that is read"""
+        if self.__xywh is None or not self.get_resolution_args(reader):
+            return self.__xywh
+        _, y_scale, x_scale = reader.get_resolution_scale(self.series, self.__resolution)
+        x, y, w, h = self.__xywh
+        return (
+            int(x // x_scale),
+            int(y // y_scale),
+            max(int(round(w / x_scale)), 1),
+            max(int(round(h / y_scale)), 1),
+        )
+
+    def get_spacing(self, reader):
+        """The voxel spacing, adjusted for the resolution level that was read"""
+        if self.__spacing is None or not self.get_resolution_args(reader):
+            return self.__spacing
+        z_scale, y_scale, x_scale = reader.get_resolution_scale(self.series, self.__resolution)
+        z, x, y = self.__spacing
+        return z * z_scale, x * x_scale, y * y_scale
+
     def provide_image(self, image_set):
         """Load an image from a pathname
         """
@@ -383,6 +499,7 @@ class FileImage(AbstractImage):
         # Volume loading is currently limited to tiffs/numpy files only
         if is_numpy_file(self.__filename):
             data = numpy.load(pathname)
+            spacing = self.__spacing
         else:
             reader = self.get_reader(volume=True)
             data = reader.read_volume(c=self.channel,
@@ -390,7 +507,9 @@ class FileImage(AbstractImage):
                                       t=self.t,
                                       series=self.series,
                                       rescale=self.rescale,
-                                      wants_max_intensity=False)
+                                      wants_max_intensity=False,
+                                      **self.get_resolution_args(reader))
+            spacing = self.get_spacing(reader)
 
         # https://github.com/CellProfiler/python-bioformats/blob/855f2fb7807f00ef41e6d169178b7f3d22530b79/bioformats/formatreader.py#L768-L791
         if data.dtype in [numpy.int8, numpy.uint8]:
@@ -410,7 +529,8 @@ class FileImage(AbstractImage):
             file_name=self.get_filename(),
             dimensions=3,
             scale=self.scale,
-            spacing=self.__spacing,
+            spacing=spacing,
+            lazy=cellprofiler_core.preferences.get_lazy_image_conversion(),
         )
 
 
@@ -423,3 +543,4 @@ def shut_down_readers():
     """
     for reader in list(ACTIVE_READERS):
         reader.release_memory()
+    get_reader_pool().close_all()
@@ -7,7 +7,8 @@ class ColorImage(URLImage):
     """Provide a color image, tripling a monochrome plane if needed"""
 
     def __init__(
-        self, name, url, series, index, rescale=True, volume=False, spacing=None, z=None, t=None
+        self, name, url, series, index, rescale=True, volume=False, spacing=None, z=None, t=None, resolution=0,
+        xywh=None,
     ):
         URLImage.__init__(
             self,
@@ -19,13 +20,15 @@ class ColorImage(URLImage):
             volume=volume,
             spacing=spacing,
             z=z,
-            t=t
+            t=t,
+            resolution=resolution,
+            xywh=xywh,
         )
 
     def provide_image(self, image_set):
         image = URLImage.provide_image(self, image_set)
 
-        if image.pixel_data.ndim == image.dimensions:
+        if image.raw_pixel_data.ndim == image.dimensions:
             image.pixel_data = skimage.color.gray2rgb(image.pixel_data)
 
         return image
@@ -4,7 +4,10 @@ from ._monochrome_image import MonochromeImage
 class MaskImage(MonochromeImage):
     """Provide a boolean image, converting nonzero to True, zero to False if needed"""
 
-    def __init__(self, name, url, series, index, channel, volume=False, spacing=None, z=None, t=None):
+    def __init__(
+        self, name, url, series, index, channel, volume=False, spacing=None, z=None, t=None, resolution=0,
+        xywh=None,
+    ):
         MonochromeImage.__init__(
             self,
             name,
@@ -16,7 +19,9 @@ class MaskImage(MonochromeImage):
             volume=volume,
             spacing=spacing,
             z=z,
-            t=t
+            t=t,
+            resolution=resolution,
+            xywh=xywh,
         )
 
     def provide_image(self, image_set):
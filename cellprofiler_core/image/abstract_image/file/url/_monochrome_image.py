@@ -17,7 +17,9 @@ class MonochromeImage(URLImage):
         volume=False,
         spacing=None,
         z=None,
-        t=None
+        t=None,
+        resolution=0,
+        xywh=None,
     ):
         URLImage.__init__(
             self,
@@ -30,13 +32,15 @@ class MonochromeImage(URLImage):
             volume=volume,
             spacing=spacing,
             z=z,
-            t=t
+            t=t,
+            resolution=resolution,
+            xywh=xywh,
         )
 
     def provide_image(self, image_set):
         image = URLImage.provide_image(self, image_set)
 
-        if image.pixel_data.ndim == image.dimensions + 1:
+        if image.raw_pixel_data.ndim == image.dimensions + 1:
             image.pixel_data = skimage.color.rgb2gray(image.pixel_data)
 
         return image
@@ -11,7 +11,9 @@ from ._url_image import URLImage
 class ObjectsImage(URLImage):
     """Provide a multi-plane integer image, interpreting an image file as objects"""
 
-    def __init__(self, name, url, series, index, volume=False, spacing=None, z=None, t=None):
+    def __init__(
+        self, name, url, series, index, volume=False, spacing=None, z=None, t=None, resolution=0, xywh=None,
+    ):
         self.__data = None
         self.volume = volume
         if volume:
@@ -20,7 +22,8 @@ class ObjectsImage(URLImage):
         self.__image = None
         self.__spacing = spacing
         URLImage.__init__(
-            self, name, url, rescale=False, series=series, index=index, volume=volume, z=z, t=t
+            self, name, url, rescale=False, series=series, index=index, volume=volume, z=z, t=t,
+            resolution=resolution, xywh=xywh,
         )
 
     def provide_image(self, image_set):
@@ -60,6 +63,8 @@ class ObjectsImage(URLImage):
                 else:
                     properties["series"] = self.series[i]
             rdr = self.get_reader()
+            properties.update(self.get_resolution_args(rdr))
+            properties["xywh"] = self.get_xywh(rdr)
             img = rdr.read(rescale=False, **properties).astype(int)
             img = convert_image_to_objects(img).astype(numpy.int32)
             img[img != 0] += offset
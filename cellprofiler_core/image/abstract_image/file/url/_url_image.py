@@ -18,7 +18,9 @@ class URLImage(FileImage):
         volume=False,
         spacing=None,
         z=None,
-        t=None
+        t=None,
+        resolution=0,
+        xywh=None,
     ):
         if url.lower().startswith("file:"):
             path = url2pathname(url)
@@ -27,7 +29,8 @@ class URLImage(FileImage):
             pathname = ""
             filename = url
         super(URLImage, self).__init__(
-            name, pathname, filename, rescale, series, index, channel, volume, spacing, z=z, t=t
+            name, pathname, filename, rescale, series, index, channel, volume, spacing, z=z, t=t,
+            resolution=resolution, xywh=xywh,
         )
         self.url = url
 
@@ -1,3 +1,4 @@
 from ._measurements import Measurements
+from ._measurements_delta import MeasurementsDelta
 from ._metadata_group import MetadataGroup
 from ._relationship_key import RelationshipKey
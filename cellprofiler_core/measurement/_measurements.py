@@ -10,6 +10,7 @@ import warnings
 import h5py
 import numpy
 
+from ._measurements_delta import MeasurementsDelta
 from ._metadata_group import MetadataGroup
 from ._relationship_key import RelationshipKey
 from ..constants.image import CT_OBJECTS
@@ -114,6 +115,7 @@ class Measurements:
             is_temporary = False
         if isinstance(copy, Measurements):
             with copy.hdf5_dict.lock:
+                copy.hdf5_dict.commit_buffer()
                 self.hdf5_dict = HDF5Dict(
                     filename,
                     is_temporary=is_temporary,
@@ -150,6 +152,12 @@ class Measurements:
         self.__image_providers = []
         self.__image_providers = []
         self.__image_number_relationships = {}
+        #
+        # Features and relationship rows written through this instance,
+        # used to build a MeasurementsDelta
+        #
+        self.__written_features = set()
+        self.__written_relationships = {}
         if RELATIONSHIP in self.hdf5_dict.top_group:
             rgroup = self.hdf5_dict.top_group[RELATIONSHIP]
             for module_number in rgroup:
@@ -207,9 +215,39 @@ class Measurements:
         if self.hdf5_dict is not None:
             self.hdf5_dict.flush()
 
+    def start_buffering(self):
+        """Keep measurement writes in memory until flush or stop_buffering
+
+        Each feature's buffered values are written with a single append
+        when the buffer is committed. Measurements read back while
+        buffering come from the buffer.
+        """
+        self.hdf5_dict.start_buffering()
+
+    def stop_buffering(self):
+        """Write the buffered measurements and stop buffering"""
+        self.hdf5_dict.stop_buffering()
+
     def file_contents(self):
         return self.hdf5_dict.file_contents()
 
+    def get_delta(self, image_numbers):
+        """Get the measurements written through this instance
+
+        image_numbers - restrict the feature values to these image numbers
+
+        returns a MeasurementsDelta holding the image and object features
+        written by add_measurement or add_all_measurements and the
+        relationship rows written by add_relate_measurement since this
+        instance was created. Experiment measurements are not included.
+        """
+        return MeasurementsDelta.from_measurements(
+            self,
+            image_numbers,
+            sorted(self.__written_features),
+            self.__written_relationships,
+        )
+
     def initialize(self, measurement_columns):
         """Initialize the measurements with a list of objects and features
 
@@ -485,6 +523,7 @@ class Measurements:
                     dset[current_size:] = values
             key = (module_number, relationship, object_name1, object_name2)
             self.__relationships.add(key)
+            self.__written_relationships.setdefault(key, current_size)
             if key not in self.__image_number_relationships:
                 self.__image_number_relationships[
                     key
@@ -686,6 +725,9 @@ class Measurements:
         if feature_name in (IMAGE_NUMBER, OBJECT_NUMBER,):
             return
 
+        if object_name != EXPERIMENT:
+            self.__written_features.add((object_name, feature_name))
+
         if object_name == EXPERIMENT:
             if not numpy.isscalar(data) and data is not None and data_type is None:
                 data = data[0]
@@ -899,6 +941,47 @@ class Measurements:
             return numpy.array([]) if vals is None else vals.flatten()
         return [numpy.array([]) if v is None else v.flatten() for v in vals]
 
+    def get_image_column(self, feature_name, image_numbers=None):
+        """Return an image feature's values for many image sets as an array
+
+        feature_name - the name of the image feature
+
+        image_numbers - the image numbers to fetch, by default all of them
+
+        returns an array with one value per image number and a boolean
+        validity mask that is False for image sets without a value. Invalid
+        entries are NaN for floating-point features, zero for other numeric
+        features and the empty string for text features. Multi-valued image
+        measurements contribute their first value.
+        """
+        if image_numbers is None:
+            image_numbers = self.get_image_numbers()
+        values, offsets = self.hdf5_dict.get_column(IMAGE, feature_name, image_numbers)
+        valid = offsets[1:] > offsets[:-1]
+        if values.dtype.kind == "f":
+            result = numpy.full(len(valid), numpy.nan, values.dtype)
+        else:
+            result = numpy.zeros(len(valid), values.dtype)
+        result[valid] = values[offsets[:-1][valid]]
+        return result, valid
+
+    def get_object_column(self, object_name, feature_name, image_numbers=None):
+        """Return an object feature's values for many image sets as flat arrays
+
+        object_name - the name of the objects
+
+        feature_name - the name of the feature
+
+        image_numbers - the image numbers to fetch, by default all of them
+
+        returns a flat array of the values for all image sets and an array
+        of len(image_numbers) + 1 offsets into it: the values for
+        image_numbers[i] are values[offsets[i]:offsets[i + 1]].
+        """
+        if image_numbers is None:
+            image_numbers = self.get_image_numbers()
+        return self.hdf5_dict.get_column(object_name, feature_name, image_numbers)
+
     def get_measurement_columns(self):
         """Return the measurement columns for the current measurements
 
@@ -965,6 +1048,8 @@ class Measurements:
         self.hdf5_dict.add_all(
             object_name, feature_name, values, image_numbers, data_type=data_type
         )
+        if object_name != EXPERIMENT:
+            self.__written_features.add((object_name, feature_name))
 
     def get_experiment_measurement(self, feature_name):
         """Retrieve an experiment-wide measurement
@@ -1194,47 +1279,102 @@ class Measurements:
         returns a dictionary whose key is the aggregate measurement name and
         whose value is the aggregate measurement value
         """
+        d = self.compute_aggregate_measurements_for_image_sets(
+            [image_set_number], aggs
+        )
+        return dict([(name, values[0]) for name, values in d.items()])
+
+    def compute_aggregate_measurements_for_image_sets(
+        self, image_set_numbers, aggs=None
+    ):
+        """Compute aggregate measurements for many image sets at once
+
+        image_set_numbers - the image numbers of the image sets
+
+        aggs - the aggregates to compute, by default all of AGG_NAMES
+
+        returns a dictionary whose key is the aggregate measurement name and
+        whose value is an array of the aggregate measurement value for each
+        image set. Each object feature is read once for all image sets and
+        the aggregates are computed per image set as segment reductions over
+        the flat values.
+        """
         if aggs is None:
             aggs = AGG_NAMES
         d = {}
         if len(aggs) == 0:
             return d
+        image_set_numbers = numpy.atleast_1d(image_set_numbers)
+        n_image_sets = len(image_set_numbers)
         for object_name in self.get_object_names():
             if object_name == "Image":
                 continue
             for feature in self.get_feature_names(object_name):
                 if self.agg_ignore_feature(object_name, feature):
                     continue
-                feature_name = "%s_%s" % (object_name, feature)
-                values = self.get_measurement(object_name, feature, image_set_number)
+                values, offsets = self.get_object_column(
+                    object_name, feature, image_set_numbers
+                )
                 if not numpy.issubdtype(values.dtype, numpy.number):
                     # Can't generate aggregate values for non-numeric measurements
-                    values = None
-                if values is not None:
-                    values = values[numpy.isfinite(values)]
-                #
-                # Compute the mean and standard deviation
-                #
-                if AGG_MEAN in aggs:
-                    mean_feature_name = get_agg_measurement_name(
-                        AGG_MEAN, object_name, feature
+                    aggregates = dict(
+                        [(agg, numpy.full(n_image_sets, numpy.NaN)) for agg in aggs]
                     )
-                    mean = numpy.mean(values) if values is not None else numpy.NaN
-                    d[mean_feature_name] = mean
-                if AGG_MEDIAN in aggs:
-                    median_feature_name = get_agg_measurement_name(
-                        AGG_MEDIAN, object_name, feature
-                    )
-                    median = numpy.median(values) if values is not None else numpy.NaN
-                    d[median_feature_name] = median
-                if AGG_STD_DEV in aggs:
-                    stdev_feature_name = get_agg_measurement_name(
-                        AGG_STD_DEV, object_name, feature
-                    )
-                    stdev = numpy.std(values) if values is not None else numpy.NaN
-                    d[stdev_feature_name] = stdev
+                else:
+                    aggregates = self.__segment_aggregates(values, offsets, aggs)
+                for agg in aggs:
+                    if agg in aggregates:
+                        d[
+                            get_agg_measurement_name(agg, object_name, feature)
+                        ] = aggregates[agg]
         return d
 
+    @staticmethod
+    def __segment_aggregates(values, offsets, aggs):
+        """Compute the mean, median and standard deviation of each segment
+
+        values - a flat array of the values for all segments
+
+        offsets - the segment boundaries: segment i is
+                  values[offsets[i]:offsets[i+1]]
+
+        aggs - the names of the aggregates to compute
+
+        Non-finite values are ignored. Segments without finite values get
+        NaN.
+        """
+        n_segments = len(offsets) - 1
+        segments = numpy.repeat(numpy.arange(n_segments), numpy.diff(offsets))
+        values = values.astype(float)
+        finite = numpy.isfinite(values)
+        values, segments = values[finite], segments[finite]
+        counts = numpy.bincount(segments, minlength=n_segments)
+        has_values = counts > 0
+        result = {}
+        mean = numpy.full(n_segments, numpy.NaN)
+        if AGG_MEAN in aggs or AGG_STD_DEV in aggs:
+            sums = numpy.bincount(segments, values, minlength=n_segments)
+            mean[has_values] = sums[has_values] / counts[has_values]
+        if AGG_MEAN in aggs:
+            result[AGG_MEAN] = mean
+        if AGG_MEDIAN in aggs:
+            median = numpy.full(n_segments, numpy.NaN)
+            order = numpy.lexsort((values, segments))
+            sorted_values = values[order]
+            starts = numpy.cumsum(counts) - counts
+            lo = starts[has_values] + (counts[has_values] - 1) // 2
+            hi = starts[has_values] + counts[has_values] // 2
+            median[has_values] = (sorted_values[lo] + sorted_values[hi]) / 2
+            result[AGG_MEDIAN] = median
+        if AGG_STD_DEV in aggs:
+            stdev = numpy.full(n_segments, numpy.NaN)
+            squares = numpy.bincount(
+                segments, (values - mean[segments]) ** 2, minlength=n_segments
+            )
+            stdev[has_values] = numpy.sqrt(squares[has_values] / counts[has_values])
+            result[AGG_STD_DEV] = stdev
+        return result
+
     def load_image_sets(self, fd_or_file, start=None, stop=None):
         """Load image sets from a .csv file into a measurements file
 
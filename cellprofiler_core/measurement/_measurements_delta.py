@@ -0,0 +1,190 @@
+import numpy
+
+from ._relationship_key import RelationshipKey
+from ..constants.measurement import IMAGE
+from ..constants.measurement import R_FIRST_IMAGE_NUMBER
+from ..constants.measurement import R_FIRST_OBJECT_NUMBER
+from ..constants.measurement import R_SECOND_IMAGE_NUMBER
+from ..constants.measurement import R_SECOND_OBJECT_NUMBER
+
+RELATIONSHIP_FEATURES = (
+    R_FIRST_IMAGE_NUMBER,
+    R_FIRST_OBJECT_NUMBER,
+    R_SECOND_IMAGE_NUMBER,
+    R_SECOND_OBJECT_NUMBER,
+)
+
+
+class MeasurementsDelta:
+    """The measurements written for a set of image numbers
+
+    A worker's Measurements starts as a copy of the analysis' initial
+    measurements. Sending the whole file back after each job resends every
+    per-image URL and metadata column for the whole experiment. The delta
+    holds only the features written while the job ran, restricted to the
+    job's image numbers, plus any relationship rows added during the job.
+
+    The delta duck-types the read side of Measurements that the analysis
+    runner needs to merge it (get_object_names, get_feature_names,
+    indexing by [object_name, feature_name, image_numbers],
+    get_relationship_groups and get_relationships).
+
+    get_state() flattens the delta into a dictionary of lists and numpy
+    arrays that can be sent as part of a request. Each feature is sent
+    as a single array of values plus the count of values per image number,
+    so the number of message buffers scales with the number of features,
+    not with the number of image sets.
+    """
+
+    def __init__(self, image_numbers, features=None, relationships=None):
+        """Create a delta
+
+        image_numbers - the image numbers covered by the delta
+
+        features - a dictionary whose key is (object name, feature name) and
+                   whose value is a two-tuple of the concatenated values for
+                   all image numbers and the number of values per image number
+
+        relationships - a dictionary whose key is (module number,
+                        relationship, object name 1, object name 2) and whose
+                        value is a sequence of four vectors: first image
+                        number, first object number, second image number and
+                        second object number.
+        """
+        self.image_numbers = [int(image_number) for image_number in image_numbers]
+        self.features = {} if features is None else features
+        self.relationships = {} if relationships is None else relationships
+
+    @classmethod
+    def from_measurements(cls, measurements, image_numbers, features, relationships):
+        """Build a delta from a Measurements
+
+        measurements - the Measurements holding the values
+
+        image_numbers - restrict values to these image numbers
+
+        features - the (object name, feature name) pairs to include
+
+        relationships - a dictionary of relationship key to the index of the
+                        first relationship row to include
+        """
+        hdf5_dict = measurements.hdf5_dict
+        delta_features = {}
+        for object_name, feature_name in features:
+            if not hdf5_dict.has_feature(object_name, feature_name):
+                continue
+            vals = hdf5_dict[object_name, feature_name, image_numbers]
+            counts = numpy.array([0 if v is None else len(v) for v in vals], int)
+            dtype = hdf5_dict.get_feature_dtype(object_name, feature_name)
+            present = [v for v in vals if v is not None and len(v) > 0]
+            if dtype.kind in ("O", "S", "U"):
+                data = [str(x) for v in present for x in v]
+            elif len(present) == 0:
+                data = numpy.zeros(0, dtype)
+            else:
+                data = numpy.hstack(present).astype(dtype)
+            delta_features[object_name, feature_name] = (data, counts)
+        delta_relationships = {}
+        for key, start in relationships.items():
+            r = measurements.get_relationships(*key)
+            if len(r) > start:
+                delta_relationships[key] = [
+                    numpy.ascontiguousarray(r[name][start:])
+                    for name in RELATIONSHIP_FEATURES
+                ]
+        return cls(image_numbers, delta_features, delta_relationships)
+
+    def get_state(self):
+        """Return the delta as a dictionary suitable for sending"""
+        return {
+            "image_numbers": self.image_numbers,
+            "features": [
+                [object_name, feature_name, data, counts]
+                for (object_name, feature_name), (data, counts) in self.features.items()
+            ],
+            "relationships": [
+                list(key) + list(values) for key, values in self.relationships.items()
+            ],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Reconstruct a delta from the dictionary returned by get_state"""
+        features = {}
+        for object_name, feature_name, data, counts in state["features"]:
+            features[object_name, feature_name] = (data, numpy.asarray(counts, int))
+        relationships = {}
+        for record in state["relationships"]:
+            module_number, relationship, object_name1, object_name2 = record[:4]
+            relationships[
+                int(module_number), relationship, object_name1, object_name2
+            ] = [numpy.asarray(x) for x in record[4:]]
+        return cls(state["image_numbers"], features, relationships)
+
+    def get_object_names(self):
+        """The names of the objects with features in the delta"""
+        result = []
+        for object_name, _ in self.features:
+            if object_name not in result:
+                result.append(object_name)
+        return result
+
+    def get_feature_names(self, object_name):
+        """The names of the features in the delta for the given object"""
+        return [f for o, f in self.features if o == object_name]
+
+    def has_feature(self, object_name, feature_name):
+        return (object_name, feature_name) in self.features
+
+    def __getitem__(self, key):
+        """Get the values for [object_name, feature_name, image_numbers]
+
+        Image features are returned as one value per image number: None
+        if there is no value, the scalar value or an array for multi-valued
+        (blob) measurements. Object features are returned as one array per
+        image number.
+        """
+        object_name, feature_name, image_numbers = key
+        data, counts = self.features[object_name, feature_name]
+        offsets = numpy.hstack([[0], numpy.cumsum(counts)])
+        positions = dict(
+            [(image_number, i) for i, image_number in enumerate(self.image_numbers)]
+        )
+        result = []
+        for image_number in image_numbers:
+            i = positions.get(int(image_number))
+            if i is None:
+                values = numpy.zeros(0)
+            else:
+                values = data[offsets[i] : offsets[i + 1]]
+            if object_name == IMAGE:
+                if len(values) == 0:
+                    result.append(None)
+                elif len(values) == 1:
+                    result.append(values[0])
+                else:
+                    result.append(numpy.asarray(values))
+            else:
+                result.append(numpy.asarray(values))
+        return result
+
+    def get_relationship_groups(self):
+        """Return a RelationshipKey for each relationship in the delta"""
+        return [RelationshipKey(*key) for key in self.relationships]
+
+    def get_relationships(
+        self, module_number, relationship, object_name1, object_name2
+    ):
+        """Return the relationship rows in the delta as a recarray
+
+        The recarray has the same fields as Measurements.get_relationships.
+        """
+        dt = numpy.dtype([(feature, numpy.int32, ()) for feature in RELATIONSHIP_FEATURES])
+        key = (module_number, relationship, object_name1, object_name2)
+        if key not in self.relationships:
+            return numpy.zeros(0, dt).view(numpy.recarray)
+        values = self.relationships[key]
+        result = numpy.zeros(len(values[0]), dt)
+        for feature, value in zip(RELATIONSHIP_FEATURES, values):
+            result[feature] = value
+        return result.view(numpy.recarray)
@@ -788,6 +788,19 @@ class Module:
         """
         pass
 
+    def get_prefetch_providers(self, workspace, image_set_number):
+        """Return providers for images this module will load for an image set
+
+        workspace - a workspace holding the measurements of the run
+
+        image_set_number - the image set whose images are wanted
+
+        Input modules can override this to let a worker read the images of
+        its next image set ahead of time. The providers must be made
+        without reading any pixel data. The default is no images.
+        """
+        return []
+
     def get_measurement_columns(self, pipeline):
         """Return a sequence describing the measurement columns needed by this module
 
@@ -4,6 +4,7 @@ import logging
 
 from cellprofiler_core.constants.measurement import C_SERIES_NAME, C_C, C_SERIES, C_Z, C_T
 from cellprofiler_core.pipeline import ImagePlane
+from cellprofiler_core.pipeline import extract_planes
 from cellprofiler_core.constants.module import FILTER_RULES_BUTTONS_HELP
 from cellprofiler_core.constants.modules.images import FILTER_CHOICE_ALL
 from cellprofiler_core.constants.modules.images import FILTER_CHOICE_CUSTOM
@@ -323,9 +324,7 @@ pass the current filter.
                 self.extract_metadata.callback()
             else:
                 # Otherwise, just do the extraction here
-                for file_object in file_list:
-                    if not file_object.extracted:
-                        file_object.extract_planes(workspace)
+                extract_planes(file_list, workspace)
 
         planes = []
         for image_file in file_list:
@@ -659,6 +659,9 @@ not being applied, your choice on this setting may be the culprit.
         group.imported_metadata_dicts_timestamp = 0
         group.imported_metadata_dicts_path = None
         group.imported_metadata_dicts = None
+        group.imported_metadata_index = None
+        group.imported_metadata_index_key = None
+        group.imported_metadata_image_keys = None
         # A temporary variable used to store a compiled regex object
         group.regex_pattern = None
         group.can_remove = can_remove
@@ -844,8 +847,8 @@ not being applied, your choice on this setting may be the culprit.
                 # the pattern string, but this wastes time converting it into a regex object during each call.
                 self.compile_regex(group)
             elif group.extraction_method == X_IMPORTED_EXTRACTION:
-                # Import the csv metadata as a list of dictionaries.
-                self.import_csv_dict(group)
+                # Index the csv metadata by the values of the join columns.
+                self.import_csv_index(group)
         for file_object in file_objects:
             file_object.clear_metadata()
             for group in self.extraction_methods:
@@ -865,36 +868,21 @@ not being applied, your choice on this setting may be the culprit.
                         file_metadata = self.apply_data_types(matches.groupdict())
                         file_object.add_metadata(file_metadata)
                 elif group.extraction_method == X_IMPORTED_EXTRACTION:
-                    # Imported from CSV. Test the image against available dicts.
-                    joins = group.csv_joiner.parse()
+                    # Imported from CSV. Look up the image's join values in the index.
                     image_meta = file_object.metadata
-                    valid = True
-                    for candidate_dict in group.imported_metadata_dicts:
-                        if None in candidate_dict:
-                            # Extra columns without header labels were present. Delete them.
-                            del candidate_dict[None]
-                        candidate_dict = self.apply_data_types(candidate_dict)
-                        valid = True
-                        for join_dict in joins:
-                            csv_key = join_dict[CSV_JOIN_NAME]
-                            image_key = join_dict[IPD_JOIN_NAME]
-                            csv_val = candidate_dict[csv_key]
-                            image_val = self.apply_data_type(image_meta.get(image_key, ""), self.get_data_type(image_key))
-                            if group.wants_case_insensitive:
-                                if isinstance(csv_val, str):
-                                    csv_val = csv_val.lower()
-                                if isinstance(image_val, str):
-                                    image_val = image_val.lower()
-                            if csv_val != image_val:
-                                valid = False
-                                break
-                        if valid:
-                            file_object.add_metadata(candidate_dict)
-                            break
-                    if not valid:
+                    key = self.get_join_key(
+                        group,
+                        [
+                            image_meta.get(image_key, "")
+                            for image_key in group.imported_metadata_image_keys
+                        ],
+                        group.imported_metadata_image_keys,
+                    )
+                    candidate_dict = group.imported_metadata_index.get(key)
+                    if candidate_dict is None:
                         LOGGER.info(f"No matching metadata found for {file_object.filename}")
                         break
-                    pass
+                    file_object.add_metadata(candidate_dict)
                 else:
                     raise NotImplementedError(f"Invalid extraction method '{group.extraction_method}'")
             if FTR_WELL not in file_object.metadata:
@@ -913,11 +901,81 @@ not being applied, your choice on this setting may be the culprit.
         for group in self.extraction_methods:
             if group.extraction_method == X_IMPORTED_EXTRACTION:
                 # Extraction is done, clear the dict list to save memory.
+                # The index is kept for the next extraction.
                 del group.imported_metadata_dicts
                 group.imported_metadata_dicts = None
                 group.imported_metadata_dicts_timestamp = 0
                 group.imported_metadata_dicts_path = None
 
+    def get_join_key(self, group, values, keys=None):
+        """Make the hashable key used to match CSV rows and images
+
+        group - the imported extraction group
+
+        values - the values of the join columns
+
+        keys - the metadata keys of the join columns, used to look up
+               their data types or None if the values are already typed
+        """
+        result = []
+        for i, value in enumerate(values):
+            if keys is not None:
+                value = self.apply_data_type(value, self.get_data_type(keys[i]))
+            if group.wants_case_insensitive and isinstance(value, str):
+                value = value.lower()
+            result.append(value)
+        return tuple(result)
+
+    def import_csv_index(self, group):
+        """Index the imported metadata by the values of the join columns
+
+        The index is a dictionary whose key is the tuple of typed (and
+        lowercased for case-insensitive matching) join values and whose
+        value is the first CSV row, with data types applied, having those
+        values. It is reused while the CSV file's modification time, the
+        joins and the data type settings are unchanged.
+        """
+        joins = group.csv_joiner.parse()
+        csv_keys = [join_dict[CSV_JOIN_NAME] for join_dict in joins]
+        image_keys = [join_dict[IPD_JOIN_NAME] for join_dict in joins]
+        csv_path = self.csv_path(group)
+        if group.csv_location.is_url() or not os.path.isfile(csv_path):
+            timestamp = None
+        else:
+            timestamp = os.stat(csv_path).st_mtime
+        index_key = (
+            csv_path,
+            timestamp,
+            tuple(csv_keys),
+            tuple(image_keys),
+            bool(group.wants_case_insensitive.value),
+            self.data_type_choice.value,
+            self.data_types.value_text,
+        )
+        group.imported_metadata_image_keys = image_keys
+        if (
+            timestamp is not None
+            and group.imported_metadata_index is not None
+            and index_key == group.imported_metadata_index_key
+        ):
+            return group.imported_metadata_index
+        self.import_csv_dict(group)
+        index = {}
+        for candidate_dict in group.imported_metadata_dicts or []:
+            if None in candidate_dict:
+                # Extra columns without header labels were present. Delete them.
+                del candidate_dict[None]
+            candidate_dict = self.apply_data_types(candidate_dict)
+            key = self.get_join_key(
+                group,
+                [candidate_dict[csv_key] for csv_key in csv_keys]
+            )
+            if key not in index:
+                index[key] = candidate_dict
+        group.imported_metadata_index = index
+        group.imported_metadata_index_key = index_key
+        return index
+
     def import_csv_dict(self, group):
         csv_path = self.csv_path(group)
         if csv_path == group.imported_metadata_dicts_path and group.imported_metadata_dicts is not None:
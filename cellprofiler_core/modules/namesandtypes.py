@@ -10,6 +10,7 @@ from collections import Counter
 import numpy
 import skimage.morphology
 
+from ..constants.image import MD_SIZE_C, MD_SIZE_X, MD_SIZE_Y
 from ..constants.image import C_FRAME, CT_COLOR, CT_GRAYSCALE, CT_FUNCTION, CT_MASK, CT_OBJECTS
 from ..constants.image import C_HEIGHT
 from ..constants.image import C_MD5_DIGEST
@@ -30,6 +31,7 @@ from ..constants.measurement import C_COUNT
 from ..constants.measurement import C_FILE_NAME
 from ..constants.measurement import C_LOCATION
 from ..constants.measurement import C_METADATA
+from ..constants.measurement import C_TILE_X, C_TILE_Y
 from ..constants.measurement import C_NUMBER
 from ..constants.measurement import C_OBJECTS_CHANNEL
 from ..constants.measurement import C_OBJECTS_FILE_NAME
@@ -79,7 +81,7 @@ from ..setting.filter import (
     DoesPredicate,
 )
 from ..setting.filter import MetadataPredicate
-from ..setting.text import Float, FileImageName, LabelName
+from ..setting.text import Float, FileImageName, Integer, LabelName
 from ..utilities.channel_hasher import ChannelHasher
 from ..utilities.core.module.identify import (
     add_object_location_measurements,
@@ -218,7 +220,7 @@ Measurements made by this module
 
 
 class NamesAndTypes(Module):
-    variable_revision_number = 9
+    variable_revision_number = 11
     module_name = "NamesAndTypes"
     category = "File Processing"
 
@@ -321,6 +323,70 @@ See help for *Relative pixel spacing in X* for details.
 """,
         )
 
+        self.resolution = Integer(
+            text="Resolution level",
+            value=0,
+            minval=0,
+            doc="""\
+Select the resolution level to load from files that store downsampled
+copies of each image, such as the multiscale pyramids of OME-Zarr
+(OME-NGFF) files. Level 0 is the full resolution and each higher level
+is a further downsampled copy, typically half the width and height of
+the level before it. Loading a lower resolution reads far less data,
+which is useful for previewing a pipeline or for coarse segmentation of
+large images. Files stored at a single resolution are always loaded at
+full resolution.
+
+When "Process as 3D?" is "Yes", the relative pixel spacing is adjusted
+by the amount each axis was downsampled.
+""",
+        )
+
+        self.wants_tiles = Binary(
+            text="Divide images into tiles?",
+            value=False,
+            doc="""\
+*(Used only if "Process as 3D?" is "No")*
+
+Select "Yes" to divide each image set into tiles and process each tile
+as an image set of its own. Only the pixels of the tile are read, so
+very large images such as whole-slide scans or stitched plates can be
+processed without loading them into memory in full, and the tiles of
+one image are spread across workers. The origin of each tile is
+recorded in the *Metadata_{C_TILE_X}* and *Metadata_{C_TILE_Y}*
+measurements.
+
+Tiles are read directly from OME-Zarr and Bio-Formats files; other
+formats are read in full and cropped.
+""".format(**{"C_TILE_X": C_TILE_X, "C_TILE_Y": C_TILE_Y}),
+        )
+
+        self.tile_size = Integer(
+            text="Tile size",
+            value=1024,
+            minval=16,
+            doc="""\
+*(Used only if dividing images into tiles)*
+
+Enter the width and height of each tile, in pixels of the full
+resolution image. Tiles at the right and bottom edges of an image are
+smaller if the image size isn't a multiple of the tile size.
+""",
+        )
+
+        self.tile_overlap = Integer(
+            text="Tile overlap",
+            value=0,
+            minval=0,
+            doc="""\
+*(Used only if dividing images into tiles)*
+
+Enter the number of pixels by which neighboring tiles overlap. Objects
+that cross the border of a tile are only whole in one of the tiles if
+the overlap is at least as wide as the objects.
+""",
+        )
+
         self.single_image_provider = FileImageName(
             "Name to assign these images", IMAGE_NAMES[0]
         )
@@ -820,6 +886,10 @@ requests an object selection.
             self.x,
             self.y,
             self.z,
+            self.resolution,
+            self.wants_tiles,
+            self.tile_size,
+            self.tile_overlap,
         ]
 
         for assignment in self.assignments:
@@ -857,6 +927,10 @@ requests an object selection.
             self.x,
             self.y,
             self.z,
+            self.resolution,
+            self.wants_tiles,
+            self.tile_size,
+            self.tile_overlap,
         ]
         assignment = self.assignments[0]
         result += [
@@ -875,6 +949,13 @@ requests an object selection.
         if self.process_as_3d.value:
             result += [self.x, self.y, self.z]
 
+        result += [self.resolution]
+
+        if not self.process_as_3d.value:
+            result += [self.wants_tiles]
+            if self.wants_tiles.value:
+                result += [self.tile_size, self.tile_overlap]
+
         if self.assignment_method == ASSIGN_ALL:
             result += [self.single_load_as_choice, self.single_image_provider]
             if self.single_load_as_choice in (
@@ -1238,8 +1319,97 @@ requests an object selection.
         else:
             image_sets = self.make_image_sets_by_metadata(image_planes)
 
+        if image_sets is not None and self.tiles_image_sets():
+            image_sets = self.make_tiles(image_sets)
+
         return image_sets
 
+    def tiles_image_sets(self):
+        """True if each image set is divided into tiles"""
+        return self.wants_tiles.value and not self.process_as_3d.value
+
+    def make_tiles(self, image_sets):
+        """Divide each image set into one image set per tile
+
+        image_sets - a list of dictionaries of image name to ImagePlane
+
+        Returns a list of image sets whose planes are the tiles of the
+        original planes. The tiles are laid out over the assigned channels.
+        Single images, such as illumination functions, are divided into
+        the same tiles if their size is known and are otherwise provided
+        whole. Image sets whose image size isn't known are kept whole, as
+        a single tile at 0, 0.
+        """
+        size = self.tile_size.value
+        overlap = self.tile_overlap.value
+        assigned_names = set(self.get_column_names(want_singles=False))
+        tiled_image_sets = []
+        untiled_count = 0
+        for image_set in image_sets:
+            shape = self.get_image_set_shape(
+                {name: plane for name, plane in image_set.items() if name in assigned_names}
+            )
+            if shape is None:
+                untiled_count += 1
+                tiled_image_set = dict(image_set)
+                for name in assigned_names.intersection(image_set):
+                    tiled_image_set[name] = image_set[name].make_tile(None)
+                tiled_image_sets.append(tiled_image_set)
+                continue
+            tiled_names = [
+                name
+                for name, plane in image_set.items()
+                if name in assigned_names or self.get_plane_shape(plane) is not None
+            ]
+            height, width = shape
+            for y in self.get_tile_origins(height, size, overlap):
+                for x in self.get_tile_origins(width, size, overlap):
+                    xywh = (x, y, min(size, width - x), min(size, height - y))
+                    tiled_image_set = dict(image_set)
+                    for name in tiled_names:
+                        tiled_image_set[name] = image_set[name].make_tile(xywh)
+                    tiled_image_sets.append(tiled_image_set)
+        if untiled_count > 0:
+            LOGGER.warning(
+                f"The size of the images in {untiled_count} of {len(image_sets)} image sets is unknown, "
+                f"so they won't be divided into tiles"
+            )
+        return tiled_image_sets
+
+    @classmethod
+    def get_image_set_shape(cls, image_set):
+        """The height and width shared by the planes of an image set
+
+        Returns the smallest height and width among the planes, so that all
+        tiles lie within every plane, or None if a plane's size is unknown.
+        """
+        heights = []
+        widths = []
+        for plane in image_set.values():
+            shape = cls.get_plane_shape(plane)
+            if shape is None:
+                return None
+            heights.append(shape[0])
+            widths.append(shape[1])
+        if len(heights) == 0:
+            return None
+        return min(heights), min(widths)
+
+    @staticmethod
+    def get_plane_shape(plane):
+        """The height and width of a plane, or None if its file's metadata doesn't say"""
+        metadata = plane.file.metadata
+        series = plane.series or 0
+        try:
+            return metadata[MD_SIZE_Y][series], metadata[MD_SIZE_X][series]
+        except (KeyError, IndexError, TypeError):
+            return None
+
+    @staticmethod
+    def get_tile_origins(length, size, overlap):
+        """The tile origins along an axis of the given length"""
+        return list(range(0, max(length - overlap, 1), size - overlap))
+
     def make_image_sets_assign_all(self, image_planes):
         name = self.single_image_provider.value
         return [{name: plane} for plane in image_planes]
@@ -1411,9 +1581,12 @@ requests an object selection.
             return ast.literal_eval(d)
         return None
 
-    def get_imageset(self, workspace):
+    def get_imageset(self, workspace, image_set_number=None):
         m = workspace.measurements
-        compressed_imageset = m["Image", M_IMAGE_SET]
+        if image_set_number is None:
+            compressed_imageset = m["Image", M_IMAGE_SET]
+        else:
+            compressed_imageset = m["Image", M_IMAGE_SET, image_set_number]
         # The HDF5 Dict is currently set up to store bytes as a string and return
         # a stringified object. We need to consider it as bytes again.
         compressed_imageset = ast.literal_eval(compressed_imageset)
@@ -1473,6 +1646,77 @@ requests an object selection.
                         image_set,
                     )
 
+    def get_prefetch_providers(self, workspace, image_set_number):
+        """Make providers for the images of an image set without reading them
+
+        Volumes are read whole and aren't read ahead of time.
+        """
+        if self.process_as_3d.value:
+            return []
+        if self.assignment_method == ASSIGN_ALL:
+            loads = [
+                (
+                    self.single_image_provider.value,
+                    self.single_load_as_choice.value,
+                    self.single_rescale.value,
+                    self.manual_rescale.value,
+                )
+            ]
+        else:
+            loads = [
+                (
+                    group.image_name.value,
+                    group.load_as_choice.value,
+                    group.rescale.value,
+                    group.manual_rescale.value,
+                )
+                for group in self.assignments + self.single_images
+                if group.load_as_choice != LOAD_AS_OBJECTS
+            ]
+        image_set = self.get_imageset(workspace, image_set_number)
+        providers = []
+        for name, load_choice, rescale, manual_rescale in loads:
+            if rescale == INTENSITY_MANUAL:
+                rescale = manual_rescale
+            image_plane = image_set[name]
+            provider = self.make_image_provider(
+                workspace,
+                name,
+                load_choice,
+                self.get_rescale(rescale),
+                image_plane.url,
+                image_plane.series,
+                image_plane.index,
+                image_plane.channel,
+                image_plane.z,
+                image_plane.t,
+                image_plane.reader_name,
+                image_plane.tile,
+            )
+            # The prefetcher checks that a plane fits in its budget before reading it
+            metadata = image_plane.file.metadata
+            series = image_plane.series or 0
+            try:
+                provider.plane_shape = (
+                    metadata[MD_SIZE_Y][series],
+                    metadata[MD_SIZE_X][series],
+                    metadata[MD_SIZE_C][series],
+                )
+            except (KeyError, IndexError, TypeError):
+                pass
+            providers.append(provider)
+        return providers
+
+    @staticmethod
+    def get_rescale(rescale):
+        """Translate the rescale setting into the providers' rescale argument"""
+        if rescale == INTENSITY_RESCALING_BY_METADATA:
+            return True
+        elif rescale == INTENSITY_RESCALING_BY_DATATYPE:
+            return False
+        # else it's a manual rescale.
+        return rescale
+
     def add_image_provider(self, workspace, name, load_choice, rescale, image_set):
         """Put an image provider into the image set
 
@@ -1485,11 +1729,7 @@ requests an object selection.
                   or a floating point manual value.
         stack - the ImagePlaneDetailsStack that describes the image's planes
         """
-        if rescale == INTENSITY_RESCALING_BY_METADATA:
-            rescale = True
-        elif rescale == INTENSITY_RESCALING_BY_DATATYPE:
-            rescale = False
-        # else it's a manual rescale.
+        rescale = self.get_rescale(rescale)
 
         image_plane = image_set[name]
 
@@ -1500,24 +1740,40 @@ requests an object selection.
         z = image_plane.z
         t = image_plane.t
         reader_name = image_plane.reader_name
+        xywh = image_plane.tile
         self.add_simple_image(
-            workspace, name, load_choice, rescale, url, series, index, channel, z, t, reader_name
+            workspace, name, load_choice, rescale, url, series, index, channel, z, t, reader_name, xywh
         )
 
     def add_simple_image(
         self, workspace, name, load_choice, rescale, url, series, index, channel, z=None, t=None, reader_name=None,
+        xywh=None,
     ):
         m = workspace.measurements
+        provider = self.make_image_provider(
+            workspace, name, load_choice, rescale, url, series, index, channel, z, t, reader_name, xywh
+        )
+        workspace.image_set.providers.append(provider)
+
+        self.add_provider_measurements(provider, m, "Image")
 
-        url = m.alter_url_post_create_batch(url)
+    def make_image_provider(
+        self, workspace, name, load_choice, rescale, url, series, index, channel, z=None, t=None, reader_name=None,
+        xywh=None,
+    ):
+        """Make the provider of an image without reading it"""
+        url = workspace.measurements.alter_url_post_create_batch(url)
 
         volume = self.process_as_3d.value
 
         spacing = (self.z.value, self.x.value, self.y.value) if volume else None
 
+        resolution = self.resolution.value
+
         if load_choice == LOAD_AS_COLOR_IMAGE:
             provider = ColorImage(
-                name, url, series, index, rescale, volume=volume, spacing=spacing, z=z, t=t
+                name, url, series, index, rescale, volume=volume, spacing=spacing, z=z, t=t, resolution=resolution,
+                xywh=xywh,
             )
         elif load_choice == LOAD_AS_GRAYSCALE_IMAGE:
             provider = MonochromeImage(
@@ -1530,22 +1786,24 @@ requests an object selection.
                 volume=volume,
                 spacing=spacing,
                 z=z,
-                t=t
+                t=t,
+                resolution=resolution,
+                xywh=xywh,
             )
         elif load_choice == LOAD_AS_ILLUMINATION_FUNCTION:
             provider = MonochromeImage(
-                name, url, series, index, channel, False, volume=volume, spacing=spacing, z=z, t=t
+                name, url, series, index, channel, False, volume=volume, spacing=spacing, z=z, t=t,
+                resolution=resolution, xywh=xywh,
             )
         elif load_choice == LOAD_AS_MASK:
             provider = MaskImage(
-                name, url, series, index, channel, volume=volume, spacing=spacing, z=z, t=t
+                name, url, series, index, channel, volume=volume, spacing=spacing, z=z, t=t, resolution=resolution,
+                xywh=xywh,
             )
         else:
             raise NotImplementedError(f"Unknown load choice: {load_choice}")
         provider.reader_name = reader_name
-        workspace.image_set.providers.append(provider)
-
-        self.add_provider_measurements(provider, m, "Image")
+        return provider
 
     @staticmethod
     def add_provider_measurements(provider, m, image_or_objects):
@@ -1593,7 +1851,8 @@ requests an object selection.
         volume = self.process_as_3d.value
         spacing = (self.z.value, self.x.value, self.y.value) if volume else None
         provider = ObjectsImage(
-            name, url, series, index, volume=volume, spacing=spacing, z=z, t=t,
+            name, url, series, index, volume=volume, spacing=spacing, z=z, t=t, resolution=self.resolution.value,
+            xywh=image_plane.tile,
         )
         self.add_provider_measurements(
             provider, workspace.measurements, "Object",
@@ -1750,6 +2009,10 @@ requests an object selection.
         result += [
             ("Image", ftr, COLTYPE_VARCHAR,) for ftr in self.get_metadata_features()
         ]
+        if self.tiles_image_sets():
+            result += [
+                ("Image", f"{C_METADATA}_{key}", COLTYPE_INTEGER,) for key in (C_TILE_X, C_TILE_Y)
+            ]
         return result
 
     def get_categories(self, pipeline, object_name):
@@ -1780,6 +2043,8 @@ requests an object selection.
                 C_SERIES_NAME,
                 C_FRAME,
             ]
+            if self.tiles_image_sets():
+                result += [C_METADATA]
         elif object_name in self.get_object_names():
             result += [
                 C_LOCATION,
@@ -1805,6 +2070,8 @@ requests an object selection.
                 C_FRAME,
             ):
                 return list(image_names) + list(object_names)
+            elif category == C_METADATA and self.tiles_image_sets():
+                return [C_TILE_X, C_TILE_Y]
         elif object_name in self.get_object_names():
             if category == C_NUMBER:
                 return [FTR_OBJECT_NUMBER]
@@ -1824,6 +2091,23 @@ requests an object selection.
         Make sure the metadata matcher has at least one completely
         specified channel.
         """
+        if self.tiles_image_sets() and self.tile_overlap.value >= self.tile_size.value:
+            raise ValidationError(
+                "The tile overlap must be smaller than the tile size", self.tile_overlap,
+            )
+        if self.tiles_image_sets():
+            tile_keys = (C_TILE_X.upper(), C_TILE_Y.upper())
+            for module in pipeline.modules():
+                if module.module_name != "Metadata":
+                    continue
+                for key in module.get_metadata_keys():
+                    if key.upper() in tile_keys:
+                        raise ValidationError(
+                            'The metadata tag, "%s", is used for the tile position when '
+                            "images are divided into tiles. Please use some other tag "
+                            "name." % key,
+                            self.wants_tiles,
+                        )
         if (
             self.assignment_method == ASSIGN_RULES
             and self.matching_choice == MATCH_BY_METADATA
@@ -2033,6 +2317,28 @@ requests an object selection.
 
             variable_revision_number = 8
 
+        if variable_revision_number == 8:
+            # Version 9 didn't change the settings
+            variable_revision_number = 9
+
+        if variable_revision_number == 9:
+            # Add the resolution level
+            setting_values = (
+                setting_values[:IDX_FIRST_ASSIGNMENT_V9]
+                + ["0"]
+                + setting_values[IDX_FIRST_ASSIGNMENT_V9:]
+            )
+            variable_revision_number = 10
+
+        if variable_revision_number == 10:
+            # Add the tiling settings
+            setting_values = (
+                setting_values[:IDX_FIRST_ASSIGNMENT_V10]
+                + ["No", "1024", "0"]
+                + setting_values[IDX_FIRST_ASSIGNMENT_V10:]
+            )
+            variable_revision_number = 11
+
         return setting_values, variable_revision_number
 
     def volumetric(self):
@@ -1,5 +1,6 @@
 # ImageFile must be initialized before ImagePlane
 from ._image_file import ImageFile
+from ._image_file import extract_planes
 from ._image_plane import ImagePlane
 from ._image_set_channel_descriptor import ImageSetChannelDescriptor
 from ._listener import Listener
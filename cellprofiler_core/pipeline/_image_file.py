@@ -2,6 +2,7 @@ import os
 import urllib.parse
 import urllib.request
 import logging
+import concurrent.futures
 from functools import cached_property
 
 import numpy
@@ -10,11 +11,18 @@ from cellprofiler_core.constants.image import MD_SIZE_S, MD_SIZE_C, MD_SIZE_Z, M
     MD_SIZE_KEYS, MD_SERIES_NAME
 from cellprofiler_core.constants.modules.metadata import COL_PATH, COL_SERIES, COL_INDEX, COL_URL
 from cellprofiler_core.constants.measurement import RESERVED_METADATA_KEYS
-from cellprofiler_core.reader import get_image_reader, Reader
+from cellprofiler_core.preferences import EXTRACTION_MODE_PROCESSES, get_metadata_extraction_workers, \
+    get_metadata_extraction_mode
+from cellprofiler_core.reader import get_image_reader, get_image_reader_class, Reader
 from cellprofiler_core.utilities.image import url_to_modpath, is_file_url
+from cellprofiler_core.utilities.plane_metadata_cache import get_plane_metadata_cache, get_plane_signature, \
+    get_reader_signature
 
 LOGGER = logging.getLogger(__name__)
 
+"""The number of extracted files whose metadata is written to the file list at once"""
+EXTRACTION_BATCH_SIZE = 256
+
 
 class ImageFile:
     """This class represents an image file
@@ -81,37 +89,77 @@ class ImageFile:
     def extract_planes(self, workspace=None):
         if self._extracted:
             return
+        meta_dict = self.read_series_metadata()
+        if meta_dict is None:
+            return
+        self.set_series_metadata(meta_dict)
+        if workspace is not None:
+            workspace.file_list.add_metadata(self.url, *self.get_plane_metadata_array())
+
+    def read_series_metadata(self):
+        """Open the file's reader and read its series metadata
+
+        Returns the series metadata dictionary or None if the file could
+        not be read or has no images. The reader is released afterwards.
+        """
         # Figure out the number of planes, indexes or series in the file.
         try:
-            reader = self.get_reader()
+            reader_class = get_image_reader_class(self)
         except:
             LOGGER.error(f"May not be an image: {self.url}", exc_info=True)
             self.metadata[MD_SIZE_S] = 0
-            return
-        meta_dict = reader.get_series_metadata()
+            return None
+        cache = get_plane_metadata_cache()
+        signature = None if cache is None else get_plane_signature(self.url)
+        if signature is not None:
+            reader_signature = get_reader_signature(reader_class)
+            meta_dict = cache.get(self.url, reader_signature, signature)
+            if meta_dict is not None:
+                return meta_dict
+        try:
+            if self._reader is None:
+                self._reader = reader_class(self)
+            reader = self._reader
+        except:
+            LOGGER.error(f"May not be an image: {self.url}", exc_info=True)
+            self.metadata[MD_SIZE_S] = 0
+            return None
+        try:
+            meta_dict = reader.get_series_metadata()
+        finally:
+            self.release_reader()
         if meta_dict[MD_SIZE_S] == 0:
             LOGGER.error(f"File {self.filename} appears to contain no images.")
             self.metadata[MD_SIZE_S] = 0
-            self.release_reader()
-            return
+            return None
         elif MD_SERIES_NAME not in meta_dict:
             meta_dict[MD_SERIES_NAME] = [''] * meta_dict[MD_SIZE_S]
         assert MD_SIZE_KEYS.issubset(meta_dict.keys()), "Returned metadata keys are incomplete"
+        if signature is not None:
+            cache.put(self.url, reader_signature, signature, meta_dict)
+        return meta_dict
+
+    def set_series_metadata(self, meta_dict):
+        """Record series metadata returned by read_series_metadata"""
         self.metadata.update(meta_dict)
         for S, C, Z, T, Y, X, name in self.get_plane_iterator():
             self._plane_details.append(f"Series {S:>2}{f' ({name})' if name else ''}"
                                        f": {X:>5} x {Y:<5}, {C} Channels, {Z:>2} Planes, {T:>2} Timepoints")
-        if workspace is not None:
-            metadata_array = numpy.transpose([
-                self.metadata[MD_SIZE_C],
-                self.metadata[MD_SIZE_Z],
-                self.metadata[MD_SIZE_T],
-                self.metadata[MD_SIZE_Y],
-                self.metadata[MD_SIZE_X]])
-            names_array = self.metadata[MD_SERIES_NAME]
-            workspace.file_list.add_metadata(self.url, metadata_array.flatten(), names_array)
         self._extracted = True
-        self.release_reader()
+
+    def get_plane_metadata_array(self):
+        """Get the metadata and series names as stored in the file list
+
+        Returns a flat array of the C, Z, T, Y and X sizes of each series
+        and the list of series names.
+        """
+        metadata_array = numpy.transpose([
+            self.metadata[MD_SIZE_C],
+            self.metadata[MD_SIZE_Z],
+            self.metadata[MD_SIZE_T],
+            self.metadata[MD_SIZE_Y],
+            self.metadata[MD_SIZE_X]])
+        return metadata_array.flatten(), self.metadata[MD_SERIES_NAME]
 
     def load_plane_metadata(self, data, names=''):
         # Metadata is stored in the HDF5 file as an array of int values, 5 per series for axis sizes (CZTYX)
@@ -238,3 +286,69 @@ class ImageFile:
         keep = (COL_PATH, COL_URL, COL_SERIES, COL_INDEX, MD_SIZE_S,
                 MD_SIZE_C, MD_SIZE_Z, MD_SIZE_T, MD_SIZE_Y, MD_SIZE_X, MD_SERIES_NAME)
         self._metadata_dict = {k: self._metadata_dict[k] for k in keep}
+
+
+def _read_series_metadata(image_file):
+    # Runs in a pool worker. Returns the series metadata along with the
+    # metadata size in case the worker recorded a failure.
+    return image_file.read_series_metadata(), image_file.metadata[MD_SIZE_S]
+
+
+def extract_planes(image_files, workspace=None, workers=None, mode=None, batch_size=EXTRACTION_BATCH_SIZE):
+    """Extract the plane metadata of many image files
+
+    image_files - the ImageFile objects to extract. Files that have
+                  already been extracted are skipped.
+
+    workspace - if not None, the metadata is written to the workspace's
+                file list in batches of batch_size files
+
+    workers - the number of files to read at once. Defaults to the
+              metadata extraction workers preference.
+
+    mode - EXTRACTION_MODE_THREADS or EXTRACTION_MODE_PROCESSES. Defaults
+           to the metadata extraction mode preference.
+    """
+    if workers is None:
+        workers = get_metadata_extraction_workers()
+    if mode is None:
+        mode = get_metadata_extraction_mode()
+    to_extract = [image_file for image_file in image_files if not image_file.extracted]
+    if len(to_extract) == 0:
+        return
+    pending = []
+
+    def write_pending():
+        if workspace is not None and len(pending) > 0:
+            workspace.file_list.add_metadata_batch(
+                [(image_file.url, *image_file.get_plane_metadata_array()) for image_file in pending]
+            )
+        del pending[:]
+
+    def on_result(image_file, meta_dict, size_s):
+        if meta_dict is None:
+            image_file.metadata[MD_SIZE_S] = size_s
+            return
+        image_file.set_series_metadata(meta_dict)
+        pending.append(image_file)
+        if len(pending) >= batch_size:
+            write_pending()
+
+    if workers <= 1 or len(to_extract) == 1:
+        for image_file in to_extract:
+            on_result(image_file, *_read_series_metadata(image_file))
+    else:
+        if mode == EXTRACTION_MODE_PROCESSES:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="ExtractPlanes"
+            )
+        with executor:
+            # Results are consumed in order so that the file list is
+            # written in the same order as a serial extraction.
+            for image_file, (meta_dict, size_s) in zip(
+                to_extract, executor.map(_read_series_metadata, to_extract)
+            ):
+                on_result(image_file, meta_dict, size_s)
+    write_pending()
@@ -2,7 +2,7 @@ import collections
 import logging
 
 from cellprofiler_core.constants.measurement import RESERVED_METADATA_KEYS, \
-    C_MONOCHROME, C_RGB, C_TILE, C_URL, \
+    C_MONOCHROME, C_RGB, C_TILE, C_TILE_X, C_TILE_Y, C_URL, \
     C_SERIES, C_C, C_Z, C_T, C_INDEX, C_SERIES_NAME
 from cellprofiler_core.pipeline import ImageFile
 
@@ -158,6 +158,27 @@ class ImagePlane:
         else:
             return None
 
+    def make_tile(self, xywh):
+        """Make a plane for a tile of this plane
+
+        xywh - the (x, y, width, height) of the tile within this plane or
+               None for a single tile covering the whole plane
+
+        The tile keeps this plane's metadata and records the tile's origin
+        in the TileX and TileY metadata keys.
+        """
+        tile = ImagePlane(self._file, color=self._multichannel)
+        tile._metadata_dict = self._metadata_dict.copy()
+        if xywh is None:
+            tile._metadata_dict[C_TILE] = self.tile
+            tile._metadata_dict[C_TILE_X] = 0
+            tile._metadata_dict[C_TILE_Y] = 0
+        else:
+            tile._metadata_dict[C_TILE] = tuple(xywh)
+            tile._metadata_dict[C_TILE_X] = xywh[0]
+            tile._metadata_dict[C_TILE_Y] = xywh[1]
+        return tile
+
     def get_all_metadata(self):
         return {**self.file.metadata, **self._metadata_dict}
 
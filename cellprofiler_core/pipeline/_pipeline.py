@@ -24,6 +24,7 @@ import numpy
 from . import ImageFile
 from .io import dump as dumpit
 from ..constants.reader import ALL_READERS
+from ..reader import get_frame_cache, get_reader_pool
 from ..setting.multichoice import ImageNameSubscriberMultiChoice
 from ..setting.subscriber import ImageSubscriber
 from ..setting.subscriber import ImageListSubscriber
@@ -1002,6 +1003,8 @@ class Pipeline:
                 for provider in measurements.providers:
                     provider.release_memory()
 
+                get_frame_cache().clear()
+
                 measurements.next_image_set(image_number)
 
                 if is_first_image_set:
@@ -1188,6 +1191,8 @@ class Pipeline:
             # by freeing up memory and resources.
             for reader in ALL_READERS.values():
                 reader.clear_cached_readers()
+            get_reader_pool().close_all()
+            get_frame_cache().clear()
             if measurements is not None:
                 workspace = Workspace(
                     self, None, None, None, measurements, image_set_list, frame
@@ -1231,121 +1236,127 @@ class Pipeline:
 
         Returns a workspace suitable for use in self.post_group()
         """
-        measurements.next_image_set(image_set_number)
-        measurements.group_number = measurements[
-            "Image", GROUP_NUMBER,
-        ]
-        measurements.group_index = measurements[
-            "Image", GROUP_INDEX,
-        ]
-        object_set = ObjectSet()
-        image_set = measurements
-        measurements.clear_cache()
-        for provider in measurements.providers:
-            provider.release_memory()
-        outlines = {}
-        grids = None
-        should_write_measurements = True
-        for module in self.modules():
-            print("Running module", module.module_name, module.module_num)
-            if module.should_stop_writing_measurements():
-                should_write_measurements = False
-            workspace = Workspace(
-                self,
-                module,
-                image_set,
-                object_set,
-                measurements,
-                None,
-                outlines=outlines,
-            )
-            workspace.interaction_handler = interaction_handler
-            workspace.cancel_handler = cancel_handler
+        measurements.start_buffering()
+        try:
+            measurements.next_image_set(image_set_number)
+            measurements.group_number = measurements[
+                "Image", GROUP_NUMBER,
+            ]
+            measurements.group_index = measurements[
+                "Image", GROUP_INDEX,
+            ]
+            object_set = ObjectSet()
+            image_set = measurements
+            measurements.clear_cache()
+            for provider in measurements.providers:
+                provider.release_memory()
+            get_frame_cache().clear()
+            outlines = {}
+            grids = None
+            should_write_measurements = True
+            for module in self.modules():
+                print("Running module", module.module_name, module.module_num)
+                if module.should_stop_writing_measurements():
+                    should_write_measurements = False
+                workspace = Workspace(
+                    self,
+                    module,
+                    image_set,
+                    object_set,
+                    measurements,
+                    None,
+                    outlines=outlines,
+                )
+                workspace.interaction_handler = interaction_handler
+                workspace.cancel_handler = cancel_handler
 
-            grids = workspace.set_grids(grids)
+                grids = workspace.set_grids(grids)
 
-            start_time = datetime.datetime.now()
-            os_times = os.times()
-            wall_t0 = timeit.default_timer()
-            cpu_t0 = sum(os_times[:-1])
-            try:
-                self.run_module(module, workspace)
-                if module.show_window:
-                    display_handler(module, workspace.display_data, image_set_number)
+                start_time = datetime.datetime.now()
+                os_times = os.times()
+                wall_t0 = timeit.default_timer()
+                cpu_t0 = sum(os_times[:-1])
                 try:
-                    if self.redundancy_map is not None:
-                        if module in self.redundancy_map and len(self.modules()) > module.module_num:
-                            to_forget = self.redundancy_map[module]
-                            for image_name in to_forget:
-                                LOGGER.info(f"Releasing memory for redundant image {image_name}")
-                                workspace.image_set.clear_image(image_name)
-                        gc.collect()
-                except Exception as e:
-                    LOGGER.warning(f"Encountered error during memory cleanup: {e}")
-            except CancelledException:
-                # Analysis worker interaction handler is telling us that
-                # the UI has cancelled the run. Forward exception upward.
-                raise
-            except Exception as exception:
-                print("run_image_set_exception, get_always_continue",get_always_continue())
-                LOGGER.error(
-                    "Error detected during run of module %s#%d",
-                    module.module_name,
-                    module.module_num,
-                    exc_info=True,
+                    self.run_module(module, workspace)
+                    if module.show_window:
+                        display_handler(module, workspace.display_data, image_set_number)
+                    try:
+                        if self.redundancy_map is not None:
+                            if module in self.redundancy_map and len(self.modules()) > module.module_num:
+                                to_forget = self.redundancy_map[module]
+                                for image_name in to_forget:
+                                    LOGGER.info(f"Releasing memory for redundant image {image_name}")
+                                    workspace.image_set.clear_image(image_name)
+                            gc.collect()
+                    except Exception as e:
+                        LOGGER.warning(f"Encountered error during memory cleanup: {e}")
+                except CancelledException:
+                    # Analysis worker interaction handler is telling us that
+                    # the UI has cancelled the run. Forward exception upward.
+                    raise
+                except Exception as exception:
+                    print("run_image_set_exception, get_always_continue",get_always_continue())
+                    LOGGER.error(
+                        "Error detected during run of module %s#%d",
+                        module.module_name,
+                        module.module_num,
+                        exc_info=True,
+                    )
+                    if should_write_measurements:
+                        measurements[
+                            "Image",
+                            "ModuleError_%02d%s" % (module.module_num, module.module_name),
+                        ] = 1
+                    if get_always_continue():
+                        return
+                    evt = RunException(exception, module, sys.exc_info()[2])
+                    self.notify_listeners(evt)
+                    if evt.cancel_run or evt.skip_thisset:
+                        # actual cancellation or skipping handled upstream.
+                        return
+
+                os_times = os.times()
+                wall_t1 = timeit.default_timer()
+                cpu_t1 = sum(os_times[:-1])
+                cpu_delta_secs = max(0, cpu_t1 - cpu_t0)
+                wall_delta_secs = max(0, wall_t1 - wall_t0)
+                LOGGER.info(
+                    "%s: Image # %d, module %s # %d: CPU_time = %.2f secs, Wall_time = %.2f secs"
+                    % (
+                        start_time.ctime(),
+                        image_set_number,
+                        module.module_name,
+                        module.module_num,
+                        cpu_delta_secs,
+                        wall_delta_secs,
+                    )
                 )
+                # Paradox: ExportToDatabase must write these columns in order
+                #  to complete, but in order to do so, the module needs to
+                #  have already completed. So we don't report them for it.
                 if should_write_measurements:
                     measurements[
                         "Image",
                         "ModuleError_%02d%s" % (module.module_num, module.module_name),
-                    ] = 1
-                if get_always_continue():
-                    return
-                evt = RunException(exception, module, sys.exc_info()[2])
-                self.notify_listeners(evt)
-                if evt.cancel_run or evt.skip_thisset:
-                    # actual cancellation or skipping handled upstream.
-                    return
-
-            os_times = os.times()
-            wall_t1 = timeit.default_timer()
-            cpu_t1 = sum(os_times[:-1])
-            cpu_delta_secs = max(0, cpu_t1 - cpu_t0)
-            wall_delta_secs = max(0, wall_t1 - wall_t0)
-            LOGGER.info(
-                "%s: Image # %d, module %s # %d: CPU_time = %.2f secs, Wall_time = %.2f secs"
-                % (
-                    start_time.ctime(),
-                    image_set_number,
-                    module.module_name,
-                    module.module_num,
-                    cpu_delta_secs,
-                    wall_delta_secs,
-                )
-            )
-            # Paradox: ExportToDatabase must write these columns in order
-            #  to complete, but in order to do so, the module needs to
-            #  have already completed. So we don't report them for it.
-            if should_write_measurements:
-                measurements[
-                    "Image",
-                    "ModuleError_%02d%s" % (module.module_num, module.module_name),
-                ] = 0
-                measurements[
-                    "Image",
-                    "ExecutionTime_%02d%s" % (module.module_num, module.module_name),
-                ] = float(cpu_delta_secs)
+                    ] = 0
+                    measurements[
+                        "Image",
+                        "ExecutionTime_%02d%s" % (module.module_num, module.module_name),
+                    ] = float(cpu_delta_secs)
 
-            measurements.flush()
-            if workspace.disposition == DISPOSITION_SKIP:
-                break
+                if workspace.disposition == DISPOSITION_SKIP:
+                    break
 
-        if get_conserve_memory():
-            gc.collect()
+            if get_conserve_memory():
+                gc.collect()
 
-        return Workspace(
-            self, None, measurements, object_set, measurements, None, outlines=outlines
-        )
+            return Workspace(
+                self, None, measurements, object_set, measurements, None, outlines=outlines
+            )
+        finally:
+            # write the image set's measurements in one append per feature
+            measurements.stop_buffering()
+            measurements.flush()
 
     def end_run(self):
         """Tell everyone that a run is ending"""
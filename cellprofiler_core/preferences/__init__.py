@@ -416,6 +416,24 @@ PATHNAME_RE_GUESSES_FILE = "PathnameRegularExpressionGuessesFile"
 CHOOSE_IMAGE_SET_FRAME_SIZE = "ChooseImageSetFrameSize"
 ALWAYS_CONTINUE = "AlwaysContinue"
 WIDGET_INSPECTOR = "WidgetInspector"
+METADATA_EXTRACTION_WORKERS = "MetadataExtractionWorkers"
+METADATA_EXTRACTION_MODE = "MetadataExtractionMode"
+CACHE_PLANE_METADATA = "CachePlaneMetadata"
+CACHE_REMOTE_PLANE_METADATA = "CacheRemotePlaneMetadata"
+READER_POOL_SIZE = "ReaderPoolSize"
+MAX_OPEN_READERS = "MaxOpenReaders"
+PREFETCH_MEMORY_MB = "PrefetchMemoryMB"
+FRAME_CACHE_MB = "FrameCacheMB"
+ZARR_STORE_CACHE_SIZE = "ZarrStoreCacheSize"
+ZARR_CHUNK_CACHE_MB = "ZarrChunkCacheMB"
+LAZY_IMAGE_CONVERSION = "LazyImageConversion"
+DOWNLOAD_CACHE_MB = "DownloadCacheMB"
+MAX_JOB_BATCH_SIZE = "MaxJobBatchSize"
+NARROW_INTEGER_ARRAYS = "NarrowIntegerArrays"
+PAYLOAD_COMPRESSION = "PayloadCompression"
+COMPRESSION_THRESHOLD_KB = "CompressionThresholdKB"
+WORKER_INTERFACE = "WorkerInterface"
+WORKER_ADVERTISED_HOST = "WorkerAdvertisedHost"
 
 """Default URL root for BatchProfiler"""
 
@@ -428,11 +446,24 @@ INTENSITY_MODE_NORMAL = "normalized"
 INTENSITY_MODE_LOG = "log"
 INTENSITY_MODE_GAMMA = "gamma"
 
+"""Send the data in worker messages as is"""
+PAYLOAD_COMPRESSION_NONE = "none"
+"""Compress the data in worker messages with zlib"""
+PAYLOAD_COMPRESSION_ZLIB = "zlib"
+"""Compress the data in worker messages with lz4, if it is installed"""
+PAYLOAD_COMPRESSION_LZ4 = "lz4"
+
 WC_SHOW_WORKSPACE_CHOICE_DIALOG = "ShowWorkspaceChoiceDlg"
 WC_OPEN_LAST_WORKSPACE = "OpenLastWorkspace"
 WC_CREATE_NEW_WORKSPACE = "CreateNewWorkspace"
 WC_OPEN_OLD_WORKSPACE = "OpenOldWorkspace"
 
+"""Extract plane metadata from image files using a pool of threads"""
+EXTRACTION_MODE_THREADS = "Threads"
+"""Extract plane metadata from image files using a pool of processes"""
+EXTRACTION_MODE_PROCESSES = "Processes"
+EXTRACTION_MODES = [EXTRACTION_MODE_THREADS, EXTRACTION_MODE_PROCESSES]
+
 """The default extension for a CellProfiler pipeline (without the dot)"""
 EXT_PIPELINE = "cppipe"
 
@@ -465,8 +496,12 @@ SPP_ALL = [
 
 # Registry Key Types
 BOOL_KEYS = {SHOW_SAMPLING, TELEMETRY, TELEMETRY_PROMPT, STARTUPBLURB, 
-             CONSERVE_MEMORY, ALWAYS_CONTINUE, WIDGET_INSPECTOR, FORCE_BIOFORMATS}
-INT_KEYS = {SKIPVERSION, OMERO_PORT, MAX_WORKERS, JVM_HEAP_MB}
+             CONSERVE_MEMORY, ALWAYS_CONTINUE, WIDGET_INSPECTOR, FORCE_BIOFORMATS,
+             CACHE_PLANE_METADATA, CACHE_REMOTE_PLANE_METADATA, LAZY_IMAGE_CONVERSION,
+             NARROW_INTEGER_ARRAYS}
+INT_KEYS = {SKIPVERSION, OMERO_PORT, MAX_WORKERS, JVM_HEAP_MB, METADATA_EXTRACTION_WORKERS,
+            READER_POOL_SIZE, MAX_OPEN_READERS, PREFETCH_MEMORY_MB, FRAME_CACHE_MB, ZARR_STORE_CACHE_SIZE,
+            ZARR_CHUNK_CACHE_MB, DOWNLOAD_CACHE_MB, MAX_JOB_BATCH_SIZE, COMPRESSION_THRESHOLD_KB}
 FLOAT_KEYS = {TITLE_FONT_SIZE, TABLE_FONT_SIZE, PIXEL_SIZE}
 
 #######################
@@ -593,6 +628,150 @@ also start CellProfiler from the command-line with the –jvm-heap-size
 switch to get the same effect.\
 """
 
+METADATA_EXTRACTION_WORKERS_HELP = """\
+Controls how many image files are scanned at once when the **Images**
+module extracts the series and plane structure of each file. Scanning
+a file's header mostly waits on disk or network I/O, so using several
+workers can greatly speed up extraction of large file lists on network
+storage. Set this to 1 to scan the files one at a time.\
+"""
+
+METADATA_EXTRACTION_MODE_HELP = """\
+Choose whether image file headers are scanned by a pool of threads or
+a pool of processes. Threads are cheap to start and work well when
+scanning is limited by I/O. Processes avoid contention between readers
+that hold the Python interpreter lock while parsing headers, at the cost
+of starting the processes.\
+"""
+
+CACHE_PLANE_METADATA_HELP = """\
+If enabled, the series and plane structure found in each image file is
+saved in a cache within the temporary directory, together with the file's
+size and modification time and the reader that was used. Later projects
+that use the same files can then skip opening each file to read its
+header, as long as the file and the reader's settings have not changed.
+Entries that have not been used for a long time are removed.\
+"""
+
+CACHE_REMOTE_PLANE_METADATA_HELP = """\
+If enabled, the plane structure of images on web servers is cached as
+well. Checking whether a web resource has changed takes a request to the
+server for every file, even if the file is not in the cache, so this is
+off by default.\
+"""
+
+READER_POOL_SIZE_HELP = """\
+Controls how many image readers are kept open after an image set is
+processed. When later image sets read from the same file, for instance a
+plate stored as a single multi-series file or a movie, they reuse the
+open reader instead of opening and parsing the file again. Set this to 0
+to close each file as soon as an image set is done with it.\
+"""
+
+MAX_OPEN_READERS_HELP = """\
+The maximum number of image readers kept open at once in each worker.
+Idle readers are closed, least recently used first, to stay within this
+limit. Lower this if you run into limits on the number of open files.\
+"""
+
+PREFETCH_MEMORY_MB_HELP = """\
+The amount of memory, in megabytes, that each worker may use to read the
+images of its next image set while the current image set is processed.
+Reading ahead keeps the CPU busy when images are loaded from slow or
+network storage. Set this to 0 to turn off reading ahead.\
+"""
+
+FRAME_CACHE_MB_HELP = """\
+The amount of memory, in megabytes, that each worker uses to keep the
+decoded frames of multi-channel image files while an image set is
+processed. When several images of an image set are channels of the same
+file, the file's frame is then decoded once rather than once per
+channel. Set this to 0 to turn off the frame cache.\
+"""
+
+ZARR_STORE_CACHE_SIZE_HELP = """\
+The number of OME-Zarr stores that each worker keeps open. Opening a
+store reads its metadata, which is slow for stores on object storage
+such as S3. The least recently used store is closed when more are open.\
+"""
+
+ZARR_CHUNK_CACHE_MB_HELP = """\
+The amount of memory, in megabytes, that each worker uses to keep chunks
+read from OME-Zarr stores. Cached chunks are not fetched again when
+neighbouring tiles or channels of the same chunk are read. Set this to 0
+to turn off chunk caching.\
+"""
+
+LAZY_IMAGE_CONVERSION_HELP = """\
+If enabled, images loaded from integer files such as 8-bit or 16-bit
+TIFFs are kept in their native data type and only converted to floating
+point when a module first needs the floating point values. This saves
+memory and time for pipelines whose modules can work on the integer
+data directly. Images loaded with their intensities rescaled by the
+file's metadata are already floating point and are not affected.\
+"""
+
+DOWNLOAD_CACHE_MB_HELP = """\
+The amount of disk space, in megabytes, used to keep images downloaded
+from web servers, S3 or Google Cloud Storage within the temporary
+directory. Images that are used by many image sets, such as illumination
+functions, are then downloaded once rather than once per image set. A
+cached image is downloaded again if the remote file changes. The least
+recently used images are deleted when the cache is full. Set this to 0
+to turn off the download cache.\
+"""
+
+MAX_JOB_BATCH_SIZE_HELP = """\
+The maximum number of image sets sent to a worker at a time when the
+pipeline doesn't group its images. Sending several image sets at once
+saves the cost of a round trip to the worker for each image set, which
+matters for pipelines that take less than a second per image set. The
+number sent is chosen from how long the image sets take to run and
+becomes smaller towards the end of the analysis so that the workers
+finish together. Set this to 1 to send one image set at a time.\
+"""
+
+NARROW_INTEGER_ARRAYS_HELP = """\
+If enabled, 64-bit and unsigned 32-bit integer arrays sent between
+CellProfiler and its workers are converted to 32-bit integers when their
+values fit. This is only needed when some workers are 32-bit programs,
+which can't index with wider integers. It costs a scan of each array, so
+leave it off when all workers run on the same kind of machine.\
+"""
+
+PAYLOAD_COMPRESSION_HELP = """\
+Compress the images, measurements and other data sent between
+CellProfiler and its workers. This helps when workers run on other
+machines or the network is slow, but costs processor time, so leave it
+off when all workers run on this machine. *lz4* is faster than *zlib*.
+Data is only compressed with *lz4* for a worker or CellProfiler instance
+that has it installed, and with *zlib* otherwise.\
+"""
+
+COMPRESSION_THRESHOLD_KB_HELP = """\
+The size, in kilobytes, below which the data in worker messages is sent
+uncompressed when compression is turned on. Small messages take little
+time to send and gain little from compression.\
+"""
+
+WORKER_INTERFACE_HELP = """\
+The network interface on which CellProfiler listens for its workers. The
+default, *127.0.0.1*, only accepts workers on this machine. Enter the
+address of a network interface, or *\\** for all of them, to let workers
+on other machines join an analysis with
+``python -m cellprofiler_core.worker`` and the arguments that
+CellProfiler logs when the analysis starts. Only do this on a trusted
+network: any machine that can reach the interface can ask for the
+pipeline and images of a running analysis.\
+"""
+
+WORKER_ADVERTISED_HOST_HELP = """\
+The host name or address that workers on other machines should use to
+reach CellProfiler. Leave this blank to use the address of the worker
+interface or, if CellProfiler listens on all interfaces, this machine's
+host name.\
+"""
+
 MAX_WORKERS_HELP = """\
 Controls the maximum number of *workers* (i.e., copies of CellProfiler)
 that will be started at the outset of an analysis run. CellProfiler uses
@@ -801,6 +980,8 @@ ALL_KEYS = [
     OMERO_PORT,
     OMERO_USER,
     SAVE_PIPELINE_WITH_PROJECT,
+    PAYLOAD_COMPRESSION,
+    COMPRESSION_THRESHOLD_KB,
 ] + [
     recent_file(n, category)
     for n in range(RECENT_FILE_COUNT)
@@ -2105,3 +2286,429 @@ def set_widget_inspector(val, globally=True):
     __widget_inspector = val
     if globally:
         config_write(WIDGET_INSPECTOR, val)
+
+
+__metadata_extraction_workers = None
+
+
+def get_metadata_extraction_workers():
+    """Get the number of workers used to extract plane metadata from image files"""
+    global __metadata_extraction_workers
+    if __metadata_extraction_workers is not None:
+        return __metadata_extraction_workers
+    if not config_exists(METADATA_EXTRACTION_WORKERS):
+        return 1
+    return get_config().ReadInt(METADATA_EXTRACTION_WORKERS, 1)
+
+
+def set_metadata_extraction_workers(value, globally=True):
+    """Set the number of workers used to extract plane metadata from image files"""
+    global __metadata_extraction_workers
+    __metadata_extraction_workers = int(value)
+    if globally:
+        config_write(METADATA_EXTRACTION_WORKERS, int(value))
+
+
+__metadata_extraction_mode = None
+
+
+def get_metadata_extraction_mode():
+    """Get whether plane metadata is extracted using threads or processes"""
+    global __metadata_extraction_mode
+    if __metadata_extraction_mode is not None:
+        return __metadata_extraction_mode
+    if not config_exists(METADATA_EXTRACTION_MODE):
+        return EXTRACTION_MODE_THREADS
+    mode = config_read(METADATA_EXTRACTION_MODE)
+    if mode not in EXTRACTION_MODES:
+        return EXTRACTION_MODE_THREADS
+    return mode
+
+
+def set_metadata_extraction_mode(value, globally=True):
+    """Set whether plane metadata is extracted using threads or processes"""
+    global __metadata_extraction_mode
+    if value not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown metadata extraction mode: {value}")
+    __metadata_extraction_mode = value
+    if globally:
+        config_write(METADATA_EXTRACTION_MODE, value)
+
+
+__cache_plane_metadata = None
+
+
+def get_cache_plane_metadata():
+    """Get whether image file plane metadata is cached between projects"""
+    global __cache_plane_metadata
+    if __cache_plane_metadata is not None:
+        return __cache_plane_metadata in (True, "True")
+    if not config_exists(CACHE_PLANE_METADATA):
+        return True
+    return get_config().ReadBool(CACHE_PLANE_METADATA)
+
+
+def set_cache_plane_metadata(val, globally=True):
+    """Set whether image file plane metadata is cached between projects"""
+    global __cache_plane_metadata
+    __cache_plane_metadata = val
+    if globally:
+        config_write(CACHE_PLANE_METADATA, val)
+
+
+__cache_remote_plane_metadata = None
+
+
+def get_cache_remote_plane_metadata():
+    """Get whether the plane metadata of web resources is cached"""
+    global __cache_remote_plane_metadata
+    if __cache_remote_plane_metadata is not None:
+        return __cache_remote_plane_metadata in (True, "True")
+    if not config_exists(CACHE_REMOTE_PLANE_METADATA):
+        return False
+    return get_config().ReadBool(CACHE_REMOTE_PLANE_METADATA)
+
+
+def set_cache_remote_plane_metadata(val, globally=True):
+    """Set whether the plane metadata of web resources is cached"""
+    global __cache_remote_plane_metadata
+    __cache_remote_plane_metadata = val
+    if globally:
+        config_write(CACHE_REMOTE_PLANE_METADATA, val)
+
+
+"""Default number of idle image readers kept open"""
+DEFAULT_READER_POOL_SIZE = 8
+
+"""Default maximum number of image readers open at once"""
+DEFAULT_MAX_OPEN_READERS = 64
+
+__reader_pool_size = None
+
+
+def get_reader_pool_size():
+    """Get the number of idle image readers kept open for reuse"""
+    global __reader_pool_size
+    if __reader_pool_size is not None:
+        return __reader_pool_size
+    if not config_exists(READER_POOL_SIZE):
+        return DEFAULT_READER_POOL_SIZE
+    return get_config().ReadInt(READER_POOL_SIZE, DEFAULT_READER_POOL_SIZE)
+
+
+def set_reader_pool_size(value, globally=True):
+    """Set the number of idle image readers kept open for reuse"""
+    global __reader_pool_size
+    __reader_pool_size = int(value)
+    if globally:
+        config_write(READER_POOL_SIZE, int(value))
+
+
+__max_open_readers = None
+
+
+def get_max_open_readers():
+    """Get the maximum number of image readers open at once"""
+    global __max_open_readers
+    if __max_open_readers is not None:
+        return __max_open_readers
+    if not config_exists(MAX_OPEN_READERS):
+        return DEFAULT_MAX_OPEN_READERS
+    return get_config().ReadInt(MAX_OPEN_READERS, DEFAULT_MAX_OPEN_READERS)
+
+
+def set_max_open_readers(value, globally=True):
+    """Set the maximum number of image readers open at once"""
+    global __max_open_readers
+    __max_open_readers = int(value)
+    if globally:
+        config_write(MAX_OPEN_READERS, int(value))
+
+
+"""Default memory budget for images read ahead of time, in megabytes"""
+DEFAULT_PREFETCH_MEMORY_MB = 256
+
+__prefetch_memory_mb = None
+
+
+def get_prefetch_memory_mb():
+    """Get the memory budget for images read ahead of time, in megabytes"""
+    global __prefetch_memory_mb
+    if __prefetch_memory_mb is not None:
+        return __prefetch_memory_mb
+    if not config_exists(PREFETCH_MEMORY_MB):
+        return DEFAULT_PREFETCH_MEMORY_MB
+    return get_config().ReadInt(PREFETCH_MEMORY_MB, DEFAULT_PREFETCH_MEMORY_MB)
+
+
+def set_prefetch_memory_mb(value, globally=True):
+    """Set the memory budget for images read ahead of time, in megabytes"""
+    global __prefetch_memory_mb
+    __prefetch_memory_mb = int(value)
+    if globally:
+        config_write(PREFETCH_MEMORY_MB, int(value))
+
+
+"""Default memory budget for decoded frames of multi-channel files, in megabytes"""
+DEFAULT_FRAME_CACHE_MB = 512
+
+__frame_cache_mb = None
+
+
+def get_frame_cache_mb():
+    """Get the memory budget for decoded frames of multi-channel files, in megabytes"""
+    global __frame_cache_mb
+    if __frame_cache_mb is not None:
+        return __frame_cache_mb
+    if not config_exists(FRAME_CACHE_MB):
+        return DEFAULT_FRAME_CACHE_MB
+    return get_config().ReadInt(FRAME_CACHE_MB, DEFAULT_FRAME_CACHE_MB)
+
+
+def set_frame_cache_mb(value, globally=True):
+    """Set the memory budget for decoded frames of multi-channel files, in megabytes"""
+    global __frame_cache_mb
+    __frame_cache_mb = int(value)
+    if globally:
+        config_write(FRAME_CACHE_MB, int(value))
+
+
+"""Default number of OME-Zarr stores kept open"""
+DEFAULT_ZARR_STORE_CACHE_SIZE = 16
+
+__zarr_store_cache_size = None
+
+
+def get_zarr_store_cache_size():
+    """Get the number of OME-Zarr stores kept open"""
+    global __zarr_store_cache_size
+    if __zarr_store_cache_size is not None:
+        return __zarr_store_cache_size
+    if not config_exists(ZARR_STORE_CACHE_SIZE):
+        return DEFAULT_ZARR_STORE_CACHE_SIZE
+    return get_config().ReadInt(ZARR_STORE_CACHE_SIZE, DEFAULT_ZARR_STORE_CACHE_SIZE)
+
+
+def set_zarr_store_cache_size(value, globally=True):
+    """Set the number of OME-Zarr stores kept open"""
+    global __zarr_store_cache_size
+    __zarr_store_cache_size = int(value)
+    if globally:
+        config_write(ZARR_STORE_CACHE_SIZE, int(value))
+
+
+"""Default memory budget for cached OME-Zarr chunks, in megabytes"""
+DEFAULT_ZARR_CHUNK_CACHE_MB = 256
+
+__zarr_chunk_cache_mb = None
+
+
+def get_zarr_chunk_cache_mb():
+    """Get the memory budget for cached OME-Zarr chunks, in megabytes"""
+    global __zarr_chunk_cache_mb
+    if __zarr_chunk_cache_mb is not None:
+        return __zarr_chunk_cache_mb
+    if not config_exists(ZARR_CHUNK_CACHE_MB):
+        return DEFAULT_ZARR_CHUNK_CACHE_MB
+    return get_config().ReadInt(ZARR_CHUNK_CACHE_MB, DEFAULT_ZARR_CHUNK_CACHE_MB)
+
+
+def set_zarr_chunk_cache_mb(value, globally=True):
+    """Set the memory budget for cached OME-Zarr chunks, in megabytes"""
+    global __zarr_chunk_cache_mb
+    __zarr_chunk_cache_mb = int(value)
+    if globally:
+        config_write(ZARR_CHUNK_CACHE_MB, int(value))
+
+
+__lazy_image_conversion = None
+
+
+def get_lazy_image_conversion():
+    """Get whether loaded integer images are converted to float on first use"""
+    global __lazy_image_conversion
+    if __lazy_image_conversion is not None:
+        return __lazy_image_conversion in (True, "True")
+    if not config_exists(LAZY_IMAGE_CONVERSION):
+        return False
+    return get_config().ReadBool(LAZY_IMAGE_CONVERSION)
+
+
+def set_lazy_image_conversion(val, globally=True):
+    """Set whether loaded integer images are converted to float on first use"""
+    global __lazy_image_conversion
+    __lazy_image_conversion = val
+    if globally:
+        config_write(LAZY_IMAGE_CONVERSION, val)
+
+
+"""Default disk space for downloaded images, in megabytes"""
+DEFAULT_DOWNLOAD_CACHE_MB = 2048
+
+__download_cache_mb = None
+
+
+def get_download_cache_mb():
+    """Get the disk space for downloaded images, in megabytes"""
+    global __download_cache_mb
+    if __download_cache_mb is not None:
+        return __download_cache_mb
+    if not config_exists(DOWNLOAD_CACHE_MB):
+        return DEFAULT_DOWNLOAD_CACHE_MB
+    return get_config().ReadInt(DOWNLOAD_CACHE_MB, DEFAULT_DOWNLOAD_CACHE_MB)
+
+
+def set_download_cache_mb(value, globally=True):
+    """Set the disk space for downloaded images, in megabytes"""
+    global __download_cache_mb
+    __download_cache_mb = int(value)
+    if globally:
+        config_write(DOWNLOAD_CACHE_MB, int(value))
+
+
+"""Default maximum number of image sets per job"""
+DEFAULT_MAX_JOB_BATCH_SIZE = 64
+
+__max_job_batch_size = None
+
+
+def get_max_job_batch_size():
+    """Get the maximum number of image sets sent to a worker at a time"""
+    global __max_job_batch_size
+    if __max_job_batch_size is not None:
+        return __max_job_batch_size
+    if not config_exists(MAX_JOB_BATCH_SIZE):
+        return DEFAULT_MAX_JOB_BATCH_SIZE
+    return get_config().ReadInt(MAX_JOB_BATCH_SIZE, DEFAULT_MAX_JOB_BATCH_SIZE)
+
+
+def set_max_job_batch_size(value, globally=True):
+    """Set the maximum number of image sets sent to a worker at a time"""
+    global __max_job_batch_size
+    __max_job_batch_size = int(value)
+    if globally:
+        config_write(MAX_JOB_BATCH_SIZE, int(value))
+
+
+__narrow_integer_arrays = None
+
+
+def get_narrow_integer_arrays():
+    """Get whether integer arrays are narrowed to 32 bits for the workers"""
+    global __narrow_integer_arrays
+    if __narrow_integer_arrays is not None:
+        return __narrow_integer_arrays in (True, "True")
+    if not config_exists(NARROW_INTEGER_ARRAYS):
+        return False
+    return get_config().ReadBool(NARROW_INTEGER_ARRAYS)
+
+
+def set_narrow_integer_arrays(val, globally=True):
+    """Set whether integer arrays are narrowed to 32 bits for the workers"""
+    global __narrow_integer_arrays
+    __narrow_integer_arrays = val
+    if globally:
+        config_write(NARROW_INTEGER_ARRAYS, val)
+
+
+__payload_compression = None
+
+
+def get_payload_compression():
+    """Get how the data in worker messages is compressed
+
+    Returns one of PAYLOAD_COMPRESSION_NONE, PAYLOAD_COMPRESSION_ZLIB or
+    PAYLOAD_COMPRESSION_LZ4
+    """
+    global __payload_compression
+    if __payload_compression is not None:
+        return __payload_compression
+    if not config_exists(PAYLOAD_COMPRESSION):
+        return PAYLOAD_COMPRESSION_NONE
+    # Read through the cache so that workers use the analysis's value
+    return config_read(PAYLOAD_COMPRESSION)
+
+
+def set_payload_compression(value, globally=True):
+    """Set how the data in worker messages is compressed"""
+    global __payload_compression
+    __payload_compression = value
+    if globally:
+        config_write(PAYLOAD_COMPRESSION, value)
+
+
+"""Default size below which message data is sent uncompressed, in kilobytes"""
+DEFAULT_COMPRESSION_THRESHOLD_KB = 64
+
+__compression_threshold_kb = None
+
+
+def get_compression_threshold_kb():
+    """Get the size below which message data is sent uncompressed, in kilobytes"""
+    global __compression_threshold_kb
+    if __compression_threshold_kb is not None:
+        return __compression_threshold_kb
+    if not config_exists(COMPRESSION_THRESHOLD_KB):
+        return DEFAULT_COMPRESSION_THRESHOLD_KB
+    # Read through the cache so that workers use the analysis's value
+    return int(config_read(COMPRESSION_THRESHOLD_KB))
+
+
+def set_compression_threshold_kb(value, globally=True):
+    """Set the size below which message data is sent uncompressed, in kilobytes"""
+    global __compression_threshold_kb
+    __compression_threshold_kb = int(value)
+    if globally:
+        config_write(COMPRESSION_THRESHOLD_KB, int(value))
+
+
+"""Default interface for the worker sockets - only local workers can connect"""
+DEFAULT_WORKER_INTERFACE = "127.0.0.1"
+
+__worker_interface = None
+
+
+def get_worker_interface():
+    """Get the network interface on which the analysis listens for workers"""
+    global __worker_interface
+    if __worker_interface is not None:
+        return __worker_interface
+    if not config_exists(WORKER_INTERFACE):
+        return DEFAULT_WORKER_INTERFACE
+    return config_read(WORKER_INTERFACE)
+
+
+def set_worker_interface(value, globally=True):
+    """Set the network interface on which the analysis listens for workers"""
+    global __worker_interface
+    __worker_interface = value
+    if globally:
+        config_write(WORKER_INTERFACE, value)
+
+
+__worker_advertised_host = None
+
+
+def get_worker_advertised_host():
+    """Get the host name that workers use to reach the analysis
+
+    Returns None if the host should be worked out from the worker interface.
+    """
+    global __worker_advertised_host
+    if __worker_advertised_host is not None:
+        return __worker_advertised_host or None
+    if not config_exists(WORKER_ADVERTISED_HOST):
+        return None
+    return config_read(WORKER_ADVERTISED_HOST) or None
+
+
+def set_worker_advertised_host(value, globally=True):
+    """Set the host name that workers use to reach the analysis
+
+    value - the host name or address or None to work it out from the
+            worker interface
+    """
+    global __worker_advertised_host
+    __worker_advertised_host = value or ""
+    if globally:
+        config_write(WORKER_ADVERTISED_HOST, value or "")
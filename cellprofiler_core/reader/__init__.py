@@ -3,6 +3,8 @@ import sys
 import traceback
 
 from ._reader import Reader
+from ._frame_cache import FrameCache, get_frame_cache
+from ._reader_pool import ReaderPool, get_reader_pool
 from ..constants.reader import ALL_READERS, builtin_readers, BAD_READERS, AVAILABLE_READERS
 
 import logging
@@ -0,0 +1,104 @@
+import collections
+import logging
+import threading
+
+from ..preferences import get_frame_cache_mb
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FrameCache:
+    """A thread-safe cache of decoded frames, shared by all readers
+
+    Formats such as PNG or single-page TIFF can't be read one channel at
+    a time, so a reader decodes the whole frame and slices out the channel
+    that was asked for. When several image names are assigned to the
+    channels of one file, each provider would decode the frame again. The
+    cache keeps the decoded frame, keyed by (url, series, index, z, t), so
+    that the other channels are sliced from the same decode.
+
+    The pipeline clears the cache at each image set boundary. Frames are
+    also dropped in least-recently-used order to keep the total size below
+    max_bytes, which defaults to the FrameCacheMB preference. A budget of
+    0 turns the cache off. Cached frames are shared, so readers must not
+    modify them in place or hand them out without copying.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.__max_bytes = max_bytes
+        self.lock = threading.Condition()
+        self.frames = collections.OrderedDict()
+        self.pending = set()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self):
+        if self.__max_bytes is not None:
+            return self.__max_bytes
+        return get_frame_cache_mb() * 1024 * 1024
+
+    def get(self, key, decode):
+        """Get a decoded frame, decoding it if it isn't cached
+
+        key - the (url, series, index, z, t) of the frame
+
+        decode - a function that takes no arguments and returns the frame
+
+        If another thread is decoding the same frame, waits for it rather
+        than decoding it a second time.
+        """
+        if self.max_bytes <= 0:
+            return decode()
+        with self.lock:
+            while key in self.pending:
+                self.lock.wait()
+            if key in self.frames:
+                self.hits += 1
+                self.frames.move_to_end(key)
+                return self.frames[key]
+            self.misses += 1
+            self.pending.add(key)
+        frame = None
+        try:
+            frame = decode()
+        finally:
+            with self.lock:
+                self.pending.discard(key)
+                if frame is not None:
+                    self.__store(key, frame)
+                self.lock.notify_all()
+        return frame
+
+    def __store(self, key, frame):
+        nbytes = frame.nbytes
+        if nbytes > self.max_bytes:
+            LOGGER.debug(f"Frame {key} is too large to cache")
+            return
+        while self.frames and self.nbytes + nbytes > self.max_bytes:
+            _, evicted = self.frames.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        self.frames[key] = frame
+        self.nbytes += nbytes
+
+    def clear(self):
+        """Drop all cached frames"""
+        with self.lock:
+            self.frames.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.frames
+
+
+__frame_cache = FrameCache()
+
+
+def get_frame_cache():
+    """Get the process-wide decoded frame cache"""
+    return __frame_cache
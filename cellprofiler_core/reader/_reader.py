@@ -143,6 +143,20 @@ class Reader(ABC):
         ."""
         return -1
 
+    def get_resolution_count(self, series=None):
+        """The number of resolution levels stored for a series
+
+        Readers of formats which store downsampled copies of an image, such
+        as OME-NGFF pyramids, should return the number of levels and accept
+        a resolution argument to read and read_volume, 0 being the full
+        resolution.
+        """
+        return 1
+
+    def get_resolution_scale(self, series=None, resolution=0):
+        """The factors by which the Z, Y and X axes are downsampled at a resolution level"""
+        return 1.0, 1.0, 1.0
+
     @classmethod
     def clear_cached_readers(cls):
         # This should clear any cached reader objects if your class stores unused readers.
@@ -0,0 +1,125 @@
+import collections
+import logging
+import threading
+
+from ..preferences import get_reader_pool_size, get_max_open_readers
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ReaderPool:
+    """A process-wide pool of open image readers
+
+    Opening a reader can mean parsing the whole header of a container
+    file such as a multi-series OME-TIFF, a movie or a .zarr store. When
+    many image sets are read from the same file, the pool lets them share
+    one open reader rather than opening the file anew for each image set.
+
+    Readers are checked out by URL and reader class and returned to the
+    pool when the image provider releases its memory. A checked-out reader
+    is used by a single image provider at a time. Idle readers are kept in
+    least-recently-used order and closed when there are more than
+    get_reader_pool_size() of them or more than get_max_open_readers()
+    readers are open in all.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        # (url, reader class) -> list of idle readers, least recent first
+        self.idle = collections.OrderedDict()
+        self.idle_count = 0
+        self.in_use_count = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(image_file, reader_class):
+        return image_file.url, reader_class
+
+    def checkout(self, image_file, reader_class):
+        """Get an open reader of the given class for an image file
+
+        image_file - the ImageFile to be read
+
+        reader_class - the Reader class to use
+
+        Returns a reader which should be given back using checkin.
+        """
+        key = self.get_key(image_file, reader_class)
+        with self.lock:
+            readers = self.idle.get(key)
+            if readers:
+                reader = readers.pop()
+                if len(readers) == 0:
+                    del self.idle[key]
+                self.idle_count -= 1
+                self.in_use_count += 1
+                self.hits += 1
+                return reader
+            self.misses += 1
+            self.in_use_count += 1
+            # Make room for the new reader within the open readers budget.
+            self.__evict(get_reader_pool_size(), get_max_open_readers())
+        try:
+            return reader_class(image_file)
+        except:
+            with self.lock:
+                self.in_use_count -= 1
+            raise
+
+    def checkin(self, reader):
+        """Return a reader to the pool
+
+        reader - a reader from checkout. It is closed if the pool is full.
+        """
+        key = self.get_key(reader.file, type(reader))
+        with self.lock:
+            self.in_use_count = max(self.in_use_count - 1, 0)
+            pool_size = get_reader_pool_size()
+            if pool_size <= 0:
+                self.__close(reader)
+                return
+            if key in self.idle:
+                self.idle[key].append(reader)
+                self.idle.move_to_end(key)
+            else:
+                self.idle[key] = [reader]
+            self.idle_count += 1
+            self.__evict(pool_size, get_max_open_readers())
+
+    def __evict(self, pool_size, max_open):
+        """Close least recently used idle readers until within the limits"""
+        while self.idle_count > 0 and (
+            self.idle_count > pool_size
+            or self.idle_count + self.in_use_count > max_open
+        ):
+            key, readers = next(iter(self.idle.items()))
+            reader = readers.pop(0)
+            if len(readers) == 0:
+                del self.idle[key]
+            self.idle_count -= 1
+            self.__close(reader)
+
+    @staticmethod
+    def __close(reader):
+        try:
+            reader.close()
+        except:
+            LOGGER.warning(f"Failed to close reader for {reader.file.url}", exc_info=True)
+
+    def close_all(self):
+        """Close all idle readers"""
+        with self.lock:
+            self.__evict(0, 0)
+
+    def __len__(self):
+        """The number of idle readers in the pool"""
+        return self.idle_count
+
+
+__reader_pool = ReaderPool()
+
+
+def get_reader_pool():
+    """Get the process-wide reader pool"""
+    return __reader_pool
@@ -88,6 +88,8 @@ class BioformatsReader(Reader):
         if series is not None:
             self._reader.setSeries(series)
 
+        if XYWH is None:
+            XYWH = xywh
         if XYWH is not None:
             assert isinstance(XYWH, tuple) and len(XYWH) == 4, "Invalid XYWH tuple"
             openBytes_func = lambda x: self._reader.openBytes(x, XYWH[0], XYWH[1], XYWH[2], XYWH[3])
@@ -1,11 +1,15 @@
 import collections
+import logging
+
 import numpy
 import imageio
+import tifffile
 
 from ..constants.image import MD_SIZE_S, MD_SIZE_C, MD_SIZE_Z, MD_SIZE_T, MD_SIZE_Y, MD_SIZE_X
 from ..preferences import config_read_typed
-from ..reader import Reader
+from ..reader import Reader, get_frame_cache
 
+LOGGER = logging.getLogger(__name__)
 
 SUPPORTED_EXTENSIONS = {'.png', '.bmp', '.jpeg', '.jpg', '.gif'}
 # bioformats returns 2 for these, imageio reader returns 3
@@ -69,7 +73,14 @@ class ImageIOReader(Reader):
         reader = self.get_reader()
         if series is None:
             series = 0
-        data = reader.get_data(series)
+        # Other channels of this frame may be read for the same image set,
+        # so decode the frame once and slice each channel from it.
+        data = get_frame_cache().get(
+            (self.file.url, series, index, z, t), lambda: reader.get_data(series)
+        )
+        if xywh is not None:
+            x, y, w, h = xywh
+            data = data[y:y + h, x:x + w, ...]
         if c is not None and len(data.shape) > 2:
             data = data[:, :, c, ...]
         elif c is None and len(data.shape) > 2 and data.shape[2] == 4:
@@ -81,6 +92,8 @@ class ImageIOReader(Reader):
             if wants_max_intensity:
                 return data, 1
             return data
+        # The cached frame is shared, so don't hand out a view of it
+        data = data.copy()
         if wants_max_intensity:
             return data, numpy.iinfo(data.dtype).max
         return data
@@ -160,9 +173,15 @@ class ImageIOReader(Reader):
         reader = self.get_reader()
         series_count = reader.get_length()
         meta_dict[MD_SIZE_S] = series_count
-        for i in range(series_count):
-            data = reader.get_data(index=i)
-            dims = data.shape
+        try:
+            shapes = self.get_frame_shapes(reader, series_count)
+        except Exception:
+            LOGGER.debug(f"Unable to read the frame shapes of {self.file.url} from its metadata", exc_info=True)
+            shapes = None
+        if shapes is None:
+            # The format offers no metadata, so decode each frame instead
+            shapes = [reader.get_data(index=i).shape for i in range(series_count)]
+        for dims in shapes:
             # expects dim ordering of: [H, W, C?, T?, Z?]
             meta_dict[MD_SIZE_Z].append(dims[4] if len(dims) > 4 else 1)
             meta_dict[MD_SIZE_T].append(dims[3] if len(dims) > 3 else 1)
@@ -171,6 +190,35 @@ class ImageIOReader(Reader):
             meta_dict[MD_SIZE_Y].append(dims[0])
         return meta_dict
 
+    def get_frame_shapes(self, reader, series_count):
+        """Get the shape of each frame from the file's metadata
+
+        Reads the image dimensions from the file's header without decoding
+        any pixel data.
+
+        reader - the imageio reader for the file
+
+        series_count - the number of frames in the file
+
+        Returns a list of the frame shapes, in the same order of dimensions
+        as reader.get_data, or None if the format offers no metadata.
+        """
+        plugin = getattr(reader, "instance", None)
+        if type(plugin).__name__ == "TifffilePlugin":
+            # imageio describes a series by its first page, but get_data
+            # returns the whole series, so ask tifffile about the series
+            if self.file.scheme != "file":
+                return None
+            with tifffile.TiffFile(self.file.path) as tiff:
+                shapes = [series.shape for series in tiff.series]
+        elif hasattr(plugin, "properties"):
+            shapes = [plugin.properties(index=i).shape for i in range(series_count)]
+        else:
+            return None
+        if len(shapes) != series_count:
+            return None
+        return shapes
+
     @staticmethod
     def get_settings():
         return [
@@ -1,8 +1,12 @@
+import collections
+import threading
+
 import numpy
 import zarr
 
 from ..constants.image import MD_SIZE_S, MD_SIZE_C, MD_SIZE_Z, MD_SIZE_T, MD_SIZE_Y, MD_SIZE_X, MD_SERIES_NAME
 from ..constants.reader import ZARR_FILETYPE
+from ..preferences import get_zarr_store_cache_size, get_zarr_chunk_cache_mb
 
 from ..reader import Reader
 
@@ -17,6 +21,196 @@ LOGGER = logging.getLogger(__name__)
 FORMAT_TESTER = re.compile(r"\.zarr([\\/]|$)", flags=re.IGNORECASE)
 SUPPORTED_SCHEMES = {'file', 's3'}
 
+
+class ChunkCache:
+    """A byte-budgeted LRU of the values read from zarr stores
+
+    The cache is shared by all open stores so that the budget, set by
+    get_zarr_chunk_cache_mb(), covers the whole process. Values are keyed
+    by the store's root URL and the key within the store.
+    """
+
+    def __init__(self, max_bytes=None):
+        self.__max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.values = collections.OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self):
+        if self.__max_bytes is not None:
+            return self.__max_bytes
+        return get_zarr_chunk_cache_mb() * 1024 * 1024
+
+    def get(self, key):
+        """Get a cached value or None if it isn't cached"""
+        with self.lock:
+            value = self.values.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.values.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Cache a value, dropping least recently used values to make room"""
+        nbytes = len(value)
+        max_bytes = self.max_bytes
+        if nbytes > max_bytes:
+            return
+        with self.lock:
+            if key in self.values:
+                return
+            while self.values and self.nbytes + nbytes > max_bytes:
+                _, evicted = self.values.popitem(last=False)
+                self.nbytes -= len(evicted)
+            self.values[key] = value
+            self.nbytes += nbytes
+
+    def discard_root(self, root):
+        """Drop all values read from the store at root"""
+        with self.lock:
+            for key in [key for key in self.values if key[0] == root]:
+                self.nbytes -= len(self.values.pop(key))
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self.values)
+
+
+class CachingStore(zarr.storage.BaseStore):
+    """A read-only zarr store which keeps the values it reads in a ChunkCache
+
+    store - the store to read from, typically an FSStore
+
+    root - the URL of the store, used to key its values in the cache
+
+    chunk_cache - the ChunkCache to use
+    """
+
+    def __init__(self, store, root, chunk_cache):
+        self.store = store
+        self.root = root
+        self.chunk_cache = chunk_cache
+
+    @property
+    def path(self):
+        return self.store.path
+
+    def __getitem__(self, key):
+        value = self.chunk_cache.get((self.root, key))
+        if value is None:
+            value = self.store[key]
+            self.chunk_cache.put((self.root, key), value)
+        return value
+
+    def getitems(self, keys, *, contexts):
+        result = {}
+        missing = []
+        for key in keys:
+            value = self.chunk_cache.get((self.root, key))
+            if value is None:
+                missing.append(key)
+            else:
+                result[key] = value
+        if missing:
+            fetched = self.store.getitems(missing, contexts=contexts)
+            for key, value in fetched.items():
+                self.chunk_cache.put((self.root, key), value)
+            result.update(fetched)
+        return result
+
+    def __contains__(self, key):
+        return key in self.store
+
+    def __iter__(self):
+        return iter(self.store)
+
+    def __len__(self):
+        return len(self.store)
+
+    def listdir(self, path=None):
+        return zarr.storage.listdir(self.store, path)
+
+    def __setitem__(self, key, value):
+        raise zarr.errors.ReadOnlyError()
+
+    def __delitem__(self, key):
+        raise zarr.errors.ReadOnlyError()
+
+
+class ZarrStoreCache:
+    """A bounded, thread-safe LRU of open zarr stores
+
+    Maps the root URL of a store to its open root group and, once the
+    store's planes have been extracted, its series map. At most
+    get_zarr_store_cache_size() stores are kept; the least recently used
+    store is dropped, along with its cached chunks, to make room.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.stores = collections.OrderedDict()
+        self.chunk_cache = ChunkCache()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, root):
+        """Get the (root group, series map) of an open store or None"""
+        with self.lock:
+            entry = self.stores.get(root)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.stores.move_to_end(root)
+            return entry
+
+    def put(self, root, group, series_map=None):
+        """Add an open store to the cache"""
+        with self.lock:
+            self.stores[root] = group, series_map
+            self.stores.move_to_end(root)
+            max_stores = max(get_zarr_store_cache_size(), 0)
+            while len(self.stores) > max_stores:
+                evicted, _ = self.stores.popitem(last=False)
+                self.chunk_cache.discard_root(evicted)
+
+    def set_series_map(self, root, series_map):
+        """Record the series map of an open store"""
+        with self.lock:
+            if root in self.stores:
+                group, _ = self.stores[root]
+                self.stores[root] = group, series_map
+
+    def clear(self):
+        with self.lock:
+            self.stores.clear()
+            self.chunk_cache.clear()
+
+    def __contains__(self, root):
+        with self.lock:
+            return root in self.stores
+
+    def __len__(self):
+        return len(self.stores)
+
+
+__zarr_store_cache = ZarrStoreCache()
+
+
+def get_zarr_store_cache():
+    """Get the process-wide cache of open zarr stores"""
+    return __zarr_store_cache
+
+
 class NGFFReader(Reader):
     """
     A reader for OME-NGFF files with the .zarr extension. Supports both 'normal' and
@@ -34,9 +228,6 @@ class NGFFReader(Reader):
     supported_filetypes = {'.zarr', '.ome.zarr'}
     supported_schemes = SUPPORTED_SCHEMES
 
-    # Reader cache maps a path to a tuple of (zarr_root_group, series_map).
-    ZARR_READER_CACHE = {}
-
     def __init__(self, image_file):
         super().__init__(image_file)
 
@@ -52,10 +243,13 @@ class NGFFReader(Reader):
     def get_reader(self):
         if self._reader is not None:
             return self._reader
-        elif self.root in NGFFReader.ZARR_READER_CACHE:
-            self._reader, self._series_map = NGFFReader.ZARR_READER_CACHE[self.root]
+        store_cache = get_zarr_store_cache()
+        entry = store_cache.get(self.root)
+        if entry is not None:
+            self._reader, self._series_map = entry
         else:
-            store = zarr.storage.FSStore(self.root)
+            fs_store = zarr.storage.FSStore(self.root)
+            store = CachingStore(fs_store, self.root, store_cache.chunk_cache)
             if self.root.lower().startswith('s3'):
                 LOGGER.info("Zarr is stored on S3, will try to read directly.")
                 if '.zmetadata' in store:
@@ -69,7 +263,7 @@ class NGFFReader(Reader):
                 raise IOError("The file, \"%s\", does not exist." % self.root)
             else:
                 self._reader = zarr.open(store, mode='r')
-            NGFFReader.ZARR_READER_CACHE[self.root] = self._reader, None
+            store_cache.put(self.root, self._reader)
         if self.group:
             LOGGER.warning(f"Reader had a group? {self.group}")
             return self._reader[self.group]
@@ -77,7 +271,7 @@ class NGFFReader(Reader):
 
     @classmethod
     def clear_cached_readers(cls):
-        NGFFReader.ZARR_READER_CACHE.clear()
+        get_zarr_store_cache().clear()
 
     def read(self,
              series=None,
@@ -89,6 +283,7 @@ class NGFFReader(Reader):
              xywh=None,
              wants_max_intensity=False,
              channel_names=None,
+             resolution=0,
              ):
         """Read a single plane from the image file.
         :param c: read from this channel. `None` = read color image if multichannel
@@ -103,8 +298,10 @@ class NGFFReader(Reader):
         :param wants_max_intensity: if `False`, only return the image; if `True`,
                   return a tuple of image and max intensity
         :param channel_names: provide the channel names for the OME metadata
+        :param resolution: the pyramid level to read from the multiscales
+                  metadata, 0 being the full resolution
         """
-        LOGGER.debug(f"Reading {c=}, {z=}, {t=}, {series=}, {index=}, {xywh=}")
+        LOGGER.debug(f"Reading {c=}, {z=}, {t=}, {series=}, {index=}, {xywh=}, {resolution=}")
         c2 = None if c is None else c + 1
         z2 = None if z is None else z + 1
         t2 = None if t is None else t + 1
@@ -116,16 +313,7 @@ class NGFFReader(Reader):
             y2 = y + h
         else:
             y, y2, x, x2 = None, None, None, None
-        reader = self.get_reader()
-        if series is None:
-            series = 0
-        if self._series_map is None:
-            arrays = self.find_arrays(reader, multiscales=False, first_only=not self.planes_extracted)
-            self.build_series_map(arrays)
-        if not self._series_map:
-            raise IOError("Zarr appears to contain no valid series. Unable to load data.")
-        series_path, series_name = self._series_map[series]
-        series_reader = reader[series_path]
+        series_reader = self.get_series_array(series, resolution)
         num_dimensions = len(series_reader.shape)
         # Todo: Handle V4 Axis object in .zattrs once it releases
         if num_dimensions == 5:
@@ -171,6 +359,7 @@ class NGFFReader(Reader):
                     xywh=None,
                     wants_max_intensity=False,
                     channel_names=None,
+                    resolution=0,
                     ):
         return self.read(
             series=series,
@@ -180,9 +369,56 @@ class NGFFReader(Reader):
             rescale=rescale,
             xywh=xywh,
             wants_max_intensity=wants_max_intensity,
-            channel_names=channel_names
+            channel_names=channel_names,
+            resolution=resolution,
         )
 
+    def get_series_array(self, series=None, resolution=0):
+        """Get the zarr array holding a series at a resolution level"""
+        reader = self.get_reader()
+        if series is None:
+            series = 0
+        if self._series_map is None:
+            arrays = self.find_arrays(reader, multiscales=False, first_only=not self.planes_extracted)
+            self.build_series_map(arrays)
+        if not self._series_map:
+            raise IOError("Zarr appears to contain no valid series. Unable to load data.")
+        series_path, series_name = self._series_map[series]
+        if not resolution:
+            return reader[series_path]
+        datasets = self.get_datasets(reader, series_path)
+        if resolution >= len(datasets):
+            raise IOError(f"Resolution level {resolution} was requested, but series {series} "
+                          f"of {self.root} has {len(datasets)} levels.")
+        group_path = series_path.rpartition('/')[0]
+        level_path = datasets[resolution]['path']
+        return reader[f"{group_path}/{level_path}" if group_path else level_path]
+
+    @staticmethod
+    def get_datasets(reader, series_path):
+        """Get the multiscales datasets of the group holding a series' array"""
+        group_path = series_path.rpartition('/')[0]
+        group = reader[group_path] if group_path else reader
+        if isinstance(group, zarr.Array) or 'multiscales' not in group.attrs:
+            return [{'path': series_path.rpartition('/')[2]}]
+        return group.attrs['multiscales'][0]['datasets']
+
+    def get_resolution_count(self, series=None):
+        if series is None:
+            series = 0
+        reader = self.get_reader()
+        self.get_series_array(series)
+        series_path, _ = self._series_map[series]
+        return len(self.get_datasets(reader, series_path))
+
+    def get_resolution_scale(self, series=None, resolution=0):
+        full = self.get_series_array(series).shape
+        level = self.get_series_array(series, resolution).shape
+        y_scale = full[-2] / level[-2]
+        x_scale = full[-1] / level[-1]
+        z_scale = full[-3] / level[-3] if len(full) > 2 else 1.0
+        return z_scale, y_scale, x_scale
+
     @classmethod
     def supports_format(cls, image_file, allow_open=False, volume=False):
         """This function needs to evaluate whether a given ImageFile object
@@ -214,14 +450,13 @@ class NGFFReader(Reader):
         self._reader = None
 
     def build_series_map(self, arrays):
-        if self.root in NGFFReader.ZARR_READER_CACHE:
-            _, series_map = NGFFReader.ZARR_READER_CACHE[self.root]
-            if series_map is not None:
-                self._series_map = series_map
-                return
+        entry = get_zarr_store_cache().get(self.root)
+        if entry is not None and entry[1] is not None:
+            self._series_map = entry[1]
+            return
         self._series_map = [(array.path, name) for array, name in arrays]
         if self.planes_extracted:
-            NGFFReader.ZARR_READER_CACHE[self.root] = self._reader, self._series_map
+            get_zarr_store_cache().set_series_map(self.root, self._series_map)
 
     def get_series_metadata(self):
         """Should return a dictionary with the following keys:
@@ -0,0 +1,267 @@
+"""download_cache.py - a persistent, size-bounded cache of downloaded images
+
+Images that are read from web servers, S3 or Google Cloud Storage are
+downloaded to a local file before they are read. Files that are used by
+many image sets, such as illumination functions, would otherwise be
+downloaded again for every image set in every worker. The cache keeps the
+downloaded files in a directory within the temporary directory, named by a
+hash of the URL and a signature of the remote file (its ETag,
+Last-Modified time and size), so a file is downloaded again only when it
+changes.
+
+The cache directory is shared by all workers. A lock file per entry makes
+sure that a file that is needed by several workers at once is downloaded
+only once, and the least recently used files are deleted once the cached
+files take up more than get_download_cache_mb() megabytes. Files that were
+used in the last MIN_ENTRY_AGE seconds are not deleted, so that a worker
+has time to open a file after the cache hands it out.
+"""
+
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+
+import fasteners
+
+from ..preferences import get_download_cache_mb, get_temporary_directory
+from .plane_metadata_cache import get_file_signature
+
+LOGGER = logging.getLogger(__name__)
+
+"""The name of the cache directory within the temporary directory"""
+CACHE_DIRECTORY_NAME = "cellprofiler_download_cache"
+
+"""The lock held while evicting files from the cache"""
+EVICTION_LOCK_NAME = "eviction.lock"
+
+LOCK_SUFFIX = ".lock"
+
+PART_SUFFIX = ".part"
+
+"""Seconds after its last use before a cached file can be deleted"""
+MIN_ENTRY_AGE = 60
+
+"""Seconds after which a partial download is assumed to be abandoned"""
+STALE_PART_SECONDS = 24 * 60 * 60
+
+# File locks are held by a process, so threads also need a thread lock.
+# Lock files are assigned to one of these by hash.
+__thread_locks = [threading.Lock() for _ in range(64)]
+
+
+@contextlib.contextmanager
+def locked(path):
+    """Hold a lock file, excluding other processes and other threads"""
+    with __thread_locks[hash(path) % len(__thread_locks)]:
+        with fasteners.InterProcessLock(path):
+            yield
+
+
+def get_remote_signature(url):
+    """Get a string that changes whenever the remote file at the url changes
+
+    url - an http, https, s3 or gs URL
+
+    Returns None if the file's ETag, modification time and size can't be
+    found, in which case the file should not be cached.
+    """
+    scheme = url.split(":", 1)[0].lower()
+    try:
+        if scheme == "s3":
+            import boto3
+
+            bucket_name, key = url[len("s3://"):].split("/", 1)
+            response = boto3.client("s3").head_object(
+                Bucket=bucket_name, Key=key.replace("+", " ")
+            )
+            return f"{response['ContentLength']}:{response['ETag']}:{response['LastModified']}"
+        if scheme == "gs":
+            from google.cloud import storage
+
+            bucket_name, key = url[len("gs://"):].split("/", 1)
+            blob = storage.Client().bucket(bucket_name).get_blob(key)
+            if blob is None:
+                return None
+            return f"{blob.size}:{blob.etag}:{blob.updated}"
+    except Exception:
+        LOGGER.debug(f"Unable to get the signature of {url}", exc_info=True)
+        return None
+    return get_file_signature(url)
+
+
+class DownloadCache:
+    """A directory of downloaded files keyed on URL and file signature
+
+    Several processes can use the same directory at once.
+    """
+
+    def __init__(self, directory, max_bytes=None, min_age=MIN_ENTRY_AGE):
+        self.directory = directory
+        self.__max_bytes = max_bytes
+        self.min_age = min_age
+        os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self):
+        if self.__max_bytes is not None:
+            return self.__max_bytes
+        return get_download_cache_mb() * 1024 * 1024
+
+    def get_path(self, url, signature, ext=""):
+        """The path of the cached copy of a file
+
+        ext - the file's extension, which is kept so that the right reader
+              is chosen for the cached copy.
+        """
+        key = hashlib.sha256(f"{url}\n{signature}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ext)
+
+    def get(self, url, signature, download, ext=""):
+        """Get the path of the cached copy of a file, downloading it if needed
+
+        url - the file's URL
+
+        signature - the file's signature, see get_remote_signature
+
+        download - a function of the URL that downloads the file and
+                   returns the path of the downloaded file or None if the
+                   download failed. The downloaded file is moved into the
+                   cache.
+
+        ext - the file's extension
+
+        Returns the path to the cached file or None if the download failed.
+        """
+        path = self.get_path(url, signature, ext)
+        with locked(path + LOCK_SUFFIX):
+            if os.path.exists(path):
+                try:
+                    # The modification time orders files for eviction
+                    os.utime(path)
+                    self.hits += 1
+                    return path
+                except FileNotFoundError:
+                    # Evicted by another process in the meantime
+                    pass
+            self.misses += 1
+            downloaded = download(url)
+            if downloaded is None:
+                return None
+            # Move the download next to its destination first so that
+            # readers never see a partial file.
+            part = f"{path}.{os.getpid()}.{threading.get_ident()}{PART_SUFFIX}"
+            shutil.move(downloaded, part)
+            os.replace(part, path)
+            os.utime(path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """Delete the least recently used files until within the byte budget
+
+        keep - a path that must not be deleted, typically the file that was
+               just added.
+
+        Files used within the last min_age seconds are kept, even if the
+        cache is over its budget, because another worker may be about to
+        open them.
+        """
+        with locked(os.path.join(self.directory, EVICTION_LOCK_NAME)):
+            entries = []
+            now = time.time()
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(LOCK_SUFFIX) or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith(PART_SUFFIX):
+                    if now - stat.st_mtime > STALE_PART_SECONDS:
+                        self.__remove(entry.path)
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            entries.sort()
+            total = sum([size for _, size, _ in entries])
+            for mtime_ns, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path == keep or now - mtime_ns / 1e9 < self.min_age:
+                    continue
+                if self.__remove(path):
+                    total -= size
+
+    @staticmethod
+    def __remove(path):
+        """Remove a file, returning False if it can't be removed
+
+        On Windows, a file that is open in a reader can't be removed.
+        """
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            LOGGER.debug(f"Unable to remove {path} from the download cache", exc_info=True)
+            return False
+
+    def clear(self):
+        """Delete all cached files"""
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(LOCK_SUFFIX):
+                self.__remove(entry.path)
+
+    def __len__(self):
+        return len(
+            [
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.is_file()
+                and not entry.name.endswith((LOCK_SUFFIX, PART_SUFFIX))
+            ]
+        )
+
+
+def is_cached_download(path):
+    """True if a file is a copy kept in this process's download cache
+
+    Cached copies are shared with other image sets and workers, so they
+    must not be deleted once read.
+    """
+    directory = os.path.join(get_temporary_directory(), CACHE_DIRECTORY_NAME)
+    try:
+        return os.path.commonpath(
+            [os.path.abspath(path), os.path.abspath(directory)]
+        ) == os.path.abspath(directory)
+    except ValueError:
+        # Paths on different drives
+        return False
+
+
+__caches = {}
+__caches_lock = threading.Lock()
+
+
+def get_download_cache():
+    """Get this process's download cache
+
+    Returns None if the download cache is turned off in the preferences or
+    its directory can't be created.
+    """
+    if get_download_cache_mb() <= 0:
+        return None
+    directory = os.path.join(get_temporary_directory(), CACHE_DIRECTORY_NAME)
+    key = (os.getpid(), directory)
+    with __caches_lock:
+        if key not in __caches:
+            try:
+                __caches[key] = DownloadCache(directory)
+            except OSError:
+                LOGGER.warning(f"Unable to create the download cache at {directory}", exc_info=True)
+                __caches[key] = None
+        return __caches[key]
@@ -100,6 +100,100 @@ CLASS_FILELIST_GROUP = "FileListGroup"
 CLASS_SEGMENTATION_GROUP = "SegmentationGroup"
 
 
+class FeatureIndex:
+    """The cached contents of a feature's "index" dataset
+
+    rows - an N x 3 array of image number, start and stop in the same order
+           as the rows of the "index" dataset. Only the first n_rows are used;
+           the rest is room to grow.
+
+    slots - a lookup array indexed by image number. The value is the row
+            holding that image number's entry or -1 if there is none.
+
+    A FeatureIndex supports "in", len() and keys() like the dictionary of
+    image number to data slice that it replaces, plus vectorized lookups.
+    """
+
+    def __init__(self, index_slices=None):
+        if index_slices is None:
+            index_slices = numpy.zeros((0, 3), int)
+        self.rows = numpy.array(index_slices, numpy.int64).reshape(-1, 3)
+        self.n_rows = len(self.rows)
+        image_numbers = self.rows[:, 0]
+        valid = numpy.flatnonzero(image_numbers >= 0)
+        size = 0 if len(valid) == 0 else numpy.max(image_numbers[valid]) + 1
+        self.slots = numpy.full(size, -1, numpy.int64)
+        # Later rows for the same image number take precedence
+        self.slots[image_numbers[valid]] = valid
+        self.count = numpy.count_nonzero(self.slots >= 0)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, image_number):
+        return 0 <= image_number < len(self.slots) and self.slots[image_number] >= 0
+
+    def __delitem__(self, image_number):
+        if image_number in self:
+            self.slots[image_number] = -1
+            self.count -= 1
+
+    def keys(self):
+        """The image numbers with entries, in ascending order"""
+        return numpy.flatnonzero(self.slots >= 0)
+
+    def lookup(self, image_numbers):
+        """Find the data slices for some image numbers
+
+        image_numbers - a vector of image numbers
+
+        returns a vector of starts, a vector of stops and a boolean vector
+        that is True for image numbers that have an entry.
+        """
+        image_numbers = numpy.atleast_1d(numpy.asarray(image_numbers, numpy.int64))
+        slots = numpy.full(len(image_numbers), -1, numpy.int64)
+        in_range = (image_numbers >= 0) & (image_numbers < len(self.slots))
+        slots[in_range] = self.slots[image_numbers[in_range]]
+        present = slots >= 0
+        rows = self.rows[slots[present]]
+        starts = numpy.zeros(len(image_numbers), numpy.int64)
+        stops = numpy.zeros(len(image_numbers), numpy.int64)
+        starts[present] = rows[:, 1]
+        stops[present] = rows[:, 2]
+        return starts, stops, present
+
+    def update(self, index_slices):
+        """Add or replace entries
+
+        index_slices - an N x 3 array of image number, start and stop
+
+        returns the row of each entry. Image numbers without an entry are
+        given new rows at the end.
+        """
+        result = numpy.zeros(len(index_slices), numpy.int64)
+        for i, (image_number, start, stop) in enumerate(index_slices):
+            if image_number in self:
+                slot = self.slots[image_number]
+            else:
+                slot = self.n_rows
+                self.n_rows += 1
+                if self.n_rows > len(self.rows):
+                    rows = numpy.zeros((max(16, 2 * self.n_rows), 3), numpy.int64)
+                    rows[: len(self.rows)] = self.rows
+                    self.rows = rows
+                if image_number >= len(self.slots):
+                    slots = numpy.full(
+                        max(16, 2 * (image_number + 1)), -1, numpy.int64
+                    )
+                    slots[: len(self.slots)] = self.slots
+                    self.slots = slots
+                self.slots[image_number] = slot
+                self.count += 1
+            self.rows[slot] = (image_number, start, stop)
+            result[i] = slot
+        return result
+
+
 class HDF5Dict(object):
     """The HDF5Dict can be used to store data indexed by a tuple of
     two strings and a non-negative integer.
@@ -246,6 +340,8 @@ class HDF5Dict(object):
                 self.indices = {}
 
             self.lock = HDF5Lock()
+            # write-behind buffer, see start_buffering
+            self.write_buffer = None
 
             self.chunksize = 1024
             if copy is not None:
@@ -255,14 +351,10 @@ class HDF5Dict(object):
                         self.top_group.copy(object_group, self.top_group)
                         for feature_name in list(object_group.keys()):
                             # some measurement objects are written at a higher level, and don't
-                            # have an index (e.g., Relationship).
-                            if "index" in list(object_group[feature_name].keys()):
-                                hdf5_index = object_group[feature_name]["index"][:]
-                                self.__cache_index(
-                                    object_name, feature_name, hdf5_index
-                                )
-                            else:
-                                self.indices[object_name, feature_name] = {}
+                            # have an index (e.g., Relationship). Other indexes
+                            # are cached when first used.
+                            if "index" not in object_group[feature_name]:
+                                self.indices[object_name, feature_name] = FeatureIndex()
                 else:
                     image_numbers = numpy.array(image_numbers)
                     mask = numpy.zeros(numpy.max(image_numbers) + 1, bool)
@@ -271,11 +363,6 @@ class HDF5Dict(object):
                         src_object_group = copy[object_name]
                         if object_name == "Experiment":
                             self.top_group.copy(src_object_group, self.top_group)
-                            for feature_name in list(src_object_group.keys()):
-                                hdf5_index = src_object_group[feature_name]["index"][:]
-                                self.__cache_index(
-                                    object_name, feature_name, hdf5_index
-                                )
                             continue
                         dest_object_group = self.top_group.require_group(object_name)
                         for feature_name in list(src_object_group.keys()):
@@ -374,6 +461,8 @@ class HDF5Dict(object):
             # This happens if the constructor could not open the hdf5 file, or
             # if close is called twice.
             return
+        if getattr(self, "write_buffer", None):
+            self.commit_buffer()
         if self.is_temporary:
             try:
                 self.hdf5_file.flush()  # just in case unlink fails
@@ -391,11 +480,98 @@ class HDF5Dict(object):
         del self.top_group
 
     def flush(self):
+        self.commit_buffer()
         self.hdf5_file.flush()
 
+    def start_buffering(self):
+        """Hold measurement writes in memory until they are committed
+
+        While buffering, values assigned with __setitem__ are kept in memory
+        per feature and image number. commit_buffer writes each feature's
+        values with a single append to the HDF5 file. Reads through
+        __getitem__, has_feature and has_data see the buffered values;
+        other accessors commit the buffer first.
+        """
+        with self.lock:
+            if self.write_buffer is None:
+                self.write_buffer = {}
+
+    def stop_buffering(self):
+        """Commit any buffered writes and write through from now on"""
+        with self.lock:
+            self.commit_buffer()
+            self.write_buffer = None
+
+    def commit_buffer(self, object_name=None, feature_name=None):
+        """Write buffered values to the HDF5 file
+
+        object_name, feature_name - commit only this feature's values or
+                                    commit all features if None
+        """
+        with self.lock:
+            if not self.write_buffer:
+                return
+            if object_name is None:
+                keys = list(self.write_buffer.keys())
+            elif (object_name, feature_name) in self.write_buffer:
+                keys = [(object_name, feature_name)]
+            else:
+                return
+            for key in keys:
+                values, data_type = self.write_buffer.pop(key)
+                self.__write(
+                    key[0],
+                    key[1],
+                    numpy.array(list(values.keys()), int),
+                    list(values.values()),
+                    data_type,
+                )
+
+    def __buffer_write(self, object_name, feature_name, num_idx, vals, data_type):
+        """Add values for some image numbers to the write buffer
+
+        lock must be taken prior to call
+        """
+        values, old_data_type = self.write_buffer.get(
+            (object_name, feature_name), ({}, None)
+        )
+        for image_number, vector in zip(num_idx, vals):
+            if isinstance(vector, numpy.ndarray):
+                vector = vector.copy()
+            else:
+                vector = list(vector)
+            values[int(image_number)] = vector
+        if data_type is None:
+            data_type = old_data_type
+        self.write_buffer[object_name, feature_name] = (values, data_type)
+
+    def __read_buffer(self, object_name, feature_name, vector):
+        """Convert a buffered vector to the form returned by __getitem__
+
+        lock must be taken prior to call
+        """
+        if len(vector) == 0:
+            return None
+        if self.has_object(object_name) and feature_name in self.top_group[object_name]:
+            dataset = self.top_group[object_name][feature_name][DATA]
+            ds_kind = dataset.dtype.kind if dataset.shape[0] > 0 else None
+        else:
+            ds_kind = None
+        if ds_kind in ("S", "U", "O") or not numpy.issubdtype(
+            infer_hdf5_type(vector), numpy.number
+        ):
+            return numpy.array([str(v) for v in vector], object).astype(str)
+        vector = numpy.asarray(vector)
+        if ds_kind == "f" and vector.dtype.kind in ("i", "u", "b"):
+            vector = vector.astype(dataset.dtype)
+        return vector
+
     def file_contents(self):
         with self.lock:
             self.flush()
+            if self.filename is None:
+                # memory-backed file: take the core driver's file image
+                return memoryview(self.hdf5_file.id.get_file_image())
             try:
                 with open(self.filename, "rb") as f:
                     return memoryview(f.read())
@@ -449,6 +625,19 @@ class HDF5Dict(object):
         )
 
         with self.lock:
+            if (
+                self.write_buffer is not None
+                and (object_name, feature_name) in self.write_buffer
+            ):
+                buffered = self.write_buffer[object_name, feature_name][0]
+                if all(int(image_number) in buffered for image_number in num_idx):
+                    return [
+                        self.__read_buffer(
+                            object_name, feature_name, buffered[int(image_number)]
+                        )
+                        for image_number in num_idx
+                    ]
+                self.commit_buffer(object_name, feature_name)
             indices = self.get_indices(object_name, feature_name)
             dataset = self.get_dataset(object_name, feature_name)
             if dataset is None or dataset.shape[0] == 0:
@@ -459,41 +648,25 @@ class HDF5Dict(object):
                 # if fetching more than 1/2 of indices
                 #
                 dataset = dataset[:]
+            starts, stops, present = indices.lookup(num_idx)
+            dests = [
+                slice(start, stop) if is_present and start != stop else None
+                for start, stop, is_present in zip(
+                    starts.tolist(), stops.tolist(), present.tolist()
+                )
+            ]
             if dataset.dtype == object:
                 # Strings come back out as bytes, we need to decode them.
                 try:
                     return [
-                        None
-                        if (
-                            isinstance(dest, slice)
-                            and dest.start is not None
-                            and dest.start == dest.stop
-                        )
-                        else dataset[dest].astype(str)
-                        for dest in [
-                            indices.get(image_number, (slice(0, 0), 0))[0]
-                            for image_number in num_idx
-                        ]
+                        None if dest is None else dataset[dest].astype(str)
+                        for dest in dests
                     ]
                 except Exception as e:
                     LOGGER.error(
                         "Unable to decode object measurement. You may find bytes in your output sheet."
                     )
-            return [
-                None
-                if (
-                    (
-                        isinstance(dest, slice)
-                        and dest.start is not None
-                        and dest.start == dest.stop
-                    )
-                )
-                else dataset[dest]
-                for dest in [
-                    indices.get(image_number, (slice(0, 0), 0))[0]
-                    for image_number in num_idx
-                ]
-            ]
+            return [None if dest is None else dataset[dest] for dest in dests]
 
     @staticmethod
     def __all_null(vals):
@@ -568,11 +741,10 @@ class HDF5Dict(object):
         """Cache the contents of an "index" dataset in self.indices
 
         self.indices is a dictionary indexed by object name and feature name
-        whose values are themselves dictionaries, indexed by image number.
-        The per-image values are the slice of the data in the "data" dataset
-        and the index of the entry in the "index" array. This allows efficient
-        retrieval of an image set's data; otherwise a complete scan of the
-        "index" array would be necessary.
+        whose values are FeatureIndex instances. These hold a copy of the
+        "index" array and a lookup array from image number to the row in the
+        "index" array. This allows efficient retrieval of an image set's data;
+        otherwise a complete scan of the "index" array would be necessary.
 
         object_name, feature_name - names of the object and feature to slice
 
@@ -581,12 +753,7 @@ class HDF5Dict(object):
                        and the second and third are start and stop values
                        for the slice.
         """
-        self.indices[object_name, feature_name] = dict(
-            [
-                (image_number, (slice(start, stop), i))
-                for i, (image_number, start, stop) in enumerate(index_slices)
-            ]
-        )
+        self.indices[object_name, feature_name] = FeatureIndex(index_slices)
 
     def __setitem__(self, idxs, vals):
         assert isinstance(
@@ -617,11 +784,31 @@ class HDF5Dict(object):
         if len(num_idx) > 0 and (numpy.isscalar(vals[0]) or vals[0] is None):
             # Convert imageset-style to lists per imageset
             vals = [[] if v is None else [v] if numpy.isscalar(v) else v for v in vals]
+        data_type = idxs[3] if len(idxs) > 3 else None
+        with self.lock:
+            if self.write_buffer is not None:
+                self.__buffer_write(
+                    object_name, feature_name, num_idx, vals, data_type
+                )
+                return
+        self.__write(object_name, feature_name, num_idx, vals, data_type)
+
+    def __write(self, object_name, feature_name, num_idx, vals, data_type=None):
+        """Write values for some image numbers to the HDF5 file
+
+        object_name, feature_name - the measurement being written
+
+        num_idx - a vector of image numbers
+
+        vals - a list with a vector of values per image number
+
+        data_type - the data type of the dataset or None to infer it
+        """
         all_null = True
 
         hdf5_type = None
-        if len(idxs) > 3 and idxs[3] is not None:
-            hdf5_type = idxs[3]
+        if data_type is not None:
+            hdf5_type = data_type
             all_null = False
             hdf5_type_is_int = False
             hdf5_type_is_float = False
@@ -727,20 +914,11 @@ class HDF5Dict(object):
             return
         ds_index = self.top_group[object_name][feature_name][INDEX]
         n_current = ds_index.shape[0]
-        slots = []
-        all_appended = True
         indices = self.get_indices(object_name, feature_name)
-        append_index = n_current
-        for image_number, start, stop in index_slices:
-            if image_number in indices:
-                this_slot = indices[image_number][1]
-                all_appended = False
-            else:
-                this_slot = append_index
-                append_index += 1
-            slots.append(this_slot)
-            indices[image_number] = (slice(start, stop), this_slot)
-        ds_index.resize(append_index, 0)
+        slots = indices.update(index_slices)
+        n_appended = len(numpy.unique(slots[slots >= n_current]))
+        all_appended = n_appended == len(slots)
+        ds_index.resize(n_current + n_appended, 0)
         if all_appended:
             ds_index[n_current:, :] = index_slices
         else:
@@ -762,6 +940,7 @@ class HDF5Dict(object):
             object_name, feature_name, num_idx = idxs
             feature_exists = self.has_feature(object_name, feature_name)
             assert feature_exists
+            self.commit_buffer(object_name, feature_name)
 
             if not self.has_data(*idxs):
                 return
@@ -775,6 +954,8 @@ class HDF5Dict(object):
             # Delete the entire measurement
             object_name, feature_name = idxs
             with self.lock:
+                if self.write_buffer is not None:
+                    self.write_buffer.pop((object_name, feature_name), None)
                 if self.has_feature(object_name, feature_name):
                     group = self.top_group[object_name][feature_name]
                     del group[INDEX]
@@ -784,10 +965,17 @@ class HDF5Dict(object):
                         del self.indices[object_name, feature_name]
 
     def has_data(self, object_name, feature_name, num_idx):
+        if (
+            self.write_buffer is not None
+            and (object_name, feature_name) in self.write_buffer
+            and num_idx in self.write_buffer[object_name, feature_name][0]
+        ):
+            return True
         return num_idx in self.get_indices(object_name, feature_name)
 
     def get_dataset(self, object_name, feature_name):
         with self.lock:
+            self.commit_buffer(object_name, feature_name)
             return self.top_group[object_name][feature_name][DATA]
 
     def has_object(self, object_name):
@@ -801,6 +989,11 @@ class HDF5Dict(object):
     def has_feature(self, object_name, feature_name):
         if (object_name, feature_name) in self.indices:
             return True
+        if (
+            self.write_buffer is not None
+            and (object_name, feature_name) in self.write_buffer
+        ):
+            return True
         return (
             self.has_object(object_name) and feature_name in self.top_group[object_name]
         )
@@ -808,7 +1001,7 @@ class HDF5Dict(object):
     def add_feature(self, object_name, feature_name):
         with self.lock:
             feature_group = self.top_group[object_name].require_group(feature_name)
-            self.indices.setdefault((object_name, feature_name), {})
+            self.indices.setdefault((object_name, feature_name), FeatureIndex())
 
     def get_feature_dtype(self, object_name, feature_name):
         """Return the dtype of a feature as represented in the HDF dataset
@@ -816,10 +1009,13 @@ class HDF5Dict(object):
         object_name - name of object
         feature_name - name of feature
         """
+        self.commit_buffer(object_name, feature_name)
         return self.top_group[object_name][feature_name][DATA].dtype
 
     def clear(self):
         with self.lock:
+            if self.write_buffer is not None:
+                self.write_buffer = {}
             for object_name in self.top_level_names():
                 del self.top_group[object_name]
             self.indices = {}
@@ -829,20 +1025,63 @@ class HDF5Dict(object):
             self.top_group[object_name]["_index"][mask] = -1
             self.level1_indices[object_name].pop(first_idx, None)
 
+    def get_column(self, object_name, feature_name, image_numbers):
+        """Get a feature's values for many image sets as flat arrays
+
+        object_name, feature_name - the feature to read
+
+        image_numbers - a vector of image numbers
+
+        returns a flat array of the values for all image numbers, in the order
+        given, and an array of len(image_numbers) + 1 offsets. The values for
+        image_numbers[i] are values[offsets[i]:offsets[i + 1]]. Strings are
+        returned as a numpy unicode array.
+        """
+        image_numbers = numpy.atleast_1d(numpy.asarray(image_numbers, numpy.int64))
+        with self.lock:
+            self.commit_buffer(object_name, feature_name)
+            indices = self.get_indices(object_name, feature_name)
+            dataset = self.get_dataset(object_name, feature_name)
+            starts, stops, present = indices.lookup(image_numbers)
+            counts = numpy.where(present, stops - starts, 0)
+            offsets = numpy.zeros(len(image_numbers) + 1, numpy.int64)
+            numpy.cumsum(counts, out=offsets[1:])
+            if offsets[-1] == 0:
+                values = numpy.zeros(0, dataset.dtype)
+            else:
+                #
+                # Read the span covering all requested values once and
+                # gather the values from it.
+                #
+                first = numpy.min(starts[counts > 0])
+                last = numpy.max(stops[counts > 0])
+                span = dataset[first:last]
+                gather = (
+                    numpy.repeat(starts - first - offsets[:-1], counts)
+                    + numpy.arange(offsets[-1])
+                )
+                values = span[gather]
+        if values.dtype == object:
+            values = values.astype(str)
+        return values, offsets
+
     def get_indices(self, object_name, feature_name):
+        self.commit_buffer(object_name, feature_name)
         if (object_name, feature_name) not in self.indices:
             if not self.has_feature(object_name, feature_name):
-                return {}
+                return FeatureIndex()
             index_dataset = self.top_group[object_name][feature_name][INDEX][:, :]
             self.__cache_index(object_name, feature_name, index_dataset)
         return self.indices[object_name, feature_name]
 
     def top_level_names(self):
         with self.lock:
+            self.commit_buffer()
             return list(self.top_group.keys())
 
     def second_level_names(self, object_name):
         with self.lock:
+            self.commit_buffer()
             return list(self.top_group[object_name].keys())
 
     def add_all(self, object_name, feature_name, values, idxs=None, data_type=None):
@@ -859,6 +1098,9 @@ class HDF5Dict(object):
                     it inferred.
         """
         with self.lock:
+            if self.write_buffer is not None:
+                # the new values replace any buffered ones
+                self.write_buffer.pop((object_name, feature_name), None)
             self.add_object(object_name)
             if self.has_feature(object_name, feature_name):
                 del self.top_group[object_name][feature_name]
@@ -933,6 +1175,7 @@ class HDF5Dict(object):
               remapping here is not sufficient.
         """
         with self.lock:
+            self.commit_buffer(object_name, feature_name)
             feature_group = self.top_group.require_group(object_name).require_group(
                 feature_name
             )
@@ -1234,6 +1477,37 @@ class HDF5FileList(object):
         name_data = NAME_SEPARATOR.join(name_array)
         path_group[SERIESNAMES][insertion_index] = name_data
 
+    def add_metadata_batch(self, entries):
+        """Add the plane metadata for many files at once
+
+        entries - a sequence of (url, data_array, name_array) tuples as
+                  passed to add_metadata. name_array may be None.
+
+        The file names of each directory are read once per batch rather
+        than once per file, so writing the metadata of a large file list
+        does not rescan the directory for every file.
+        """
+        parent = self.get_filelist_group()
+        storage_map = collections.defaultdict(list)
+        for url, data_array, name_array in entries:
+            stem, filename = os.path.split(url)
+            storage_map[stem].append((filename, data_array, name_array))
+        with self.lock:
+            for stem, stem_entries in storage_map.items():
+                path_group = parent.require_group(stem)
+                path_group_files = path_group[FILES].asstr()[:]
+                metadataset = path_group[METADATA]
+                seriesnameset = path_group[SERIESNAMES]
+                filenames = [filename for filename, _, _ in stem_entries]
+                insertion_indices = numpy.searchsorted(path_group_files, filenames)
+                for insertion_index, (filename, data_array, name_array) in zip(
+                    insertion_indices, stem_entries
+                ):
+                    metadataset[insertion_index] = data_array
+                    if name_array is None:
+                        name_array = [""] * (len(data_array) // 5)
+                    seriesnameset[insertion_index] = NAME_SEPARATOR.join(name_array)
+
     def get_metadata(self, url):
         parent = self.get_filelist_group()
         stem, filename = os.path.split(url)
@@ -312,6 +312,37 @@ def _handle_gcs_url(netloc, ext, urlpath):
         return None
 
 def download_to_temp_file(url):
+    """Download a remote file to a local file
+
+    url - an http, https, s3 or gs URL
+
+    Files whose signature can be found are kept in the download cache, so
+    the returned file is shared and must not be deleted. Returns None if
+    the file can't be downloaded.
+    """
+    from .download_cache import get_download_cache, get_remote_signature
+
+    cache = get_download_cache()
+    if cache is not None:
+        signature = get_remote_signature(url)
+        if signature is not None:
+            return cache.get(
+                url, signature, _download_to_temp_file, get_download_extension(url)
+            )
+    return _download_to_temp_file(url)
+
+
+def get_download_extension(url):
+    """The file extension of a remote file, used to name its local copy"""
+    parsed = urlparse(url)
+    path = parsed.path
+    queries = parse_qs(parsed.query)
+    if 'name' in queries:
+        path = queries['name'][0]
+    return os.path.splitext(path)[-1]
+
+
+def _download_to_temp_file(url):
     global CP_TEMP_DIR
     parsed = urlparse(url)
     scheme = parsed.scheme
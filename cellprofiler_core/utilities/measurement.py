@@ -1,6 +1,6 @@
+import io
 import os
 import re
-import sys
 import tempfile
 
 from .hdf5_dict import get_top_level_group
@@ -33,11 +33,12 @@ def make_temporary_file():
     )
 
 
-def load_measurements(filename, dest_file=None, run_name=None, image_numbers=None):
+def load_measurements(
+    filename, dest_file=None, run_name=None, image_numbers=None, mode="w"
+):
     """Load measurements from an HDF5 file
 
     filename - path to file containing the measurements or file-like object
-               if .mat
 
     dest_file - path to file to be created. This file is used as the backing
                 store for the measurements.
@@ -45,6 +46,9 @@ def load_measurements(filename, dest_file=None, run_name=None, image_numbers=Non
     run_name - name of the run (an HDF file can contain measurements
                from multiple runs). By default, takes the last.
 
+    mode - open mode for the measurements' backing store. Use "memory" to
+           keep the copied measurements in memory instead of a temporary file.
+
     returns a Measurements object
     """
     from ..measurement import Measurements
@@ -72,7 +76,10 @@ def load_measurements(filename, dest_file=None, run_name=None, image_numbers=Non
                     last_key = sorted(top_level.keys())[-1]
                     top_level = top_level[last_key]
             m = Measurements(
-                filename=dest_file, copy=top_level, image_numbers=image_numbers
+                filename=dest_file,
+                copy=top_level,
+                image_numbers=image_numbers,
+                mode=mode,
             )
             return m
         finally:
@@ -83,23 +90,15 @@ def load_measurements(filename, dest_file=None, run_name=None, image_numbers=Non
 
 
 def load_measurements_from_buffer(buf):
-    from ..preferences import get_default_output_directory
-
-    dirtgt = get_default_output_directory()
-    if not (os.path.exists(dirtgt) and os.access(dirtgt, os.W_OK)):
-        dirtgt = None
-    fd, filename = tempfile.mkstemp(prefix="Cpmeasurements", suffix=".hdf5", dir=dirtgt)
-    if sys.platform.startswith("win"):
-        # Change file descriptor mode to binary
-        import msvcrt
-
-        msvcrt.setmode(fd, os.O_BINARY)
-    os.write(fd, buf)
-    os.close(fd)
-    try:
-        return load_measurements(filename)
-    finally:
-        os.unlink(filename)
+    """Load measurements from the contents of an HDF5 file
+
+    buf - the bytes of an HDF5 measurements file, for instance from
+          Measurements.file_contents()
+
+    The buffer is opened in-memory and copied into memory-backed
+    measurements, so nothing is written to disk.
+    """
+    return load_measurements(io.BytesIO(buf), mode="memory")
 
 
 def find_metadata_tokens(pattern):
@@ -0,0 +1,245 @@
+"""plane_metadata_cache.py - a persistent cache of image file plane metadata
+
+Reading the series structure of an image file means opening a reader and
+parsing the file's header, which is slow for large files or files on
+network storage. The results only change when the file changes, so they
+are cached in an SQLite database keyed on the file's URL and the reader
+that parsed it, together with a signature of the file (its size and
+modification time, or the ETag and Last-Modified headers of a web
+resource). Different readers can report different series for the same
+file, so a file read by another reader, or by the same reader with other
+settings, is parsed again.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+
+from ..constants.image import MD_SIZE_C, MD_SIZE_S, MD_SIZE_T, MD_SIZE_X, MD_SIZE_Y, MD_SIZE_Z, MD_SERIES_NAME
+from ..preferences import get_cache_plane_metadata, get_cache_remote_plane_metadata, get_temporary_directory, \
+    config_read_typed
+from .image import is_file_url
+from .pathname import url2pathname
+
+LOGGER = logging.getLogger(__name__)
+
+"""The name of the cache database within the temporary directory"""
+CACHE_FILE_NAME = "cellprofiler_plane_metadata.sqlite"
+
+"""Seconds to wait for the headers of a web resource"""
+HTTP_TIMEOUT = 10
+
+"""Entries not used for this many seconds are removed"""
+MAX_ENTRY_AGE = 90 * 24 * 60 * 60
+
+"""The most entries kept in the cache, the least recently used are removed first"""
+MAX_ENTRIES = 250000
+
+"""Seconds between updates of an entry's last use time when it is read"""
+TOUCH_INTERVAL = 24 * 60 * 60
+
+"""The number of entries stored between removals of old entries"""
+PRUNE_INTERVAL = 1000
+
+LIST_KEYS = (MD_SIZE_C, MD_SIZE_Z, MD_SIZE_T, MD_SIZE_Y, MD_SIZE_X)
+
+
+def get_file_signature(url):
+    """Get a string that changes whenever the file at the url changes
+
+    url - the file's URL
+
+    Returns None if the file can't be checked cheaply, in which case its
+    metadata should not be cached.
+    """
+    if is_file_url(url):
+        try:
+            stat = os.stat(url2pathname(url))
+        except OSError:
+            return None
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+    if url.lower().startswith(("http:", "https:")):
+        try:
+            request = urllib.request.Request(url, method="HEAD")
+            with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT) as response:
+                headers = response.headers
+        except Exception:
+            LOGGER.debug(f"Unable to get the headers of {url}", exc_info=True)
+            return None
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if etag is None and last_modified is None:
+            return None
+        return f"{headers.get('Content-Length')}:{etag}:{last_modified}"
+    return None
+
+
+def get_plane_signature(url):
+    """Get the signature of a file whose plane metadata may be cached
+
+    url - the file's URL
+
+    Returns None if the file's metadata should not be cached. Web resources
+    take a request per file just to get their signature, so they are only
+    cached if the CacheRemotePlaneMetadata preference is on.
+    """
+    if not is_file_url(url) and not get_cache_remote_plane_metadata():
+        return None
+    return get_file_signature(url)
+
+
+def get_reader_signature(reader_class):
+    """Get a string that identifies a reader class and its current settings
+
+    reader_class - the Reader subclass chosen for a file
+    """
+    settings = []
+    for key, _, _, key_type, default in reader_class.get_settings():
+        value = config_read_typed(f"Reader.{reader_class.reader_name}.{key}", key_type)
+        settings.append(f"{key}={default if value is None else value}")
+    return ":".join(
+        [
+            f"{reader_class.__module__}.{reader_class.__name__}",
+            str(reader_class.variable_revision_number),
+        ]
+        + settings
+    )
+
+
+class PlaneMetadataCache:
+    """A persistent map of (url, reader, signature) to a file's plane metadata
+
+    The cache is safe to use from several threads. Each process should
+    open its own cache, see get_plane_metadata_cache.
+    """
+
+    def __init__(self, path, max_entries=MAX_ENTRIES, max_age=MAX_ENTRY_AGE):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.puts_since_prune = 0
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            # Entries of earlier versions were not keyed on the reader
+            self.connection.execute("DROP TABLE IF EXISTS plane_metadata")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS series_metadata "
+                "(url TEXT NOT NULL, reader TEXT NOT NULL, signature TEXT NOT NULL, "
+                "metadata TEXT NOT NULL, used REAL NOT NULL, PRIMARY KEY (url, reader))"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS series_metadata_used ON series_metadata (used)"
+            )
+            self.connection.commit()
+        self.prune()
+
+    def get(self, url, reader, signature):
+        """Get the series metadata for a file
+
+        url - the file's URL
+
+        reader - the signature of the file's reader, see get_reader_signature
+
+        signature - the file's current signature, see get_file_signature
+
+        Returns a dictionary of the MD_SIZE_* keys and MD_SERIES_NAME or None
+        if the file is not in the cache or has changed since it was cached.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT signature, metadata, used FROM series_metadata WHERE url = ? AND reader = ?",
+                (url, reader),
+            ).fetchone()
+            if row is None or row[0] != signature:
+                return None
+            now = time.time()
+            if now - row[2] > TOUCH_INTERVAL:
+                self.connection.execute(
+                    "UPDATE series_metadata SET used = ? WHERE url = ? AND reader = ?",
+                    (now, url, reader),
+                )
+                self.connection.commit()
+        return json.loads(row[1])
+
+    def put(self, url, reader, signature, meta_dict):
+        """Store the series metadata for a file
+
+        url - the file's URL
+
+        reader - the signature of the reader that read the metadata
+
+        signature - the file's signature when the metadata was read
+
+        meta_dict - the metadata returned by the file's reader
+        """
+        metadata = {MD_SIZE_S: int(meta_dict[MD_SIZE_S])}
+        for key in LIST_KEYS:
+            metadata[key] = [int(value) for value in meta_dict[key]]
+        metadata[MD_SERIES_NAME] = [str(name) for name in meta_dict[MD_SERIES_NAME]]
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO series_metadata (url, reader, signature, metadata, used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, reader, signature, json.dumps(metadata), time.time()),
+            )
+            self.connection.commit()
+            self.puts_since_prune += 1
+            if self.puts_since_prune >= PRUNE_INTERVAL:
+                self.prune()
+
+    def prune(self):
+        """Remove entries that are too old or beyond the maximum number of entries"""
+        with self.lock:
+            self.puts_since_prune = 0
+            self.connection.execute(
+                "DELETE FROM series_metadata WHERE used < ?", (time.time() - self.max_age,)
+            )
+            (count,) = self.connection.execute("SELECT COUNT(*) FROM series_metadata").fetchone()
+            if count > self.max_entries:
+                self.connection.execute(
+                    "DELETE FROM series_metadata WHERE rowid IN "
+                    "(SELECT rowid FROM series_metadata ORDER BY used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self.connection.commit()
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        with self.lock:
+            self.connection.execute("DELETE FROM series_metadata")
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+__caches = {}
+__caches_lock = threading.Lock()
+
+
+def get_plane_metadata_cache():
+    """Get this process's plane metadata cache
+
+    Returns None if caching is turned off in the preferences or the cache
+    can't be opened.
+    """
+    if not get_cache_plane_metadata():
+        return None
+    path = os.path.join(get_temporary_directory(), CACHE_FILE_NAME)
+    key = (os.getpid(), path)
+    with __caches_lock:
+        if key not in __caches:
+            try:
+                __caches[key] = PlaneMetadataCache(path)
+            except sqlite3.Error:
+                LOGGER.warning(f"Unable to open the plane metadata cache at {path}", exc_info=True)
+                __caches[key] = None
+        return __caches[key]
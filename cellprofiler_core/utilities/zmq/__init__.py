@@ -11,7 +11,16 @@ import numpy
 import zmq
 
 import cellprofiler_core.utilities.grid
+from cellprofiler_core.preferences import get_narrow_integer_arrays
 from cellprofiler_core.utilities.zmq._boundary import Boundary
+from cellprofiler_core.utilities.zmq._compression import (
+    compress,
+    decompress,
+    get_codec,
+    get_supported_codecs,
+    get_threshold,
+    get_transfer_statistics,
+)
 from cellprofiler_core.utilities.zmq.communicable.reply import LockStatusReply, Reply
 from cellprofiler_core.utilities.zmq.communicable.request import (
     LockStatusRequest,
@@ -25,39 +34,56 @@ NOTIFY_SOCKET_ADDR = "inproc://BoundaryNotifications"
 SD_KEY_DICT = "__keydict__"
 
 
-def make_CP_encoder(buffers):
+def make_CP_encoder(buffers, narrow_integers=False, codec=None, threshold=0):
     """create an encoder for CellProfiler data and numpy arrays (which will be
-    stored in the input argument)"""
+    stored in the input argument)
+
+    narrow_integers - convert 64-bit and unsigned 32-bit integer arrays to
+                      32-bit integers if their values fit. This is only
+                      needed by 32-bit workers and costs a scan of the array.
+
+    codec - compress arrays and buffers with this codec, see get_codec, or
+            None to leave them uncompressed
+
+    threshold - arrays and buffers smaller than this many bytes are never
+                compressed
+    """
+
+    def add_buffer(buf, dct, buffers=buffers):
+        dct["idx"] = len(buffers)
+        if codec is not None and memoryview(buf).nbytes >= threshold:
+            compressed = compress(codec, buf)
+            if compressed is not None:
+                buf = compressed
+                dct["codec"] = codec
+        buffers.append(buf)
+        return dct
 
     def encoder(data, buffers=buffers):
         if isinstance(data, numpy.ndarray):
-            #
-            # Maybe it's nice to save memory by converting 64-bit to 32-bit
-            # but the purpose here is to fix a bug on the Mac where a
-            # 32-bit worker gets a 64-bit array or unsigned 32-bit array,
-            # tries to use it for indexing and fails because the integer
-            # is wider than a 32-bit pointer
-            #
-            info32 = numpy.iinfo(numpy.int32)
-            if (
-                data.dtype.kind == "i"
-                and data.dtype.itemsize > 4
-                or data.dtype.kind == "u"
-                and data.dtype.itemsize >= 4
-            ):
-                if numpy.prod(data.shape) == 0 or (
-                    numpy.min(data) >= info32.min and numpy.max(data) <= info32.max
+            if narrow_integers:
+                #
+                # The purpose here is to fix a bug on the Mac where a
+                # 32-bit worker gets a 64-bit array or unsigned 32-bit array,
+                # tries to use it for indexing and fails because the integer
+                # is wider than a 32-bit pointer
+                #
+                info32 = numpy.iinfo(numpy.int32)
+                if (
+                    data.dtype.kind == "i"
+                    and data.dtype.itemsize > 4
+                    or data.dtype.kind == "u"
+                    and data.dtype.itemsize >= 4
                 ):
-                    data = data.astype(numpy.int32)
-            idx = len(buffers)
-            buffers.append(numpy.ascontiguousarray(data))
-            dtype = str(data.dtype)
-            return {
-                "__ndarray__": True,
-                "dtype": str(data.dtype),
-                "shape": data.shape,
-                "idx": idx,
-            }
+                    if numpy.prod(data.shape) == 0 or (
+                        numpy.min(data) >= info32.min and numpy.max(data) <= info32.max
+                    ):
+                        data = data.astype(numpy.int32)
+            # Only copies the array if it isn't contiguous already
+            return add_buffer(
+                numpy.ascontiguousarray(data),
+                {"__ndarray__": True, "dtype": str(data.dtype), "shape": data.shape},
+            )
         if isinstance(data, numpy.generic):
             # http://docs.scipy.org/doc/numpy/reference/arrays.scalars.html
             return data.astype(object)
@@ -67,25 +93,45 @@ def make_CP_encoder(buffers):
             return d
         if isinstance(data, memoryview):
             # arbitrary data
-            idx = len(buffers)
-            buffers.append(data)
-            return {"__buffer__": True, "idx": idx}
+            return add_buffer(data, {"__buffer__": True})
         raise TypeError("%r of type %r is not JSON serializable" % (data, type(data)))
 
     return encoder
 
 
-def make_CP_decoder(buffers):
+def make_CP_decoder(buffers, copy=False):
+    """create a decoder for the data encoded by make_CP_encoder
+
+    buffers - the buffers holding the arrays' data
+
+    copy - if False, arrays are read-only views on the buffers, which are
+           kept alive by the arrays. Consumers that change an array must
+           copy it first. If True, arrays are writeable copies.
+    """
+
+    def get_buffer(dct):
+        buf = buffers[dct["idx"]]
+        if "codec" in dct:
+            # The decompressed bytes belong to the array alone
+            buf = decompress(dct["codec"], buf)
+        return memoryview(buf)
+
     def decoder(dct, buffers=buffers):
         if "__ndarray__" in dct:
-            buf = memoryview(buffers[dct["idx"]])
+            buf = get_buffer(dct)
             shape = dct["shape"]
             dtype = dct["dtype"]
             if numpy.prod(shape) == 0:
                 return numpy.zeros(shape, dtype)
-            return numpy.frombuffer(buf, dtype=dtype).reshape(shape).copy()
+            array = numpy.frombuffer(buf, dtype=dtype).reshape(shape)
+            if copy:
+                return array.copy()
+            # numpy.frombuffer gives a writeable array if the buffer is
+            # writeable, so make sure the message can't be changed.
+            array.flags.writeable = False
+            return array
         if "__buffer__" in dct:
-            return memoryview(buffers[dct["idx"]])
+            return get_buffer(dct)
         if "__CPGridInfo__" in dct:
             grid = cellprofiler_core.utilities.grid.Grid()
             grid.deserialize(dct)
@@ -162,32 +208,51 @@ def decode_sendable_sequence(l, desired_type):
     return result if isinstance(result, desired_type) else desired_type(result)
 
 
-def json_encode(o):
+def json_encode(o, narrow_integers=None, codec=None, threshold=None):
     """Encode an object as a JSON string
 
     o - object to encode
 
+    narrow_integers - convert wide integer arrays to 32 bits, see
+                      make_CP_encoder. Defaults to the preference.
+
+    codec - the codec for compressing arrays and buffers or None for no
+            compression, see make_CP_encoder. json_encode doesn't compress
+            unless a codec is given.
+
+    threshold - the size in bytes below which arrays and buffers are not
+                compressed. Defaults to the preference.
+
     returns a 2-tuple of json-encoded object + buffers of binary stuff
     """
+    if narrow_integers is None:
+        narrow_integers = get_narrow_integer_arrays()
+    if threshold is None:
+        threshold = get_threshold()
     sendable_dict = make_sendable_dictionary(o)
 
     # replace each buffer with its metadata, and send it separately
     buffers = []
-    encoder = make_CP_encoder(buffers)
+    encoder = make_CP_encoder(
+        buffers, narrow_integers=narrow_integers, codec=codec, threshold=threshold
+    )
     json_str = json.dumps(sendable_dict, default=encoder)
     return json_str, buffers
 
 
-def json_decode(json_str, buffers):
+def json_decode(json_str, buffers, copy=False):
     """Decode a JSON-encoded string
 
     json_str - the JSON string
 
     buffers - buffers of binary data to feed into the decoder of special cases
 
+    copy - True to copy arrays out of the buffers, False to return
+           read-only views on them, see make_CP_decoder
+
     return the decoded dictionary
     """
-    decoder = make_CP_decoder(buffers)
+    decoder = make_CP_decoder(buffers, copy=copy)
     attribute_dict = json.loads(json_str, object_hook=decoder)
     return decode_sendable_dictionary(attribute_dict)
 
@@ -1,5 +1,7 @@
+import hmac
 import logging
 import queue
+import socket
 import threading
 
 import zmq
@@ -14,6 +16,28 @@ from ...constants.worker import NOTIFY_STOP, NOTIFY_RUN
 
 LOGGER = logging.getLogger(__name__)
 
+"""Hosts in a ZMQ address that mean all of the machine's interfaces"""
+WILDCARD_HOSTS = ("*", "0.0.0.0", "[::]")
+
+
+def get_advertised_host(zmq_address, advertised_host=None):
+    """Get the host that workers should use to reach a bound address
+
+    zmq_address - the address the boundary binds to, e.g. tcp://10.0.0.5
+
+    advertised_host - the host name or address to use, if known
+
+    A boundary bound to all interfaces is advertised under this machine's
+    host name.
+    """
+    if advertised_host:
+        return advertised_host
+    host = zmq_address.split("://", 1)[-1]
+    if host in WILDCARD_HOSTS:
+        return socket.gethostname()
+    return host
+
+
 class Boundary:
     """This object serves as the interface between a ZMQ socket passing
     Requests and Replies, and a thread or threads serving those requests.
@@ -26,24 +50,37 @@ class Boundary:
     allows it to receive Python objects via the downward queue.
     """
 
-    def __init__(self, zmq_address, port=None):
+    def __init__(self, zmq_address, port=None, advertised_host=None, token=None):
         """Construction
 
-        zmq_address - the address for announcements and requests
+        zmq_address - the address for announcements and requests, for
+                      instance tcp://127.0.0.1 for workers on this machine
+                      or tcp://* to accept workers from other machines
         port - the port for announcements, defaults to random
+        advertised_host - the host that workers should connect to, see
+                          get_advertised_host
+        token - a secret that must be sent with every request, see
+                Request.send_only. Requests without it get BoundaryExited.
         """
         self.analysis_context = None
+        self.token = token
         self.analysis_context_lock = threading.RLock()
         #
         # Dictionary of request dictionary to queue for handler
         # (not including AnalysisRequest)
         #
         self.request_dictionary = {}
+        #
+        # The compression codecs each worker supports, by routing ID. Workers
+        # send them with their Work and PipelinePreferences requests.
+        #
+        self.peer_codecs = {}
         self.zmq_context = zmq.Context()
         # Set linger to 0 so that all sockets close without
         # waiting for transmission during shutdown.
         self.zmq_context.setsockopt(zmq.LINGER, 0)
         self.zmq_address = zmq_address
+        self.advertised_host = get_advertised_host(zmq_address, advertised_host)
         # The downward queue is used to feed replies to the socket thread
         self.downward_queue = queue.Queue()
 
@@ -61,9 +98,9 @@ class Boundary:
         self.keepalive_socket = self.zmq_context.socket(zmq.PUB)
 
         self.keepalive_socket_port = self.keepalive_socket.bind_to_random_port(
-            "tcp://127.0.0.1"
+            zmq_address
         )
-        self.keepalive_address = f"tcp://127.0.0.1:{self.keepalive_socket_port}"
+        self.keepalive_address = self.get_address(self.keepalive_socket_port)
 
         self.thread = threading.Thread(
             target=self.spin,
@@ -80,6 +117,10 @@ class Boundary:
     """Stop the socket thread"""
     NOTIFY_STOP = "stop"
 
+    def get_address(self, port):
+        """The address of one of the boundary's ports as seen by the workers"""
+        return f"tcp://{self.advertised_host}:{port}"
+
     def register_analysis(self, analysis_id, upward_queue):
         """Register a queue to receive analysis requests
 
@@ -155,7 +196,7 @@ class Boundary:
             request_socket.setsockopt(zmq.LINGER, 0)
             request_port = request_socket.bind_to_random_port(
                 self.zmq_address)
-            self.request_address = self.zmq_address + (":%d" % request_port)
+            self.request_address = self.get_address(request_port)
 
             poller = zmq.Poller()
             poller.register(selfnotify_socket, zmq.POLLIN)
@@ -196,8 +237,20 @@ class Boundary:
                             LOGGER.warning("Captured a stop message over zmq")
                             received_stop = True
                         continue
-                    req = Communicable.recv(s, routed=True)
+                    try:
+                        req = Communicable.recv(s, routed=True)
+                    except Communicable.InvalidMessage:
+                        LOGGER.warning("Discarding an invalid request", exc_info=True)
+                        continue
+                    if not isinstance(req, Request) or not self.check_token(req):
+                        LOGGER.warning(
+                            "Rejected a %s that wasn't a request with the analysis token"
+                            % str(type(req))
+                        )
+                        Communicable.reply(req, BoundaryExited())
+                        continue
                     req.set_boundary(self)
+                    self.set_peer_codecs(req)
                     if not isinstance(req, AnalysisRequest):
                         for request_class in self.request_dictionary:
                             if isinstance(req, request_class):
@@ -286,6 +339,22 @@ class Boundary:
         self.downward_queue.put((msg, arg))
         self.threadlocal.notify_socket.send(b"WAKE UP!")
 
+    def check_token(self, req):
+        """Check that a request was sent with this boundary's token"""
+        if self.token is None:
+            return True
+        return isinstance(req._token, str) and hmac.compare_digest(
+            req._token, self.token
+        )
+
+    def set_peer_codecs(self, req):
+        """Record the codecs the request's sender supports for its replies"""
+        routing = tuple(req._routing)
+        codecs = getattr(req, "codecs", None)
+        if codecs is not None:
+            self.peer_codecs[routing] = codecs
+        req._peer_codecs = self.peer_codecs.get(routing)
+
     def handle_reply(self, req, rep):
         if not isinstance(req, AnalysisRequest):
             assert isinstance(req, Request)
@@ -0,0 +1,181 @@
+"""_compression.py - compression of the data sent to and from workers
+
+The arrays and buffers in a message are compressed one at a time by the
+encoder (see make_CP_encoder) if they are bigger than a threshold, and
+the codec is recorded next to each one in the message's JSON. The
+receiver can therefore decode any message whatever its own settings,
+provided it has the codec installed. zlib is always installed, lz4 is
+optional, so workers and the runner tell each other which codecs they
+support (see get_supported_codecs) and lz4 is only sent to a peer that
+supports it.
+
+The numbers of bytes sent and received are counted per process, see
+get_transfer_statistics.
+"""
+
+import logging
+import threading
+import zlib
+
+from cellprofiler_core.preferences import (
+    PAYLOAD_COMPRESSION_LZ4,
+    PAYLOAD_COMPRESSION_ZLIB,
+    get_compression_threshold_kb,
+    get_payload_compression,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+"""zlib compression level - the fastest, since the aim is to save time"""
+ZLIB_LEVEL = 1
+
+"""Data is sent uncompressed unless compression saves at least this fraction"""
+MIN_SAVING = 0.1
+
+__lz4_warned = False
+
+
+def get_lz4():
+    """Return the lz4.frame module or None if lz4 is not installed"""
+    try:
+        import lz4.frame
+
+        return lz4.frame
+    except ImportError:
+        return None
+
+
+def get_supported_codecs():
+    """The codecs that this process can decode"""
+    if get_lz4() is None:
+        return [PAYLOAD_COMPRESSION_ZLIB]
+    return [PAYLOAD_COMPRESSION_ZLIB, PAYLOAD_COMPRESSION_LZ4]
+
+
+def get_codec(supported=None):
+    """Get the codec to use for sending, from the preferences
+
+    supported - the codecs that the receiver supports, see
+                get_supported_codecs, or None if they are not known.
+                lz4 is only used if the receiver is known to support it,
+                zlib is used instead otherwise.
+
+    Returns PAYLOAD_COMPRESSION_ZLIB, PAYLOAD_COMPRESSION_LZ4 or None
+    """
+    global __lz4_warned
+    codec = get_payload_compression()
+    if codec == PAYLOAD_COMPRESSION_LZ4:
+        if get_lz4() is None:
+            if not __lz4_warned:
+                LOGGER.warning("lz4 is not installed, compressing with zlib instead")
+                __lz4_warned = True
+            codec = PAYLOAD_COMPRESSION_ZLIB
+        elif supported is None or PAYLOAD_COMPRESSION_LZ4 not in supported:
+            codec = PAYLOAD_COMPRESSION_ZLIB
+    if codec not in (PAYLOAD_COMPRESSION_ZLIB, PAYLOAD_COMPRESSION_LZ4):
+        return None
+    if supported is not None and codec not in supported:
+        return None
+    return codec
+
+
+def get_threshold():
+    """The size in bytes below which data is sent uncompressed"""
+    return get_compression_threshold_kb() * 1024
+
+
+def compress(codec, buf):
+    """Compress a buffer
+
+    codec - PAYLOAD_COMPRESSION_ZLIB or PAYLOAD_COMPRESSION_LZ4
+
+    buf - a contiguous array or other object supporting the buffer protocol
+
+    Returns the compressed bytes or None if compressing doesn't save enough
+    to be worth it.
+    """
+    data = memoryview(buf).cast("B")
+    if codec == PAYLOAD_COMPRESSION_ZLIB:
+        compressed = zlib.compress(data, ZLIB_LEVEL)
+    elif codec == PAYLOAD_COMPRESSION_LZ4:
+        compressed = get_lz4().compress(data)
+    else:
+        raise ValueError(f"Unknown compression codec: {codec}")
+    if len(compressed) > len(data) * (1 - MIN_SAVING):
+        return None
+    get_transfer_statistics().record_compression(len(data), len(compressed))
+    return compressed
+
+
+def decompress(codec, buf):
+    """Decompress a buffer compressed by compress()"""
+    if codec == PAYLOAD_COMPRESSION_ZLIB:
+        return zlib.decompress(buf)
+    if codec == PAYLOAD_COMPRESSION_LZ4:
+        lz4 = get_lz4()
+        if lz4 is None:
+            raise RuntimeError(
+                "Received data compressed with lz4, but lz4 is not installed"
+            )
+        return lz4.decompress(buf)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+class TransferStatistics:
+    """Counts of the messages and bytes sent and received by this process
+
+    bytes_sent and bytes_received are the sizes of the messages as sent,
+    after compression. bytes_before_compression and bytes_after_compression
+    are the sizes of the buffers that were compressed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.messages_received = 0
+        self.bytes_received = 0
+        self.bytes_before_compression = 0
+        self.bytes_after_compression = 0
+
+    def record_sent(self, nbytes):
+        with self.lock:
+            self.messages_sent += 1
+            self.bytes_sent += nbytes
+
+    def record_received(self, nbytes):
+        with self.lock:
+            self.messages_received += 1
+            self.bytes_received += nbytes
+
+    def record_compression(self, before, after):
+        with self.lock:
+            self.bytes_before_compression += before
+            self.bytes_after_compression += after
+
+    def __str__(self):
+        return (
+            f"sent {self.messages_sent} messages ({self.bytes_sent} bytes), "
+            f"received {self.messages_received} messages "
+            f"({self.bytes_received} bytes), compressed "
+            f"{self.bytes_before_compression} bytes to "
+            f"{self.bytes_after_compression}"
+        )
+
+
+__transfer_statistics = TransferStatistics()
+
+
+def get_transfer_statistics():
+    """Get the counts of the bytes sent and received by this process"""
+    return __transfer_statistics
+
+
+def get_frame_size(frame):
+    """The number of bytes in a message frame"""
+    if isinstance(frame, (bytes, bytearray)):
+        return len(frame)
+    return memoryview(frame).nbytes
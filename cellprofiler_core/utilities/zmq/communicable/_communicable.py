@@ -1,6 +1,11 @@
 import sys
 
 import cellprofiler_core.utilities.zmq
+from cellprofiler_core.utilities.zmq._compression import (
+    get_codec,
+    get_frame_size,
+    get_transfer_statistics,
+)
 
 
 class Communicable:
@@ -8,14 +13,50 @@ class Communicable:
 
     All subclasses must accept keyword arguments to __init__() corresponding to
     their attributes.
+
+    Arrays in a received Communicable are read-only views on the message,
+    see make_CP_decoder. Subclasses whose arrays are handed to code that
+    may change them in place set copy_arrays to receive writeable copies.
+
+    Only subclasses defined in the packages in COMMUNICABLE_PACKAGES can be
+    received, since the class to instantiate is named by the sender.
     """
 
-    def send(self, socket, routing=None):
+    copy_arrays = False
+
+    """Packages whose Communicable classes may be instantiated by recv"""
+    COMMUNICABLE_PACKAGES = (
+        "cellprofiler_core.analysis.reply",
+        "cellprofiler_core.analysis.request",
+        "cellprofiler_core.utilities.zmq.communicable",
+    )
+
+    """The attribute that carries the sender's token, see send"""
+    TOKEN_ATTRIBUTE = "token"
+
+    def send(self, socket, routing=None, codecs=None, token=None):
+        """Send this object on a socket
+
+        socket - the socket to send on
+
+        routing - the routing frames of the receiver on a ROUTER socket
+
+        codecs - the compression codecs the receiver supports, see get_codec
+
+        token - a secret that the receiver uses to check who sent the
+                object. It is available as _token on the received object.
+        """
         if routing is None:
             routing = []
         if hasattr(self, "_remote"):
             assert not self._remote, "send() called on a non-local Communicable object."
-        json_str, buffers = cellprofiler_core.utilities.zmq.json_encode(self.__dict__)
+        attributes = self.__dict__
+        if token is not None:
+            attributes = dict(attributes)
+            attributes[self.TOKEN_ATTRIBUTE] = token
+        json_str, buffers = cellprofiler_core.utilities.zmq.json_encode(
+            attributes, codec=get_codec(codecs)
+        )
         json_str = json_str.encode("utf-8")
         message_parts = (
             routing
@@ -28,38 +69,92 @@ class Communicable:
         socket.send_multipart(
             message_parts + buffers, copy=False,
         )
+        get_transfer_statistics().record_sent(
+            sum([get_frame_size(part) for part in message_parts + buffers])
+        )
 
     class MultipleReply(RuntimeError):
         pass
 
+    class InvalidMessage(RuntimeError):
+        """Raised by recv for a message that isn't a known Communicable"""
+
+        pass
+
+    @classmethod
+    def get_communicable_class(cls, module, classname):
+        """Get the class named in a message
+
+        module - the name of the class's module
+
+        classname - the name of the class
+
+        Raises InvalidMessage unless the class is a Communicable defined in
+        one of the COMMUNICABLE_PACKAGES.
+        """
+        if not any(
+            module == package or module.startswith(package + ".")
+            for package in cls.COMMUNICABLE_PACKAGES
+        ):
+            raise cls.InvalidMessage(
+                "Refusing to instantiate %s from module %s" % (classname, module)
+            )
+        communicable_class = getattr(sys.modules.get(module), classname, None)
+        if not (
+            isinstance(communicable_class, type)
+            and issubclass(communicable_class, Communicable)
+        ):
+            raise cls.InvalidMessage(
+                "%s in module %s is not a Communicable" % (classname, module)
+            )
+        return communicable_class
+
     @classmethod
     def recv(cls, socket, routed=False):
-        message = socket.recv_multipart()
+        # Receive without copying so that arrays in the message can be
+        # views on the frames, see make_CP_decoder
+        frames = socket.recv_multipart(copy=False)
+        get_transfer_statistics().record_received(
+            sum([get_frame_size(frame) for frame in frames])
+        )
+        lengths = [len(frame) for frame in frames]
         if routed:
-            split = message.index(b"") + 1
-            routing = message[:split]
-            message = message[split:]
+            if 0 not in lengths:
+                raise cls.InvalidMessage("Received a message without routing")
+            split = lengths.index(0) + 1
+            routing = [frame.bytes for frame in frames[:split]]
+            frames = frames[split:]
         else:
             routing = []
-        module, classname = message[:2]
-        module = module.decode("unicode_escape")
-        classname = classname.decode("unicode_escape")
-        buffers = message[3:]
-        attribute_dict = cellprofiler_core.utilities.zmq.json_decode(
-            message[2], buffers
-        )
+        if len(frames) < 3:
+            raise cls.InvalidMessage("Received a message with too few parts")
+        module, classname, json_str = [frame.bytes for frame in frames[:3]]
         try:
-            instance = sys.modules[module].__dict__[classname](**attribute_dict)
-        except:
-            print(
-                "Communicable could not instantiate %s from module %s with kwargs %s"
-                % (module, classname, attribute_dict)
+            module = module.decode("unicode_escape")
+            classname = classname.decode("unicode_escape")
+        except UnicodeDecodeError as e:
+            raise cls.InvalidMessage("Received a message with a bad class name") from e
+        buffers = [frame.buffer for frame in frames[3:]]
+        communicable_class = cls.get_communicable_class(module, classname)
+        attribute_dict = None
+        try:
+            attribute_dict = cellprofiler_core.utilities.zmq.json_decode(
+                json_str, buffers, copy=communicable_class.copy_arrays
             )
-            raise
+            token = attribute_dict.pop(cls.TOKEN_ATTRIBUTE, None)
+            instance = communicable_class(**attribute_dict)
+        except Exception as e:
+            raise cls.InvalidMessage(
+                "Communicable could not instantiate %s from module %s with kwargs %s"
+                % (classname, module, attribute_dict)
+            ) from e
         instance._remote = True
+        instance._token = token
         instance._routing = routing
         instance._socket = socket
         instance._replied = False
+        # The codecs that the sender can decode, if known. See Boundary.
+        instance._peer_codecs = None
         return instance
 
     def routing(self):
@@ -69,7 +164,9 @@ class Communicable:
         assert self._remote, "Replying to a local Communicable!"
         if self._replied:
             raise self.MultipleReply("Can't reply to a Communicable more than once!")
-        Communicable.send(reply_obj, self._socket, self._routing)
+        Communicable.send(
+            reply_obj, self._socket, self._routing, codecs=self._peer_codecs
+        )
         self._replied = True
         if please_reply:
             raise NotImplementedError(
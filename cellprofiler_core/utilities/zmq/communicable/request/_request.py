@@ -22,20 +22,25 @@ class Request(Communicable):
         self.__dict__.update(kwargs)
         self._boundary = None
 
-    def send(self, socket):
-        Communicable.send(self, socket)
+    def send(self, socket, codecs=None, token=None):
+        Communicable.send(self, socket, codecs=codecs, token=token)
         return Communicable.recv(socket)
 
-    def send_only(self, socket):
+    def send_only(self, socket, codecs=None, token=None):
         """Send the request but don't perform the .recv
 
         socket - send on this socket
 
+        codecs - the compression codecs the receiver supports, see get_codec
+
+        token - the secret that the receiver expects with each request,
+                see Boundary
+
         First part of a two-part client-side request: send the request
         with an expected .recv, possibly after polling to make the .recv
         non-blocking.
         """
-        Communicable.send(self, socket)
+        Communicable.send(self, socket, codecs=codecs, token=token)
 
     def set_boundary(self, boundary):
         """Set the boundary object to use when sending the reply
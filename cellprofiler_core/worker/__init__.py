@@ -44,6 +44,7 @@ knime_bridge_address = None
 notify_address = None
 analysis_id = None
 work_server_address = None
+token = None
 
 
 def aw_parse_args():
@@ -59,6 +60,7 @@ def aw_parse_args():
     global work_server_address
     global notify_address
     global knime_bridge_address
+    global token
     set_headless()
     set_awt_headless(True)
     parser = optparse.OptionParser()
@@ -80,6 +82,12 @@ def aw_parse_args():
         help="ZMQ port where continue/shutdown notifications are published",
         default=None,
     )
+    parser.add_option(
+        "--token",
+        dest="token",
+        help="The secret that the analysis expects with each request",
+        default=None,
+    )
     parser.add_option(
         "--log-level",
         dest="log_level",
@@ -131,14 +139,16 @@ def aw_parse_args():
         stream_handler.setFormatter(fmt)
         logging.root.addHandler(stream_handler)
 
-    if not options.work_server_address and options.work_server_address and \
-            options.analysis_id:
+    if not (
+        options.work_server_address and options.notify_address and options.analysis_id
+    ):
         parser.print_help()
         sys.exit(1)
     analysis_id = options.analysis_id
     notify_address = options.notify_address
     work_server_address = options.work_server_address
     knime_bridge_address = options.knime_bridge_address
+    token = options.token
 
     #
     # Set up the headless plugins directories before doing
@@ -242,19 +252,26 @@ def main():
         deadman_start_socket.recv()
         deadman_start_socket.close()
 
-        from cellprofiler.knime_bridge import KnimeBridgeServer
-
-        with Worker(the_zmq_context, analysis_id, work_server_address, notify_address) as worker:
+        with Worker(
+            the_zmq_context, analysis_id, work_server_address, notify_address, token=token
+        ) as worker:
             worker_thread = threading.Thread(
                 target=worker.run,
                 name="WorkerThread",
                 daemon=True,
             )
             worker_thread.start()
-            with KnimeBridgeServer(
-                the_zmq_context, knime_bridge_address, NOTIFY_ADDR, NOTIFY_STOP
-            ):
+            if knime_bridge_address is None:
+                # Workers that join from other machines may not have
+                # CellProfiler itself installed.
                 worker_thread.join()
+            else:
+                from cellprofiler.knime_bridge import KnimeBridgeServer
+
+                with KnimeBridgeServer(
+                    the_zmq_context, knime_bridge_address, NOTIFY_ADDR, NOTIFY_STOP
+                ):
+                    worker_thread.join()
             the_zmq_context.destroy(linger=0)
         LOGGER.debug("Worker thread joined")
         #
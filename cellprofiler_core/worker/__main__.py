@@ -0,0 +1,22 @@
+"""__main__.py - run a worker that joins a running analysis
+
+A worker started this way can run on another machine than the analysis:
+
+    python -m cellprofiler_core.worker --analysis-id ID \
+        --work-server tcp://HOST:PORT --notify-server tcp://HOST:PORT \
+        --token TOKEN
+
+The analysis logs these arguments when it starts. The token is a secret
+made for each analysis: the analysis ignores requests without it. It must listen on an
+interface that the worker's machine can reach, see get_worker_interface.
+The worker stops when the analysis finishes or is cancelled, or if it
+stops hearing from the analysis.
+"""
+
+import sys
+
+from cellprofiler_core.worker import aw_parse_args, main
+
+aw_parse_args()
+main()
+sys.exit(0)
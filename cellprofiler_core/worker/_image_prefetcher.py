@@ -0,0 +1,121 @@
+import concurrent.futures
+import functools
+import logging
+import threading
+
+from ..image import get_plane_cache
+from ..preferences import get_prefetch_memory_mb
+from ..workspace import Workspace
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ImagePrefetcher:
+    """Read the images of the next image set while the current one runs
+
+    The input modules describe the images of an image set through
+    Module.get_prefetch_providers. Their planes are read on a background
+    thread into the plane cache. The providers of the image set take the
+    planes from the cache when the image set is run, so that reading
+    the next image set's files overlaps with processing the current one.
+
+    The plane cache bounds the memory used by planes read ahead of time.
+    A plane is only read if its estimated size fits in the budget. Planes
+    that are not used by the time the image set after next is scheduled
+    are dropped, including those whose read is still in progress, which
+    are dropped as soon as the read finishes.
+    """
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ImagePrefetcher"
+        )
+        self.futures = []
+        self.keys = []
+        self.previous_keys = []
+        self.lock = threading.Lock()
+        # The keys of the planes being read
+        self.in_flight = set()
+        # The keys of planes being read that should be dropped once read
+        self.stale = set()
+
+    def prefetch(self, measurements, image_set_number):
+        """Start reading the images of an image set
+
+        measurements - the measurements holding the image set's file
+                       locations. They are read on the calling thread.
+
+        image_set_number - the image set to read
+        """
+        cache = get_plane_cache()
+        with self.lock:
+            for key in self.previous_keys:
+                cache.discard(key)
+                if key in self.in_flight:
+                    self.stale.add(key)
+        self.previous_keys, self.keys = self.keys, []
+        self.futures = [future for future in self.futures if not future.done()]
+        if get_prefetch_memory_mb() <= 0:
+            return
+        workspace = Workspace(self.pipeline, None, None, None, measurements, None)
+        providers = []
+        for module in self.pipeline.modules():
+            if not module.enabled:
+                continue
+            try:
+                providers += module.get_prefetch_providers(workspace, image_set_number)
+            except Exception:
+                LOGGER.debug(
+                    f"Unable to read ahead the images of image set {image_set_number}",
+                    exc_info=True,
+                )
+        for provider in providers:
+            key = provider.get_plane_key()
+            if key is None or not cache.reserve(key):
+                continue
+            self.keys.append(key)
+            with self.lock:
+                self.in_flight.add(key)
+            future = self.executor.submit(self.read, provider, key)
+            future.add_done_callback(functools.partial(self.read_done, key))
+            self.futures.append(future)
+
+    def read_done(self, key, future):
+        """Drop a plane that became stale while it was being read"""
+        with self.lock:
+            self.in_flight.discard(key)
+            if key in self.stale:
+                self.stale.discard(key)
+                get_plane_cache().discard(key)
+
+    @staticmethod
+    def read(provider, key):
+        cache = get_plane_cache()
+        nbytes = provider.get_plane_nbytes() or 0
+        if cache.nbytes + nbytes > cache.max_bytes or cache.nbytes >= cache.max_bytes:
+            LOGGER.debug(f"No room to read ahead {key}")
+            cache.cancel(key)
+            return
+        try:
+            plane = provider.read_plane()
+        except Exception:
+            LOGGER.debug(f"Failed to read ahead {key}", exc_info=True)
+            cache.cancel(key)
+            return
+        finally:
+            provider.release_memory()
+        cache.put(key, plane)
+
+    def close(self):
+        """Wait for outstanding reads and drop the planes read ahead"""
+        concurrent.futures.wait(self.futures)
+        self.executor.shutdown()
+        cache = get_plane_cache()
+        for key in self.previous_keys + self.keys:
+            cache.discard(key)
+        self.futures = []
+        self.keys = []
+        self.previous_keys = []
+        self.in_flight.clear()
+        self.stale.clear()
@@ -1,3 +1,4 @@
+import copy
 import io
 import logging
 import sys
@@ -6,10 +7,12 @@ import traceback
 
 import zmq
 
+from ._image_prefetcher import ImagePrefetcher
 from ._pipeline_event_listener import PipelineEventListener
 from ..analysis.reply import ImageSetSuccess, ServerExited
 from ..analysis.reply import ImageSetSuccessWithDictionary
 from ..analysis.reply import NoWork
+from ..analysis.reply import SharedDictionaryUnchanged
 from ..analysis.request import AnalysisCancel, Display, DisplayPostGroup, OmeroLogin
 from ..analysis.request import DebugComplete
 from ..analysis.request import DebugWaiting
@@ -26,8 +29,10 @@ from ..constants.worker import all_measurements
 from ..measurement import Measurements
 from ..utilities.measurement import load_measurements_from_buffer
 from ..pipeline import CancelledException
+from ..reader import get_frame_cache, get_reader_pool
 from ..preferences import get_awt_headless
 from ..preferences import set_preferences_from_dict
+from ..utilities.zmq import get_supported_codecs
 from ..utilities.zmq.communicable.reply.upstream_exit import UpstreamExit
 from ..workspace import Workspace
 
@@ -39,7 +44,7 @@ class Worker:
 
     """
 
-    def __init__(self, context, analysis_id, work_request_address, keepalive_address, with_stop_run_loop=True):
+    def __init__(self, context, analysis_id, work_request_address, keepalive_address, with_stop_run_loop=True, token=None):
 
         self.context = context
         self.work_request_address = work_request_address
@@ -47,9 +52,15 @@ class Worker:
         self.cancelled = False
         self.with_stop_run_loop = with_stop_run_loop
         self.current_analysis_id = analysis_id
+        # The secret that the analysis expects with each request
+        self.token = token
         self.pipeline = None
         self.preferences = None
         self.initial_measurements = None
+        self.shared_dicts = None
+        self.shared_dicts_version = None
+        # The compression codecs the runner supports, once it has told us
+        self.upstream_codecs = None
 
         #TODO: disabled until CellProfiler/CellProfiler#4684 is resolved
         # from ..bioformats.formatreader import set_omero_login_hook
@@ -101,6 +112,7 @@ class Worker:
         from cellprofiler_core.constants.reader import ALL_READERS
         for reader in ALL_READERS.values():
             reader.clear_cached_readers()
+        get_reader_pool().close_all()
 
     def run(self):
         from cellprofiler_core.pipeline.event import CancelledException
@@ -110,7 +122,9 @@ class Worker:
                 try:
                     LOGGER.debug("Requesting a job")
                     # fetch a job
-                    the_request = Work(self.current_analysis_id)
+                    the_request = Work(
+                        self.current_analysis_id, codecs=get_supported_codecs()
+                    )
                     job = self.send(the_request)
 
                     if isinstance(job, NoWork):
@@ -129,6 +143,7 @@ class Worker:
         import cellprofiler_core.pipeline as cpp
 
         job_measurements = []
+        prefetcher = None
         try:
             send_dictionary = job.wants_dictionary
 
@@ -138,8 +153,13 @@ class Worker:
             current_preferences = self.preferences
             if not current_pipeline:
                 LOGGER.debug("Fetching pipeline and preferences")
-                rep = self.send(PipelinePreferences(self.current_analysis_id))
+                rep = self.send(
+                    PipelinePreferences(
+                        self.current_analysis_id, codecs=get_supported_codecs()
+                    )
+                )
                 LOGGER.debug("Received pipeline and preferences response")
+                self.upstream_codecs = getattr(rep, "codecs", None)
                 preferences_dict = rep.preferences
                 # update preferences to match remote values
                 set_preferences_from_dict(preferences_dict)
@@ -187,12 +207,22 @@ class Worker:
 
             if not worker_runs_post_group:
                 # Get the shared state from the first imageset in this run.
-                shared_dicts = self.send(
-                    SharedDictionary(self.current_analysis_id)
-                ).dictionaries
+                # It only changes once, so it's sent again only if the
+                # version we hold is out of date.
+                rep = self.send(
+                    SharedDictionary(
+                        self.current_analysis_id, version=self.shared_dicts_version
+                    )
+                )
+                if not isinstance(rep, SharedDictionaryUnchanged):
+                    self.shared_dicts = rep.dictionaries
+                    self.shared_dicts_version = rep.version
+                shared_dicts = self.shared_dicts
                 assert len(shared_dicts) == len(current_pipeline.modules())
                 for module, new_dict in zip(current_pipeline.modules(), shared_dicts):
-                    module.set_dictionary_for_worker(new_dict)
+                    # The job may change the module's dictionary, so it gets
+                    # a copy of the cached one.
+                    module.set_dictionary_for_worker(copy.deepcopy(new_dict))
 
             # Run prepare group if this is the first image in the group.  We do
             # this here (even if there's no grouping in the pipeline) to ensure
@@ -215,7 +245,13 @@ class Worker:
             # process the images
             if should_process:
                 abort = False
-                for image_set_number in image_set_numbers:
+                prefetcher = ImagePrefetcher(current_pipeline)
+                for i, image_set_number in enumerate(image_set_numbers):
+                    if i + 1 < len(image_set_numbers):
+                        # Read the next image set's images while this one runs
+                        prefetcher.prefetch(
+                            current_measurements, image_set_numbers[i + 1]
+                        )
                     try:
                         self.pipeline_listener.image_set_number = image_set_number
                         last_workspace = current_pipeline.run_image_set(
@@ -293,11 +329,13 @@ class Worker:
                     )
                     del last_workspace
 
-            # send measurements back to server
+            # send the measurements written by this job back to server
+            delta = current_measurements.get_delta(image_set_numbers)
             req = MeasurementsReport(
                 self.current_analysis_id,
-                buf=current_measurements.file_contents(),
+                buf=None,
                 image_set_numbers=image_set_numbers,
+                delta=delta.get_state(),
             )
             rep = self.send(req)
 
@@ -310,6 +348,9 @@ class Worker:
             if self.handle_exception() == ED_STOP:
                 raise CancelledException("Cancelling after user-requested stop")
         finally:
+            if prefetcher is not None:
+                prefetcher.close()
+            get_frame_cache().clear()
             # Clean up any measurements owned by us
             for m in job_measurements:
                 m.close()
@@ -330,7 +371,9 @@ class Worker:
             **arg_kwarg_dict,
         )
         rep = self.send(req)
-        return rep.result
+        # Arrays in the reply are read-only views on the message, and the
+        # module may change the result.
+        return copy.deepcopy(rep.result)
 
     def cancel_handler(self):
         """Handle a cancel request by sending AnalysisCancelRequest
@@ -384,7 +427,7 @@ class Worker:
         poller = zmq.Poller()
         poller.register(self.keepalive_socket, zmq.POLLIN)
         poller.register(work_socket, zmq.POLLIN)
-        req.send_only(work_socket)
+        req.send_only(work_socket, codecs=self.upstream_codecs, token=self.token)
         response = None
         while response is None:
             for socket, state in poller.poll():
@@ -428,6 +471,8 @@ class Worker:
         self.initial_measurements = None
         self.pipeline = None
         self.preferences = None
+        self.shared_dicts = None
+        self.shared_dicts_version = None
         self.current_analysis_id = None
         raise CancelledException(msg)
 
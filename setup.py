@@ -17,6 +17,7 @@ setuptools.setup(
             "sphinx==3.1.2",
             "twine==3.1.1",
         ],
+        "compression": ["lz4>=3.1"],
         "test": ["pytest~=7.4.1", "pytest-timeout~=2.1.0"],
         "wx": ["wxPython==4.2.0"],
     },
@@ -24,6 +25,7 @@ setuptools.setup(
         "boto3>=1.12.28",
         "centrosome~=1.2.2",
         "docutils==0.15.2",
+        "fasteners>=0.15",
         "future>=0.18.2",
         "fsspec>=2021.11.0",
         "h5py~=3.6.0",
@@ -35,6 +37,7 @@ setuptools.setup(
         "scikit-image~=0.20.0",
         "scipy>=1.9.1,<1.11",
         "scyjava>=1.9.1",
+        "tifffile>=2022.8.12",
         "zarr~=2.16.1",
         "google-cloud-storage~=2.10.0",
     ],
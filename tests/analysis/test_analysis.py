@@ -58,6 +58,7 @@ class TestAnalysis(unittest.TestCase):
             self.start_signal = threading.Semaphore(0)
             self.keep_going = True
             self.analysis_id = None
+            self.token = None
             self.notify_addr = "inproc://%s" % uuid.uuid4().hex
             self.notify_socket = self.zmq_context.socket(zmq.PUB)
             self.notify_socket.bind(self.notify_addr)
@@ -142,7 +143,7 @@ class TestAnalysis(unittest.TestCase):
         def do_send(self, req):
             LOGGER.info("    Sending %s" % str(type(req)))
             cellprofiler_core.utilities.zmq.communicable.Communicable.send(
-                req, self.work_socket
+                req, self.work_socket, token=self.token
             )
             self.poller.register(self.work_socket, zmq.POLLIN)
             try:
@@ -197,8 +198,9 @@ class TestAnalysis(unittest.TestCase):
                 self.keepalive_socket.close()
                 self.keepalive_socket = None
 
-        def connect(self, request_address, analysis_id):
+        def connect(self, request_address, analysis_id, token=None):
             self.analysis_id = analysis_id
+            self.token = token
             self.queue.put((self.do_connect, request_address))
             self.notify_socket.send(b"Do connect")
             return self.recv()
@@ -383,7 +385,7 @@ class TestAnalysis(unittest.TestCase):
     def test_03_01_get_work(self):
         pipeline, m = self.make_pipeline_and_measurements_and_start()
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.send(anarequest.Work(worker.analysis_id))()
             self.assertIsInstance(response, anareply.Work)
             self.assertSequenceEqual(response.image_set_numbers, (1,))
@@ -400,7 +402,7 @@ class TestAnalysis(unittest.TestCase):
         pipeline, m = self.make_pipeline_and_measurements_and_start()
 
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.send(anarequest.Work(worker.analysis_id))()
             self.assertIsInstance(response, anareply.Work)
             response = worker.send(anarequest.Work(worker.analysis_id))()
@@ -416,7 +418,7 @@ class TestAnalysis(unittest.TestCase):
         pipeline, m = self.make_pipeline_and_measurements_and_start()
 
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             self.cancel_analysis()
             assert self.analysis is None
             # The boundary thread used to spin eternally and reply with
@@ -482,7 +484,7 @@ class TestAnalysis(unittest.TestCase):
         )
         pipeline, m = self.make_pipeline_and_measurements_and_start()
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.send(anarequest.InitialMeasurements(worker.analysis_id))()
             client_measurements = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
                 response.buf
@@ -529,7 +531,7 @@ class TestAnalysis(unittest.TestCase):
         )
         pipeline, m = self.make_pipeline_and_measurements_and_start()
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             fn_interaction_reply = worker.send(
                 anarequest.Interaction(worker.analysis_id, foo="bar")
             )
@@ -550,7 +552,7 @@ class TestAnalysis(unittest.TestCase):
         )
         pipeline, m = self.make_pipeline_and_measurements_and_start()
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             fn_interaction_reply = worker.send(
                 anarequest.Display(worker.analysis_id, foo="bar")
             )
@@ -574,7 +576,7 @@ class TestAnalysis(unittest.TestCase):
         )
         pipeline, m = self.make_pipeline_and_measurements_and_start()
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             fn_interaction_reply = worker.send(
                 anarequest.DisplayPostGroup(worker.analysis_id, 1, dict(foo="bar"), 3)
             )
@@ -599,7 +601,7 @@ class TestAnalysis(unittest.TestCase):
         )
         pipeline, m = self.make_pipeline_and_measurements_and_start()
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             fake_traceback = ''.join(traceback.format_list(traceback.extract_stack()))
             fn_interaction_reply = worker.send(
                 anarequest.ExceptionReport(
@@ -665,7 +667,7 @@ class TestAnalysis(unittest.TestCase):
         r = numpy.random.RandomState()
         r.seed(51)
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.request_work()
             dictionaries = [
                 dict([(uuid.uuid4().hex, r.uniform(size=(10, 15))) for _ in range(10)])
@@ -687,6 +689,19 @@ class TestAnalysis(unittest.TestCase):
                 self.assertCountEqual(list(ed.keys()), list(d.keys()))
                 for k in list(ed.keys()):
                     numpy.testing.assert_almost_equal(ed[k], d[k])
+            #
+            # A worker holding the current version doesn't get them again
+            #
+            response = worker.send(
+                anarequest.SharedDictionary(
+                    worker.analysis_id, version=response.version
+                )
+            )()
+            self.assertIsInstance(response, anareply.SharedDictionaryUnchanged)
+            response = worker.send(
+                anarequest.SharedDictionary(worker.analysis_id, version=-1)
+            )()
+            self.assertIsInstance(response, anareply.SharedDictionary)
         LOGGER.debug(
             "Exiting %s" % inspect.getframeinfo(inspect.currentframe()).function
         )
@@ -701,7 +716,7 @@ class TestAnalysis(unittest.TestCase):
         r = numpy.random.RandomState()
         r.seed(52)
         with self.FakeWorker() as worker:
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.request_work()
             self.assertTrue(response.worker_runs_post_group)
             self.assertFalse(response.wants_dictionary)
@@ -736,7 +751,7 @@ class TestAnalysis(unittest.TestCase):
             # the initial measurements.
             #
             #####################################################
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.request_work()
             response = worker.send(anarequest.InitialMeasurements(worker.analysis_id))()
             client_measurements = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
@@ -812,7 +827,7 @@ class TestAnalysis(unittest.TestCase):
             # the initial measurements.
             #
             #####################################################
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.request_work()
             response = worker.send(anarequest.InitialMeasurements(worker.analysis_id))()
             client_measurements = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
@@ -920,7 +935,7 @@ class TestAnalysis(unittest.TestCase):
             # the initial measurements.
             #
             #####################################################
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.request_work()
             response = worker.send(anarequest.InitialMeasurements(worker.analysis_id))()
             client_measurements = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
@@ -1016,7 +1031,7 @@ class TestAnalysis(unittest.TestCase):
             # the initial measurements.
             #
             #####################################################
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.request_work()
             response = worker.send(anarequest.InitialMeasurements(worker.analysis_id))()
             client_measurements = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
@@ -1142,7 +1157,7 @@ class TestAnalysis(unittest.TestCase):
             # the initial measurements.
             #
             #####################################################
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.request_work()
             self.assertSequenceEqual(response.image_set_numbers, [1, 2])
             response = worker.send(anarequest.InitialMeasurements(worker.analysis_id))()
@@ -1214,7 +1229,7 @@ class TestAnalysis(unittest.TestCase):
             #
             #####################################################
             worker.connect(self.analysis.runner.boundary.request_address,
-                           self.analysis.runner.analysis_id)
+                           self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.request_work()
             response = worker.send(anarequest.InitialMeasurements(worker.analysis_id))()
             client_measurements = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
@@ -1309,6 +1324,107 @@ class TestAnalysis(unittest.TestCase):
                 objects_relationship,
             )
 
+    def test_06_08_measurements_delta(self):
+        #
+        # Test merging a worker's measurements delta
+        #
+        LOGGER.debug(
+            "Entering %s" % inspect.getframeinfo(inspect.currentframe()).function
+        )
+        self.wants_analysis_finished = True
+        pipeline, m = self.make_pipeline_and_measurements_and_start()
+        r = numpy.random.RandomState()
+        r.seed(68)
+        with self.FakeWorker() as worker:
+            worker.connect(self.analysis.runner.boundary.request_address,
+                           self.analysis.runner.analysis_id, self.analysis.runner.token)
+            response = worker.request_work()
+            response = worker.send(anarequest.InitialMeasurements(worker.analysis_id))()
+            initial_measurements = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
+                response.buf
+            )
+            client_measurements = cellprofiler_core.measurement.Measurements(
+                copy=initial_measurements
+            )
+            initial_measurements.close()
+            dictionaries = [{} for module in pipeline.modules()]
+            response = worker.send(
+                anareply.ImageSetSuccessWithDictionary(
+                    worker.analysis_id, 1, dictionaries
+                )
+            )()
+            n_objects = 10
+            objects_measurements = r.uniform(size=n_objects)
+            objects_relationship = r.permutation(n_objects) + 1
+            client_measurements[
+                cellprofiler_core.constants.measurement.IMAGE, IMAGE_FEATURE, 1
+            ] = "Hello"
+            client_measurements[OBJECTS_NAME, OBJECTS_FEATURE, 1] = objects_measurements
+            client_measurements.add_relate_measurement(
+                1,
+                "Foo",
+                OBJECTS_NAME,
+                OBJECTS_NAME,
+                numpy.ones(n_objects, int),
+                numpy.arange(1, n_objects + 1),
+                numpy.ones(n_objects, int),
+                objects_relationship,
+            )
+            req = anarequest.MeasurementsReport(
+                worker.analysis_id,
+                None,
+                image_set_numbers=[1],
+                delta=client_measurements.get_delta([1]).get_state(),
+            )
+            client_measurements.close()
+            response_fn = worker.send(req)
+
+            self.check_display_post_run_requests(pipeline)
+
+            result = self.event_queue.get()
+            self.assertIsInstance(result, cellprofiler_core.analysis.event.Finished)
+            self.assertFalse(result.cancelled)
+            measurements = result.measurements
+            self.assertSequenceEqual(measurements.get_image_numbers(), [1])
+            self.assertEqual(
+                measurements[
+                    cellprofiler_core.constants.measurement.IMAGE, IMAGE_FEATURE, 1
+                ],
+                "Hello",
+            )
+            numpy.testing.assert_almost_equal(
+                measurements[OBJECTS_NAME, OBJECTS_FEATURE, 1], objects_measurements
+            )
+            numpy.testing.assert_array_equal(
+                measurements[OBJECTS_NAME, "ObjectNumber", 1],
+                numpy.arange(1, n_objects + 1),
+            )
+            r = measurements.get_relationships(1, "Foo", OBJECTS_NAME, OBJECTS_NAME)
+            self.assertEqual(len(r), n_objects)
+            numpy.testing.assert_array_equal(
+                r[cellprofiler_core.constants.measurement.R_SECOND_OBJECT_NUMBER],
+                objects_relationship,
+            )
+
+    def test_06_09_status_table(self):
+        pipeline, m = self.make_pipeline_and_measurements(nimage_sets=4)
+        self.measurements_to_close = m
+        runner = Runner(uuid.uuid4().hex, pipeline, None, None)
+        runner.reset_image_set_status([2, 3, 4])
+        self.assertEqual(runner.get_status_counts()[Runner.STATUS_UNPROCESSED], 3)
+        runner.set_image_set_status([2, 3], Runner.STATUS_IN_PROCESS)
+        runner.set_image_set_status([2], Runner.STATUS_DONE)
+        counts = runner.get_status_counts()
+        self.assertEqual(counts[Runner.STATUS_UNPROCESSED], 1)
+        self.assertEqual(counts[Runner.STATUS_IN_PROCESS], 1)
+        self.assertEqual(counts[Runner.STATUS_DONE], 1)
+        self.assertFalse(m.has_feature("Image", Runner.STATUS))
+        runner.flush_image_set_status(m)
+        self.assertFalse(m.has_feature("Image", Runner.STATUS))
+        runner.flush_image_set_status(m, force=True)
+        self.assertEqual(m["Image", Runner.STATUS, 2], Runner.STATUS_DONE)
+        self.assertEqual(m["Image", Runner.STATUS, 3], Runner.STATUS_IN_PROCESS)
+
     def test_06_07_worker_cancel(self):
         #
         # Test worker sending AnalysisCancelRequest
@@ -1327,7 +1443,7 @@ class TestAnalysis(unittest.TestCase):
             # the initial measurements.
             #
             #####################################################
-            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id)
+            worker.connect(self.analysis.runner.boundary.request_address, self.analysis.runner.analysis_id, self.analysis.runner.token)
             response = worker.request_work()
             response = worker.send(anarequest.InitialMeasurements(worker.analysis_id))()
             #####################################################
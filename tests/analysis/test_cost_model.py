@@ -0,0 +1,56 @@
+import cellprofiler_core.measurement
+from cellprofiler_core.analysis._cost_model import CostModel, get_execution_times
+
+
+def make_measurements(execution_times):
+    """Make measurements with the given execution times per image number"""
+    m = cellprofiler_core.measurement.Measurements()
+    image_numbers = list(range(1, len(execution_times) + 1))
+    m["Image", "Group_Number", image_numbers] = [1] * len(image_numbers)
+    known = [i for i, seconds in zip(image_numbers, execution_times) if seconds is not None]
+    if len(known) > 0:
+        for feature, fraction in (
+            ("ExecutionTime_01Images", 0.25),
+            ("ExecutionTime_02Threshold", 0.75),
+        ):
+            m["Image", feature, known] = [
+                execution_times[i - 1] * fraction for i in known
+            ]
+    return m
+
+
+def test_get_execution_times():
+    m = make_measurements([2.0, 4.0])
+    assert get_execution_times(m, [1, 2]) == [2.0, 4.0]
+    m = make_measurements([None, None])
+    assert get_execution_times(m, [1, 2]) == [None, None]
+
+
+def test_longest_job_first_by_length():
+    m = make_measurements([None] * 10)
+    model = CostModel(m, range(1, 11))
+    jobs = [[1, 2], [3], [4, 5, 6, 7, 8], [9, 10]]
+    assert model.sort_jobs(jobs) == [[4, 5, 6, 7, 8], [1, 2], [9, 10], [3]]
+
+
+def test_longest_job_first_by_execution_time():
+    m = make_measurements([1.0, 1.0, 1.0, 10.0, None])
+    model = CostModel(m, range(1, 6))
+    # Image set 5's cost is the mean of the known costs, 3.25
+    assert model.get_image_set_cost(5) == 3.25
+    jobs = [[1, 2, 3], [4], [5]]
+    assert model.sort_jobs(jobs) == [[4], [5], [1, 2, 3]]
+
+
+def test_remaining_seconds():
+    m = make_measurements([None] * 4)
+    model = CostModel(m, range(1, 5))
+    assert model.get_remaining_seconds() is None
+    model.start_time -= 10
+    model.record([1, 2], [2.0, 2.0])
+    # Half the work took 10 seconds
+    assert abs(model.get_remaining_seconds() - 10) < 0.5
+    model.record([1, 2], [2.0, 2.0])
+    assert abs(model.get_remaining_seconds() - 10) < 0.5
+    model.record([3, 4], [2.0, 2.0])
+    assert model.get_remaining_seconds() == 0
@@ -0,0 +1,60 @@
+from cellprofiler_core.analysis._job_batcher import JobBatcher, MAX_JOB_SECONDS
+
+
+def test_single_image_set_until_measured():
+    batcher = JobBatcher(range(1, 101), max_batch_size=64)
+    assert batcher.next_job(4) == [1]
+    assert batcher.next_job(4) == [2]
+
+
+def test_fast_pipeline():
+    batcher = JobBatcher(range(3, 101), max_batch_size=64)
+    batcher.record([0.01, 0.01], 0.05)
+    assert batcher.image_seconds == 0.01
+    # 0.1 sec of overhead per job / (10% of 0.01 sec) = 100 image sets,
+    # limited by the number left per worker
+    job = batcher.next_job(4)
+    assert job == list(range(3, 16))
+    assert batcher.get_batch_size(1) == 43
+
+
+def test_unknown_execution_times():
+    batcher = JobBatcher(range(1, 101), max_batch_size=64)
+    batcher.record([None, None], 0.05)
+    assert batcher.image_seconds is None
+    assert batcher.next_job(4) == [1]
+    batcher.record([None, 0.02], 0.05)
+    assert batcher.image_seconds == 0.02
+
+
+def test_max_batch_size():
+    batcher = JobBatcher(range(1, 1001), max_batch_size=16)
+    batcher.record([0.001], 0.05)
+    assert len(batcher.next_job(1)) == 16
+
+
+def test_slow_pipeline():
+    batcher = JobBatcher(range(1, 101), max_batch_size=64)
+    batcher.record([10.0], 0.05)
+    assert batcher.next_job(1) == [1]
+
+
+def test_max_job_seconds():
+    batcher = JobBatcher(range(1, 101), max_batch_size=64)
+    batcher.record([MAX_JOB_SECONDS / 4], 60.0)
+    assert batcher.get_batch_size(1) == 4
+
+
+def test_shrink_at_end():
+    batcher = JobBatcher(range(1, 101), max_batch_size=64)
+    batcher.record([0.001], 0.05)
+    sizes = []
+    while True:
+        job = batcher.next_job(2)
+        if job is None:
+            break
+        sizes.append(len(job))
+    assert sum(sizes) == 100
+    assert sizes == sorted(sizes, reverse=True)
+    assert sizes[0] == 25
+    assert sizes[-1] == 1
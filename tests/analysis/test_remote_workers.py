@@ -0,0 +1,106 @@
+"""test_remote_workers.py - test workers that join a running analysis
+"""
+
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import time
+
+import imageio
+import numpy
+
+import cellprofiler_core.analysis.event
+import cellprofiler_core.measurement
+import cellprofiler_core.pipeline
+import cellprofiler_core.preferences
+from cellprofiler_core.analysis._analysis import Analysis
+from cellprofiler_core.image import ImageSetList
+from cellprofiler_core.modules.groups import Groups
+from cellprofiler_core.modules.images import Images
+from cellprofiler_core.modules.metadata import Metadata
+from cellprofiler_core.modules.namesandtypes import NamesAndTypes
+from cellprofiler_core.utilities.pathname import pathname2url
+from cellprofiler_core.workspace import Workspace
+
+cellprofiler_core.preferences.set_headless()
+
+NUM_IMAGE_SETS = 6
+
+NUM_WORKERS = 2
+
+
+def make_pipeline_and_measurements(directory):
+    pipeline = cellprofiler_core.pipeline.Pipeline()
+    for module_num, module_class in enumerate(
+        (Images, Metadata, NamesAndTypes, Groups), 1
+    ):
+        module = module_class()
+        module.set_module_num(module_num)
+        module.show_window = False
+        pipeline.add_module(module)
+    r = numpy.random.RandomState(25)
+    urls = []
+    for i in range(NUM_IMAGE_SETS):
+        path = os.path.join(directory, "img%d.png" % i)
+        imageio.imwrite(path, (r.uniform(size=(20, 20)) * 255).astype(numpy.uint8))
+        urls.append(pathname2url(path))
+    pipeline.add_urls(urls)
+    m = cellprofiler_core.measurement.Measurements(mode="memory")
+    workspace = Workspace(pipeline, None, None, None, m, ImageSetList())
+    assert pipeline.prepare_run(workspace)
+    return pipeline, m
+
+
+def test_workers_join_running_analysis():
+    directory = tempfile.mkdtemp()
+    pipeline, m = make_pipeline_and_measurements(directory)
+    events = queue.Queue()
+    analysis = Analysis(pipeline, m)
+    # The analysis starts no workers of its own
+    analysis.start(events.put, num_workers=0)
+    workers = []
+    try:
+        assert isinstance(events.get(), cellprofiler_core.analysis.event.Started)
+        arguments = analysis.get_connection_arguments()
+        assert arguments[arguments.index("--work-server") + 1].startswith("tcp://")
+        assert arguments[arguments.index("--token") + 1] == analysis.runner.token
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "-m", "cellprofiler_core.worker"] + arguments,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            for _ in range(NUM_WORKERS)
+        ]
+        while True:
+            event = events.get(timeout=60)
+            if isinstance(event, cellprofiler_core.analysis.event.Finished):
+                break
+        assert not event.cancelled
+        image_numbers = list(range(1, NUM_IMAGE_SETS + 1))
+        assert all(
+            status == "Done"
+            for status in event.measurements["Image", "ProcessingStatus", image_numbers]
+        )
+        # One worker may finish all of the image sets before the other asks
+        # for work. Workers keep asking until the analysis stops, so wait
+        # for both to be recorded.
+        deadline = time.time() + 60
+        while (
+            analysis.runner.get_worker_count() < NUM_WORKERS
+            and time.time() < deadline
+        ):
+            time.sleep(0.1)
+        assert analysis.runner.get_worker_count() == NUM_WORKERS
+        event.measurements.close()
+        analysis.cancel()
+        # The workers stop when the analysis does
+        for worker in workers:
+            assert worker.wait(timeout=30) == 0
+    finally:
+        analysis.cancel()
+        for worker in workers:
+            if worker.poll() is None:
+                worker.kill()
@@ -159,3 +159,54 @@ class TestImage:
         x.channelstack = True
 
         assert x.channelstack == True
+
+    def test_lazy_conversion(self):
+        data = numpy.array([[0, 32768], [65535, 1]], dtype=numpy.uint16)
+
+        x = cellprofiler_core.image.Image(image=data, lazy=True)
+
+        assert not x.is_converted
+        assert x.raw_pixel_data is data
+        assert x.raw_scale == 65535
+        assert x.multichannel == False
+        assert x.mask.shape == (2, 2)
+        assert not x.is_converted
+
+        pixel_data = x.pixel_data
+
+        assert x.is_converted
+        assert pixel_data.dtype == numpy.float32
+        numpy.testing.assert_array_almost_equal(pixel_data, data / 65535.0)
+        assert x.pixel_data is pixel_data
+        assert x.raw_pixel_data is data
+
+    def test_lazy_conversion_signed(self):
+        data = numpy.array([-128, 0, 127], dtype=numpy.int8)
+
+        x = cellprofiler_core.image.Image(image=data, lazy=True)
+
+        numpy.testing.assert_array_almost_equal(
+            (x.raw_pixel_data - x.raw_offset) / x.raw_scale, x.pixel_data
+        )
+        assert x.pixel_data[0] == 0
+        assert x.pixel_data[2] == 1
+
+    def test_lazy_conversion_float(self):
+        data = numpy.ones((10, 10), dtype=numpy.float64)
+
+        x = cellprofiler_core.image.Image(image=data, lazy=True)
+
+        assert x.is_converted
+        assert x.raw_pixel_data is x.pixel_data
+        assert x.raw_scale == 1.0
+
+    def test_set_image_after_lazy(self):
+        x = cellprofiler_core.image.Image(
+            image=numpy.ones((10, 10), dtype=numpy.uint8), lazy=True
+        )
+
+        x.pixel_data = numpy.zeros((10, 10), dtype=numpy.uint8)
+
+        assert x.is_converted
+        assert x.raw_pixel_data.dtype == numpy.float32
+        assert numpy.all(x.pixel_data == 0)
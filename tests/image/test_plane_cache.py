@@ -0,0 +1,47 @@
+import threading
+
+import numpy
+
+from cellprofiler_core.image import PlaneCache
+
+
+def make_plane(nbytes):
+    return numpy.zeros(nbytes, numpy.uint8), 255, []
+
+
+class TestPlaneCache:
+    def test_put_pop(self):
+        cache = PlaneCache(max_bytes=100)
+        plane = make_plane(10)
+        assert cache.put("key", plane)
+        assert cache.nbytes == 10
+        assert cache.pop("key") is plane
+        assert cache.nbytes == 0
+        assert cache.pop("key") is None
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_budget(self):
+        cache = PlaneCache(max_bytes=100)
+        assert cache.put("first", make_plane(60))
+        assert not cache.put("second", make_plane(60))
+        assert "second" not in cache
+        cache.discard("first")
+        assert cache.nbytes == 0
+        assert cache.put("second", make_plane(60))
+
+    def test_reserve(self):
+        cache = PlaneCache(max_bytes=100)
+        assert cache.reserve("key")
+        assert not cache.reserve("key")
+        cache.cancel("key")
+        assert cache.pop("key") is None
+
+    def test_pop_waits_for_pending(self):
+        cache = PlaneCache(max_bytes=100)
+        plane = make_plane(10)
+        assert cache.reserve("key")
+        timer = threading.Timer(0.1, cache.put, args=("key", plane))
+        timer.start()
+        assert cache.pop("key") is plane
+        timer.join()
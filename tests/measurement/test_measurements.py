@@ -10,6 +10,7 @@ import six.moves
 
 import cellprofiler_core.constants.measurement
 import cellprofiler_core.measurement
+import cellprofiler_core.utilities.measurement
 
 OBJECT_NAME = "myobjects"
 FEATURE_NAME = "feature"
@@ -1437,3 +1438,136 @@ class TestMeasurements:
             numpy.testing.assert_array_equal(ri2[rorder], ei2[eorder])
             numpy.testing.assert_array_equal(ro1[rorder], eo1[eorder])
             numpy.testing.assert_array_equal(ro2[rorder], eo2[eorder])
+
+    def test_get_delta(self):
+        m0 = cellprofiler_core.measurement.Measurements()
+        m0.add_measurement(
+            cellprofiler_core.constants.measurement.IMAGE,
+            "URL_DNA",
+            ["file:///a.tif", "file:///b.tif", "file:///c.tif"],
+            image_set_number=[1, 2, 3],
+        )
+        m = cellprofiler_core.measurement.Measurements(copy=m0)
+        r = numpy.random.RandomState(16)
+        values = {}
+        for image_number, count in ((2, 3), (3, 0)):
+            m.image_set_number = image_number
+            m.add_image_measurement("Count_Nuclei", count)
+            m.add_image_measurement("Metadata_Well", "A%02d" % image_number)
+            values[image_number] = r.uniform(size=count)
+            m.add_measurement(OBJECT_NAME, FEATURE_NAME, values[image_number])
+        m.add_relate_measurement(
+            1,
+            "Foo",
+            OBJECT_NAME,
+            OBJECT_NAME,
+            numpy.array([2, 2]),
+            numpy.array([1, 2]),
+            numpy.array([2, 2]),
+            numpy.array([2, 3]),
+        )
+        state = m.get_delta([2, 3]).get_state()
+        delta = cellprofiler_core.measurement.MeasurementsDelta.from_state(state)
+        assert delta.image_numbers == [2, 3]
+        assert not delta.has_feature(
+            cellprofiler_core.constants.measurement.IMAGE, "URL_DNA"
+        )
+        assert delta[cellprofiler_core.constants.measurement.IMAGE, "Count_Nuclei", [2, 3]] == [3, 0]
+        assert delta[cellprofiler_core.constants.measurement.IMAGE, "Metadata_Well", [2, 3]] == ["A02", "A03"]
+        for image_number, value in zip(
+            (2, 3), delta[OBJECT_NAME, FEATURE_NAME, [2, 3]]
+        ):
+            numpy.testing.assert_array_almost_equal(value, values[image_number])
+        (key,) = delta.get_relationship_groups()
+        assert key.relationship == "Foo"
+        rr = delta.get_relationships(
+            1, "Foo", OBJECT_NAME, OBJECT_NAME
+        )
+        numpy.testing.assert_array_equal(
+            rr[cellprofiler_core.constants.measurement.R_SECOND_OBJECT_NUMBER], [2, 3]
+        )
+        m.close()
+        m0.close()
+
+    def test_load_measurements_from_buffer(self):
+        m = cellprofiler_core.measurement.Measurements()
+        m.add_image_measurement("Metadata_Well", "A01")
+        m.add_measurement(OBJECT_NAME, FEATURE_NAME, numpy.arange(4.0))
+        buf = m.file_contents()
+        m.close()
+        m = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(buf)
+        assert m.hdf5_dict.filename is None
+        assert m[cellprofiler_core.constants.measurement.IMAGE, "Metadata_Well", 1] == "A01"
+        numpy.testing.assert_array_equal(
+            m[OBJECT_NAME, FEATURE_NAME, 1], numpy.arange(4.0)
+        )
+        m2 = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
+            m.file_contents()
+        )
+        m.close()
+        assert m2[cellprofiler_core.constants.measurement.IMAGE, "Metadata_Well", 1] == "A01"
+        m2.close()
+
+    def test_get_image_column(self):
+        m = cellprofiler_core.measurement.Measurements()
+        m.add_all_measurements(
+            cellprofiler_core.constants.measurement.IMAGE,
+            FEATURE_NAME,
+            [1.5, None, 3.5],
+        )
+        m.add_all_measurements(
+            cellprofiler_core.constants.measurement.IMAGE,
+            "Metadata_Well",
+            ["A01", "A02", None],
+        )
+        values, valid = m.get_image_column(FEATURE_NAME)
+        numpy.testing.assert_array_equal(valid, [True, False, True])
+        numpy.testing.assert_array_equal(values[valid], [1.5, 3.5])
+        assert numpy.isnan(values[1])
+        values, valid = m.get_image_column("Metadata_Well", [3, 1])
+        numpy.testing.assert_array_equal(valid, [False, True])
+        assert values[1] == "A01"
+        m.close()
+
+    def test_get_object_column(self):
+        m = cellprofiler_core.measurement.Measurements()
+        r = numpy.random.RandomState(67)
+        expected = {}
+        for image_number, count in ((1, 3), (2, 0), (3, 5)):
+            m.image_set_number = image_number
+            m.add_image_measurement("Count_%s" % OBJECT_NAME, count)
+            expected[image_number] = r.uniform(size=count)
+            m.add_measurement(OBJECT_NAME, FEATURE_NAME, expected[image_number])
+        values, offsets = m.get_object_column(OBJECT_NAME, FEATURE_NAME, [3, 2, 1, 4])
+        numpy.testing.assert_array_equal(offsets, [0, 5, 5, 8, 8])
+        numpy.testing.assert_array_almost_equal(
+            values, numpy.hstack([expected[3], expected[1]])
+        )
+        m.close()
+
+    def test_aggregate_measurements_for_image_sets(self):
+        m = cellprofiler_core.measurement.Measurements()
+        r = numpy.random.RandomState(71)
+        expected = {}
+        for image_number, count in ((1, 6), (2, 0), (3, 7), (4, 2)):
+            m.image_set_number = image_number
+            values = r.uniform(size=count)
+            if count > 1:
+                values[0] = numpy.NaN
+            m.add_measurement(OBJECT_NAME, "Foo", values)
+            m.add_measurement(OBJECT_NAME, "Bar", ["x"] * count)
+            expected[image_number] = values[numpy.isfinite(values)]
+        d = m.compute_aggregate_measurements_for_image_sets([4, 1, 2, 3])
+        for agg_name, fn in (
+            (cellprofiler_core.constants.measurement.AGG_MEAN, numpy.mean),
+            (cellprofiler_core.constants.measurement.AGG_MEDIAN, numpy.median),
+            (cellprofiler_core.constants.measurement.AGG_STD_DEV, numpy.std),
+        ):
+            result = d["%s_%s_Foo" % (agg_name, OBJECT_NAME)]
+            for i, image_number in enumerate((4, 1, 2, 3)):
+                if len(expected[image_number]) == 0:
+                    assert numpy.isnan(result[i])
+                else:
+                    assert round(abs(result[i] - fn(expected[image_number])), 7) == 0
+            assert numpy.all(numpy.isnan(d["%s_%s_Bar" % (agg_name, OBJECT_NAME)]))
+        m.close()
@@ -2,10 +2,14 @@ import io
 import os
 import tempfile
 
+import imageio
+import numpy
+
 import cellprofiler_core.constants.modules.images
 import cellprofiler_core.measurement
 import cellprofiler_core.pipeline
 import cellprofiler_core.pipeline.event._load_exception
+import cellprofiler_core.preferences
 import cellprofiler_core.workspace
 import cellprofiler_core.modules.images
 import cellprofiler_core.modules.metadata
@@ -216,3 +220,45 @@ class TestImages:
         self.check(module, url, True, extract=True)
         # We need to use the same image later with different shape params.
         os.remove(path)
+
+    def test_extract_planes_parallel(self):
+        directory = tempfile.mkdtemp()
+        shapes = [(21 + i, 31, 3) for i in range(6)]
+        urls = []
+        for i, shape in enumerate(shapes):
+            path = os.path.join(directory, "img%d.png" % i)
+            imageio.imwrite(path, numpy.zeros(shape, numpy.uint8))
+            urls.append(pathname2url(path))
+        for mode in cellprofiler_core.preferences.EXTRACTION_MODES:
+            cellprofiler_core.preferences.set_metadata_extraction_workers(3, globally=False)
+            cellprofiler_core.preferences.set_metadata_extraction_mode(mode, globally=False)
+            try:
+                module = cellprofiler_core.modules.images.Images()
+                module.want_split.value = True
+                pipeline = cellprofiler_core.pipeline.Pipeline()
+                pipeline.add_urls(urls)
+                module.set_module_num(1)
+                pipeline.add_module(module)
+                m = cellprofiler_core.measurement.Measurements()
+                workspace = cellprofiler_core.workspace.Workspace(
+                    pipeline, module, None, None, m, None
+                )
+                file_list = pipeline.get_filtered_file_list(workspace)
+                assert len(file_list) == len(urls)
+                module.prepare_run(workspace)
+                for file_object in file_list:
+                    assert file_object.extracted
+                    shape = shapes[urls.index(file_object.url)]
+                    expected = [3, 1, 1, shape[0], shape[1]]
+                    plane_meta = file_object.metadata
+                    assert [
+                        plane_meta[k][0] for k in ("SizeC", "SizeZ", "SizeT", "SizeY", "SizeX")
+                    ] == expected
+                    stored_metadata, _ = workspace.file_list.get_metadata(file_object.url)
+                    assert list(stored_metadata) == expected
+                assert len(pipeline.get_image_plane_list(workspace)) == 3 * len(urls)
+            finally:
+                cellprofiler_core.preferences.set_metadata_extraction_workers(1, globally=False)
+                cellprofiler_core.preferences.set_metadata_extraction_mode(
+                    cellprofiler_core.preferences.EXTRACTION_MODE_THREADS, globally=False
+                )
@@ -528,6 +528,70 @@ C10,BRD041618,1.5,2
             pass
 
 
+def test_imported_extraction_index_reuse():
+    metadata_csv = """WellName,Treatment
+B08,DMSO
+B08,Duplicate
+"""
+    filenum, path = tempfile.mkstemp(suffix=".csv")
+    fd = os.fdopen(filenum, "w")
+    fd.write(metadata_csv)
+    fd.close()
+    try:
+        module = cellprofiler_core.modules.metadata.Metadata()
+        module.wants_metadata.value = True
+        em = module.extraction_methods[0]
+        em.filter_choice.value = (
+            cellprofiler_core.constants.modules.metadata.F_ALL_IMAGES
+        )
+        em.extraction_method.value = (
+            cellprofiler_core.constants.modules.metadata.X_MANUAL_EXTRACTION
+        )
+        em.source.value = cellprofiler_core.constants.modules.metadata.XM_FILE_NAME
+        em.file_regexp.value = "^(?P<Plate>[^_]+)_(?P<Well>[A-Ha-h][0-9]{2})"
+        module.add_extraction_method()
+        em = module.extraction_methods[1]
+        em.filter_choice.value = (
+            cellprofiler_core.constants.modules.metadata.F_ALL_IMAGES
+        )
+        em.extraction_method.value = (
+            cellprofiler_core.constants.modules.metadata.X_IMPORTED_EXTRACTION
+        )
+        directory, filename = os.path.split(path)
+        em.csv_location.value = "{}|{}".format(
+            cellprofiler_core.preferences.ABSOLUTE_FOLDER_NAME, directory
+        )
+        em.csv_filename.value = filename
+        em.csv_joiner.value = '[{"%s":"WellName","%s":"Well"}]' % (
+            module.CSV_JOIN_NAME,
+            module.IPD_JOIN_NAME,
+        )
+        em.wants_case_insensitive.value = True
+        url = "file:/imaging/analysis/P-12345_b08.tif"
+        #
+        # The first matching row wins
+        #
+        check(module, url, [{"Well": "b08", "Treatment": "DMSO"}])
+        index = em.imported_metadata_index
+        assert len(index) == 1
+        check(module, url, [{"Well": "b08", "Treatment": "DMSO"}])
+        assert em.imported_metadata_index is index
+        #
+        # Changing the file invalidates the index
+        #
+        with open(path, "w") as fd:
+            fd.write("WellName,Treatment\nB08,Changed\n")
+        mtime = os.stat(path).st_mtime + 10
+        os.utime(path, (mtime, mtime))
+        check(module, url, [{"Well": "b08", "Treatment": "Changed"}])
+        assert em.imported_metadata_index is not index
+    finally:
+        try:
+            os.unlink(path)
+        except:
+            pass
+
+
 def test_imported_extraction_case_insensitive():
     metadata_csv = """WellName,Treatment
 b08,DMSO
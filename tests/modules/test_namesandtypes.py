@@ -14,15 +14,19 @@ import zlib
 
 import cellprofiler_core.constants.image
 import cellprofiler_core.constants.measurement
+import cellprofiler_core.image
 import cellprofiler_core.measurement
 import cellprofiler_core.modules.namesandtypes
 import cellprofiler_core.object
 import cellprofiler_core.pipeline
 import cellprofiler_core.utilities.image
 import cellprofiler_core.utilities.pathname
+import cellprofiler_core.worker._image_prefetcher
 import cellprofiler_core.workspace
 import tests.modules
+from cellprofiler_core.constants.measurement import C_TILE_X, C_TILE_Y
 from cellprofiler_core.pipeline import ImageFile, ImagePlane
+from cellprofiler_core.setting import ValidationError
 
 M0, M1, M2, M3, M4, M5, M6 = ["MetadataKey%d" % i for i in range(7)]
 C0, C1, C2, C3, C4, C5, C6 = ["Column%d" % i for i in range(7)]
@@ -1807,6 +1811,234 @@ def test_load_monochrome():
     assert numpy.all(pixel_data <= 1)
 
 
+def test_prefetch_monochrome():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "prefetch.png")
+    target = numpy.arange(21 * 31, dtype=numpy.uint8).reshape(21, 31)
+    imageio.imwrite(path, target)
+    workspace = run_workspace(
+        path, cellprofiler_core.modules.namesandtypes.LOAD_AS_GRAYSCALE_IMAGE
+    )
+    module = workspace.pipeline.modules()[0]
+    providers = module.get_prefetch_providers(workspace, 1)
+    assert len(providers) == 1
+    assert providers[0].get_name() == IMAGE_NAME
+    key = providers[0].get_plane_key()
+    cache = cellprofiler_core.image.get_plane_cache()
+    prefetcher = cellprofiler_core.worker._image_prefetcher.ImagePrefetcher(
+        workspace.pipeline
+    )
+    try:
+        prefetcher.prefetch(workspace.measurements, 1)
+        hits = cache.hits
+        image = module.get_prefetch_providers(workspace, 1)[0].provide_image(None)
+        assert cache.hits == hits + 1
+        assert key not in cache
+        numpy.testing.assert_array_almost_equal(image.pixel_data, target / 255.0)
+    finally:
+        prefetcher.close()
+
+
+def test_prefetch_plane_too_large(monkeypatch):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "prefetch.png")
+    imageio.imwrite(path, numpy.zeros((21, 31), numpy.uint8))
+    workspace = run_workspace(
+        path, cellprofiler_core.modules.namesandtypes.LOAD_AS_GRAYSCALE_IMAGE
+    )
+    module = workspace.pipeline.modules()[0]
+    provider = module.get_prefetch_providers(workspace, 1)[0]
+    provider.plane_shape = (21, 31, 1)
+    assert provider.get_plane_nbytes() == 21 * 31 * 4
+    key = provider.get_plane_key()
+    cache = cellprofiler_core.image.PlaneCache(max_bytes=21 * 31 * 4 - 1)
+    monkeypatch.setattr(
+        cellprofiler_core.worker._image_prefetcher, "get_plane_cache", lambda: cache
+    )
+    assert cache.reserve(key)
+    cellprofiler_core.worker._image_prefetcher.ImagePrefetcher.read(provider, key)
+    assert key not in cache
+    assert key not in cache.pending
+
+
+def test_prefetch_drop_stale_plane(monkeypatch):
+    cache = cellprofiler_core.image.PlaneCache(max_bytes=1024)
+    monkeypatch.setattr(
+        cellprofiler_core.worker._image_prefetcher, "get_plane_cache", lambda: cache
+    )
+    prefetcher = cellprofiler_core.worker._image_prefetcher.ImagePrefetcher(
+        cellprofiler_core.pipeline.Pipeline()
+    )
+    try:
+        key = ("file:/foo.png", 0, 0, None, 0, 0, True, 0, None)
+        #
+        # The plane is still being read when its image set is dropped
+        #
+        prefetcher.keys = [key]
+        prefetcher.in_flight.add(key)
+        prefetcher.prefetch(cellprofiler_core.measurement.Measurements(), 1)
+        prefetcher.prefetch(cellprofiler_core.measurement.Measurements(), 2)
+        assert key in prefetcher.stale
+        cache.reserve(key)
+        cache.put(key, (numpy.zeros((4, 4), numpy.float32), 1, []))
+        prefetcher.read_done(key, None)
+        assert key not in cache
+        assert key not in prefetcher.in_flight
+    finally:
+        prefetcher.close()
+
+
+def test_tiles():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "tiles.png")
+    target = (numpy.arange(50 * 70) % 256).astype(numpy.uint8).reshape(50, 70)
+    imageio.imwrite(path, target)
+    image_file = ImageFile(cellprofiler_core.utilities.pathname.pathname2url(path))
+    image_file.extract_planes()
+    n = cellprofiler_core.modules.namesandtypes.NamesAndTypes()
+    n.assignment_method.value = cellprofiler_core.modules.namesandtypes.ASSIGN_ALL
+    n.single_image_provider.value = IMAGE_NAME
+    n.single_load_as_choice.value = (
+        cellprofiler_core.modules.namesandtypes.LOAD_AS_GRAYSCALE_IMAGE
+    )
+    n.wants_tiles.value = True
+    n.tile_size.value = 32
+    n.tile_overlap.value = 8
+    n.module_num = 1
+    pipeline = cellprofiler_core.pipeline.Pipeline()
+    pipeline.add_module(n)
+    pipeline.set_image_plane_list([ImagePlane(image_file, series=0)])
+    m = cellprofiler_core.measurement.Measurements()
+    workspace = cellprofiler_core.workspace.Workspace(
+        pipeline, n, m, cellprofiler_core.object.ObjectSet(), m, None
+    )
+    assert n.prepare_run(workspace)
+    # Tiles start at x = 0, 24, 48 and y = 0, 24
+    assert m.image_set_count == 6
+    tile_x = cellprofiler_core.constants.measurement.C_METADATA + "_" + C_TILE_X
+    tile_y = cellprofiler_core.constants.measurement.C_METADATA + "_" + C_TILE_Y
+    assert list(m.get_all_measurements("Image", tile_x)) == [0, 24, 48] * 2
+    assert list(m.get_all_measurements("Image", tile_y)) == [0] * 3 + [24] * 3
+    m.image_set_number = 6
+    workspace = cellprofiler_core.workspace.Workspace(
+        pipeline, n, m, cellprofiler_core.object.ObjectSet(), m, None
+    )
+    n.run(workspace)
+    image = workspace.image_set.get_image(IMAGE_NAME)
+    numpy.testing.assert_array_almost_equal(
+        image.pixel_data, target[24:50, 48:70] / 255.0
+    )
+
+
+def test_tiles_with_illumination_single_image(caplog):
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "tiles.png")
+    imageio.imwrite(path, numpy.zeros((50, 70), numpy.uint8))
+    image_file = ImageFile(cellprofiler_core.utilities.pathname.pathname2url(path))
+    image_file.extract_planes()
+    illum_path = os.path.join(directory, "illum.npy")
+    numpy.save(illum_path, numpy.ones((50, 70)))
+    illum_file = ImageFile(
+        cellprofiler_core.utilities.pathname.pathname2url(illum_path)
+    )
+    n = cellprofiler_core.modules.namesandtypes.NamesAndTypes()
+    n.assignment_method.value = cellprofiler_core.modules.namesandtypes.ASSIGN_RULES
+    n.assignments[0].image_name.value = IMAGE_NAME
+    n.assignments[0].load_as_choice.value = (
+        cellprofiler_core.modules.namesandtypes.LOAD_AS_GRAYSCALE_IMAGE
+    )
+    n.add_single_image()
+    n.single_images[0].image_name.value = ALT_IMAGE_NAME
+    n.single_images[0].load_as_choice.value = (
+        cellprofiler_core.modules.namesandtypes.LOAD_AS_ILLUMINATION_FUNCTION
+    )
+    n.wants_tiles.value = True
+    n.tile_size.value = 32
+    n.tile_overlap.value = 8
+    image_sets = [
+        {
+            IMAGE_NAME: ImagePlane(image_file, series=0),
+            ALT_IMAGE_NAME: ImagePlane(illum_file),
+        }
+        for _ in range(3)
+    ]
+    tiled_image_sets = n.make_tiles(image_sets)
+    assert len(tiled_image_sets) == 18
+    assert tiled_image_sets[-1][IMAGE_NAME].tile == (48, 24, 22, 26)
+    for image_set in tiled_image_sets:
+        assert image_set[ALT_IMAGE_NAME].tile is None
+    #
+    # Image sets whose size is unknown are logged once
+    #
+    image_sets = [{IMAGE_NAME: ImagePlane(illum_file)} for _ in range(3)]
+    caplog.clear()
+    assert len(n.make_tiles(image_sets)) == 3
+    assert len([r for r in caplog.records if "won't be divided" in r.getMessage()]) == 1
+
+
+def test_tiles_untiled_image_set():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "image.npy")
+    numpy.save(path, numpy.zeros((50, 70)))
+    image_file = ImageFile(cellprofiler_core.utilities.pathname.pathname2url(path))
+    n = cellprofiler_core.modules.namesandtypes.NamesAndTypes()
+    n.assignment_method.value = cellprofiler_core.modules.namesandtypes.ASSIGN_ALL
+    n.single_image_provider.value = IMAGE_NAME
+    n.single_load_as_choice.value = (
+        cellprofiler_core.modules.namesandtypes.LOAD_AS_GRAYSCALE_IMAGE
+    )
+    n.wants_tiles.value = True
+    n.tile_size.value = 32
+    n.tile_overlap.value = 8
+    n.module_num = 1
+    pipeline = cellprofiler_core.pipeline.Pipeline()
+    pipeline.add_module(n)
+    pipeline.set_image_plane_list([ImagePlane(image_file)])
+    m = cellprofiler_core.measurement.Measurements()
+    workspace = cellprofiler_core.workspace.Workspace(
+        pipeline, n, m, cellprofiler_core.object.ObjectSet(), m, None
+    )
+    assert n.prepare_run(workspace)
+    # The image's size is unknown, so it is a single tile at 0, 0
+    assert m.image_set_count == 1
+    tile_x = cellprofiler_core.constants.measurement.C_METADATA + "_" + C_TILE_X
+    tile_y = cellprofiler_core.constants.measurement.C_METADATA + "_" + C_TILE_Y
+    assert list(m.get_all_measurements("Image", tile_x)) == [0]
+    assert list(m.get_all_measurements("Image", tile_y)) == [0]
+
+
+def test_tile_metadata_key_validation():
+    import cellprofiler_core.modules.metadata
+    from cellprofiler_core.constants.modules.metadata import X_MANUAL_EXTRACTION
+
+    metadata = cellprofiler_core.modules.metadata.Metadata()
+    metadata.wants_metadata.value = True
+    em = metadata.extraction_methods[0]
+    em.extraction_method.value = X_MANUAL_EXTRACTION
+    em.file_regexp.value = "^(?P<Plate>[^_]+)_(?P<TileX>[0-9]+)"
+    metadata.module_num = 1
+    n = cellprofiler_core.modules.namesandtypes.NamesAndTypes()
+    n.module_num = 2
+    pipeline = cellprofiler_core.pipeline.Pipeline()
+    pipeline.add_module(metadata)
+    pipeline.add_module(n)
+    # TileX is only taken when images are divided into tiles
+    metadata.validate_module(pipeline)
+    n.validate_module(pipeline)
+    n.wants_tiles.value = True
+    with pytest.raises(ValidationError):
+        n.validate_module(pipeline)
+
+
+def test_tile_overlap_validation():
+    n = cellprofiler_core.modules.namesandtypes.NamesAndTypes()
+    n.wants_tiles.value = True
+    n.tile_size.value = 32
+    n.tile_overlap.value = 32
+    with pytest.raises(ValidationError):
+        n.validate_module(None)
+
+
 def test_load_color_as_monochrome():
     shape = (21, 31, 3)
     path = tests.modules.maybe_download_example_image(
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import threading
+
+import imageio
+import numpy
+
+from cellprofiler_core.image import FileImage
+from cellprofiler_core.reader import FrameCache, get_frame_cache
+
+
+def test_decode_once():
+    cache = FrameCache()
+    calls = []
+
+    def decode():
+        calls.append(None)
+        return numpy.zeros((10, 20, 3), numpy.uint8)
+
+    frame = cache.get(("file:/foo/bar.png", 0, None, None, None), decode)
+    assert cache.get(("file:/foo/bar.png", 0, None, None, None), decode) is frame
+    assert len(calls) == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+    cache.clear()
+    assert len(cache) == 0
+    cache.get(("file:/foo/bar.png", 0, None, None, None), decode)
+    assert len(calls) == 2
+
+
+def test_budget():
+    cache = FrameCache(max_bytes=100)
+    first = ("file:/foo/first.png", 0, None, None, None)
+    second = ("file:/foo/second.png", 0, None, None, None)
+    big = ("file:/foo/big.png", 0, None, None, None)
+    cache.get(first, lambda: numpy.zeros(60, numpy.uint8))
+    cache.get(second, lambda: numpy.zeros(60, numpy.uint8))
+    assert first not in cache
+    assert second in cache
+    cache.get(big, lambda: numpy.zeros(200, numpy.uint8))
+    assert big not in cache
+    assert cache.nbytes == 60
+
+
+def test_disabled():
+    cache = FrameCache(max_bytes=0)
+    key = ("file:/foo/bar.png", 0, None, None, None)
+    calls = []
+
+    def decode():
+        calls.append(None)
+        return numpy.zeros(10, numpy.uint8)
+
+    cache.get(key, decode)
+    cache.get(key, decode)
+    assert len(calls) == 2
+    assert key not in cache
+
+
+def test_budget_preference():
+    import cellprofiler_core.preferences
+
+    cache = FrameCache()
+    value = cellprofiler_core.preferences.get_frame_cache_mb()
+    try:
+        cellprofiler_core.preferences.set_frame_cache_mb(1, globally=False)
+        assert cache.max_bytes == 1024 * 1024
+    finally:
+        cellprofiler_core.preferences.set_frame_cache_mb(value, globally=False)
+
+
+def test_concurrent_decode():
+    cache = FrameCache()
+    key = ("file:/foo/bar.png", 0, None, None, None)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def decode():
+        calls.append(None)
+        started.set()
+        release.wait()
+        return numpy.zeros(10, numpy.uint8)
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(cache.get(key, decode)))
+    thread.start()
+    started.wait()
+    threading.Timer(0.1, release.set).start()
+    frame = cache.get(key, decode)
+    thread.join()
+    assert len(calls) == 1
+    assert results[0] is frame
+
+
+def test_channels_share_decode():
+    directory = tempfile.mkdtemp()
+    pixels = numpy.random.RandomState(14).randint(0, 255, (10, 20, 3)).astype(numpy.uint8)
+    imageio.imwrite(os.path.join(directory, "image.png"), pixels)
+    cache = get_frame_cache()
+    cache.clear()
+    misses = cache.misses
+    providers = [
+        FileImage("channel%d" % c, directory, "image.png", rescale=False, channel=c)
+        for c in range(3)
+    ]
+    try:
+        for c, provider in enumerate(providers):
+            image = provider.provide_image(None)
+            numpy.testing.assert_array_almost_equal(image.pixel_data, pixels[:, :, c] / 255.0)
+            assert image.pixel_data.flags.writeable
+        assert cache.misses == misses + 1
+    finally:
+        for provider in providers:
+            provider.release_memory()
+        cache.clear()
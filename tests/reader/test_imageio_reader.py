@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+import imageio
+import numpy
+import tifffile
+
+from cellprofiler_core.constants.image import MD_SIZE_S, MD_SIZE_C, MD_SIZE_Z, MD_SIZE_T, MD_SIZE_Y, MD_SIZE_X
+from cellprofiler_core.pipeline import ImageFile
+from cellprofiler_core.readers.imageio_reader import ImageIOReader
+from cellprofiler_core.utilities.pathname import pathname2url
+
+
+def get_series_metadata(path, decode):
+    reader = ImageIOReader(ImageFile(pathname2url(path)))
+    try:
+        if not decode:
+            def get_data(*args, **kwargs):
+                raise AssertionError("Pixel data should not be decoded")
+
+            reader.get_reader().get_data = get_data
+        else:
+            reader.get_frame_shapes = lambda *args: None
+        return dict(reader.get_series_metadata())
+    finally:
+        reader.close()
+
+
+def check_probe(path, expected):
+    probed = get_series_metadata(path, False)
+    assert probed == get_series_metadata(path, True)
+    for key, value in expected.items():
+        assert probed[key] == value
+
+
+def test_probe_png():
+    path = os.path.join(tempfile.mkdtemp(), "rgb.png")
+    imageio.imwrite(path, numpy.zeros((10, 20, 3), numpy.uint8))
+    check_probe(path, {MD_SIZE_S: 1, MD_SIZE_Y: [10], MD_SIZE_X: [20], MD_SIZE_C: [3]})
+
+
+def test_probe_gif():
+    path = os.path.join(tempfile.mkdtemp(), "movie.gif")
+    r = numpy.random.RandomState(13)
+    imageio.mimwrite(path, [r.randint(0, 255, (10, 20, 3)).astype(numpy.uint8) for _ in range(4)])
+    check_probe(path, {MD_SIZE_S: 4, MD_SIZE_Y: [10] * 4, MD_SIZE_X: [20] * 4, MD_SIZE_C: [3] * 4})
+
+
+def test_probe_tiff():
+    path = os.path.join(tempfile.mkdtemp(), "pages.tif")
+    with tifffile.TiffWriter(path) as writer:
+        for i in range(3):
+            writer.write(numpy.zeros((10 + i, 20), numpy.uint16))
+    check_probe(
+        path,
+        {MD_SIZE_S: 3, MD_SIZE_Y: [10, 11, 12], MD_SIZE_X: [20] * 3, MD_SIZE_Z: [1] * 3, MD_SIZE_T: [1] * 3},
+    )
@@ -0,0 +1,124 @@
+import os
+import tempfile
+
+import numpy
+import pytest
+import zarr
+
+import cellprofiler_core.preferences
+from cellprofiler_core.image import MonochromeImage
+from cellprofiler_core.pipeline import ImageFile
+from cellprofiler_core.readers.ngff_reader import ChunkCache, NGFFReader, get_zarr_store_cache
+from cellprofiler_core.utilities.pathname import pathname2url
+
+
+def make_zarr(directory, name, data):
+    path = os.path.join(directory, name)
+    group = zarr.open_group(path, mode="w")
+    group.create_dataset("0", data=data, chunks=(1, 1, 1, 20, 25))
+    group.attrs["multiscales"] = [{"datasets": [{"path": "0"}], "version": "0.4"}]
+    return pathname2url(path)
+
+
+def make_data():
+    return numpy.arange(2 * 3 * 40 * 50, dtype=numpy.uint16).reshape(1, 2, 3, 40, 50)
+
+
+def test_chunk_cache():
+    data = make_data()
+    url = make_zarr(tempfile.mkdtemp(), "image.zarr", data)
+    cache = get_zarr_store_cache()
+    cache.clear()
+    reader = NGFFReader(ImageFile(url))
+    image = reader.read(c=1, z=2, t=0, rescale=False)
+    numpy.testing.assert_array_equal(image, data[0, 1, 2])
+    misses = cache.chunk_cache.misses
+    hits = cache.chunk_cache.hits
+    other = NGFFReader(ImageFile(url))
+    tile = other.read(c=1, z=2, t=0, rescale=False, xywh=(0, 0, 10, 10))
+    numpy.testing.assert_array_equal(tile, data[0, 1, 2, :10, :10])
+    assert cache.hits >= 1
+    assert cache.chunk_cache.misses == misses
+    assert cache.chunk_cache.hits > hits
+    cache.clear()
+
+
+def test_store_cache_bounded():
+    directory = tempfile.mkdtemp()
+    urls = [make_zarr(directory, "image%d.zarr" % i, make_data()) for i in range(3)]
+    cache = get_zarr_store_cache()
+    cache.clear()
+    cellprofiler_core.preferences.set_zarr_store_cache_size(2, globally=False)
+    try:
+        for url in urls:
+            NGFFReader(ImageFile(url)).read(c=0, z=0, t=0)
+        assert len(cache) == 2
+        roots = [NGFFReader(ImageFile(url)).root for url in urls]
+        assert roots[0] not in cache
+        assert all(key[0] != roots[0] for key in cache.chunk_cache.values)
+        assert roots[1] in cache and roots[2] in cache
+    finally:
+        cellprofiler_core.preferences.set_zarr_store_cache_size(
+            cellprofiler_core.preferences.DEFAULT_ZARR_STORE_CACHE_SIZE, globally=False
+        )
+        cache.clear()
+
+
+def test_chunk_cache_budget():
+    cache = ChunkCache(max_bytes=100)
+    cache.put(("root", "0/0"), b"x" * 60)
+    cache.put(("root", "0/1"), b"x" * 60)
+    assert cache.get(("root", "0/0")) is None
+    assert cache.get(("root", "0/1")) is not None
+    cache.put(("root", "0/2"), b"x" * 200)
+    assert cache.get(("root", "0/2")) is None
+    assert cache.nbytes == 60
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def make_pyramid(directory, name, data):
+    path = os.path.join(directory, name)
+    group = zarr.open_group(path, mode="w")
+    group.create_dataset("0", data=data, chunks=(1, 1, 1, 20, 25))
+    group.create_dataset("1", data=data[..., ::2, ::2], chunks=(1, 1, 1, 20, 25))
+    group.attrs["multiscales"] = [
+        {"datasets": [{"path": "0"}, {"path": "1"}], "version": "0.4"}
+    ]
+    return pathname2url(path)
+
+
+def test_read_resolution():
+    data = make_data()
+    url = make_pyramid(tempfile.mkdtemp(), "pyramid.zarr", data)
+    get_zarr_store_cache().clear()
+    reader = NGFFReader(ImageFile(url))
+    assert reader.get_resolution_count() == 2
+    assert reader.get_resolution_scale(0, 1) == (1.0, 2.0, 2.0)
+    image = reader.read(c=1, z=2, t=0, rescale=False, resolution=1)
+    numpy.testing.assert_array_equal(image, data[0, 1, 2, ::2, ::2])
+    with pytest.raises(IOError):
+        reader.read(c=1, z=2, t=0, resolution=2)
+    get_zarr_store_cache().clear()
+
+
+def test_provide_resolution():
+    data = make_data()
+    url = make_pyramid(tempfile.mkdtemp(), "pyramid.zarr", data)
+    get_zarr_store_cache().clear()
+    provider = MonochromeImage("image", url, None, None, 1, rescale=False, z=2, t=0, resolution=1)
+    try:
+        image = provider.provide_image(None)
+        assert image.pixel_data.shape == (20, 25)
+    finally:
+        provider.release_memory()
+    provider = MonochromeImage(
+        "image", url, None, None, 1, volume=True, spacing=(2.0, 1.0, 1.0), t=0, resolution=1
+    )
+    try:
+        image = provider.provide_image(None)
+        assert image.pixel_data.shape == (3, 20, 25)
+        assert image.spacing == (1.0, 1.0, 1.0)
+    finally:
+        provider.release_memory()
+    get_zarr_store_cache().clear()
@@ -0,0 +1,146 @@
+import os
+import tempfile
+
+import imageio
+import numpy
+
+import cellprofiler_core.preferences
+from cellprofiler_core.image import FileImage
+from cellprofiler_core.pipeline import ImageFile
+from cellprofiler_core.reader import ReaderPool, get_reader_pool
+
+
+class MockReader:
+    def __init__(self, image_file):
+        self.file = image_file
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class OtherReader(MockReader):
+    pass
+
+
+def set_limits(pool_size, max_open):
+    cellprofiler_core.preferences.set_reader_pool_size(pool_size, globally=False)
+    cellprofiler_core.preferences.set_max_open_readers(max_open, globally=False)
+
+
+def reset_limits():
+    set_limits(
+        cellprofiler_core.preferences.DEFAULT_READER_POOL_SIZE,
+        cellprofiler_core.preferences.DEFAULT_MAX_OPEN_READERS,
+    )
+
+
+def test_reuse():
+    pool = ReaderPool()
+    image_file = ImageFile("file:/foo/bar.tif")
+    reader = pool.checkout(image_file, MockReader)
+    pool.checkin(reader)
+    assert not reader.closed
+    assert len(pool) == 1
+    assert pool.checkout(ImageFile("file:/foo/bar.tif"), MockReader) is reader
+    assert pool.hits == 1
+    assert pool.misses == 1
+    assert len(pool) == 0
+
+
+def test_key_includes_reader_class():
+    pool = ReaderPool()
+    image_file = ImageFile("file:/foo/bar.tif")
+    reader = pool.checkout(image_file, MockReader)
+    pool.checkin(reader)
+    other = pool.checkout(image_file, OtherReader)
+    assert other is not reader
+    assert isinstance(other, OtherReader)
+
+
+def test_concurrent_checkout():
+    pool = ReaderPool()
+    image_file = ImageFile("file:/foo/bar.tif")
+    reader1 = pool.checkout(image_file, MockReader)
+    reader2 = pool.checkout(image_file, MockReader)
+    assert reader1 is not reader2
+
+
+def test_lru_eviction():
+    set_limits(2, 64)
+    try:
+        pool = ReaderPool()
+        readers = [
+            pool.checkout(ImageFile("file:/foo/bar%d.tif" % i), MockReader)
+            for i in range(3)
+        ]
+        for reader in readers:
+            pool.checkin(reader)
+        assert len(pool) == 2
+        assert readers[0].closed
+        assert not readers[1].closed
+        assert not readers[2].closed
+        # Using bar1 makes bar2 the least recently used
+        pool.checkin(pool.checkout(ImageFile("file:/foo/bar1.tif"), MockReader))
+        pool.checkin(pool.checkout(ImageFile("file:/foo/bar3.tif"), MockReader))
+        assert readers[2].closed
+        assert not readers[1].closed
+    finally:
+        reset_limits()
+
+
+def test_max_open_budget():
+    set_limits(8, 2)
+    try:
+        pool = ReaderPool()
+        reader1 = pool.checkout(ImageFile("file:/foo/bar1.tif"), MockReader)
+        pool.checkin(reader1)
+        reader2 = pool.checkout(ImageFile("file:/foo/bar2.tif"), MockReader)
+        assert not reader1.closed
+        reader3 = pool.checkout(ImageFile("file:/foo/bar3.tif"), MockReader)
+        # Opening a third reader closes the idle one to stay within budget
+        assert reader1.closed
+        assert len(pool) == 0
+        pool.checkin(reader2)
+        pool.checkin(reader3)
+        assert len(pool) == 2
+    finally:
+        reset_limits()
+
+
+def test_pool_disabled():
+    set_limits(0, 64)
+    try:
+        pool = ReaderPool()
+        reader = pool.checkout(ImageFile("file:/foo/bar.tif"), MockReader)
+        pool.checkin(reader)
+        assert reader.closed
+        assert len(pool) == 0
+    finally:
+        reset_limits()
+
+
+def test_close_all():
+    pool = ReaderPool()
+    reader = pool.checkout(ImageFile("file:/foo/bar.tif"), MockReader)
+    pool.checkin(reader)
+    pool.close_all()
+    assert reader.closed
+    assert len(pool) == 0
+
+
+def test_file_image_reuses_reader():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "image.png")
+    imageio.imwrite(path, numpy.zeros((10, 20), numpy.uint8))
+    get_reader_pool().close_all()
+    provider = FileImage("image", directory, "image.png")
+    reader = provider.get_reader()
+    assert provider.provide_image(None).pixel_data.shape == (10, 20)
+    provider.release_memory()
+    assert len(get_reader_pool()) == 1
+    other = FileImage("image", directory, "image.png")
+    assert other.get_reader() is reader
+    assert other.provide_image(None).pixel_data.shape == (10, 20)
+    other.release_memory()
+    get_reader_pool().close_all()
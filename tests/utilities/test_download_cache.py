@@ -0,0 +1,180 @@
+import functools
+import http.server
+import os
+import tempfile
+import threading
+
+import imageio
+import numpy
+import pytest
+
+import cellprofiler_core.preferences
+import cellprofiler_core.utilities.download_cache as DC
+from cellprofiler_core.image import MonochromeImage
+from cellprofiler_core.utilities.image import download_to_temp_file, _download_to_temp_file
+
+
+class CountingHandler(http.server.SimpleHTTPRequestHandler):
+    gets = 0
+
+    def do_GET(self):
+        CountingHandler.gets += 1
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    directory = tempfile.mkdtemp()
+    handler = functools.partial(CountingHandler, directory=directory)
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    CountingHandler.gets = 0
+    yield directory, "http://127.0.0.1:%d" % httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def write_image(directory, name, data, mtime=None):
+    path = os.path.join(directory, name)
+    imageio.imwrite(path, data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_hit(server):
+    directory, root = server
+    data = numpy.arange(200, dtype=numpy.uint8).reshape(10, 20)
+    write_image(directory, "image.png", data)
+    url = root + "/image.png"
+    cache = DC.DownloadCache(tempfile.mkdtemp(), max_bytes=1024 * 1024)
+    signature = DC.get_remote_signature(url)
+    assert signature is not None
+    path = cache.get(url, signature, _download_to_temp_file, ".png")
+    assert path.endswith(".png")
+    numpy.testing.assert_array_equal(imageio.imread(path), data)
+    assert cache.get(url, signature, _download_to_temp_file, ".png") == path
+    assert CountingHandler.gets == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert len(cache) == 1
+
+
+def test_changed_file(server):
+    directory, root = server
+    write_image(directory, "image.png", numpy.zeros((10, 20), numpy.uint8), 1000000)
+    url = root + "/image.png"
+    cache = DC.DownloadCache(tempfile.mkdtemp(), max_bytes=1024 * 1024)
+    path = cache.get(url, DC.get_remote_signature(url), _download_to_temp_file, ".png")
+    data = numpy.ones((10, 20), numpy.uint8)
+    write_image(directory, "image.png", data, 2000000)
+    other = cache.get(url, DC.get_remote_signature(url), _download_to_temp_file, ".png")
+    assert other != path
+    numpy.testing.assert_array_equal(imageio.imread(other), data)
+    assert CountingHandler.gets == 2
+
+
+def test_eviction(server):
+    directory, root = server
+    for name in ("a.png", "b.png"):
+        write_image(directory, name, numpy.random.randint(0, 255, (50, 50), numpy.uint8))
+    size = os.path.getsize(os.path.join(directory, "a.png"))
+    cache = DC.DownloadCache(tempfile.mkdtemp(), max_bytes=size, min_age=0)
+    url_a = root + "/a.png"
+    url_b = root + "/b.png"
+    path_a = cache.get(url_a, DC.get_remote_signature(url_a), _download_to_temp_file, ".png")
+    path_b = cache.get(url_b, DC.get_remote_signature(url_b), _download_to_temp_file, ".png")
+    assert not os.path.exists(path_a)
+    assert os.path.exists(path_b)
+    assert len(cache) == 1
+
+
+def test_keep_recently_used(server):
+    directory, root = server
+    for name in ("a.png", "b.png"):
+        write_image(directory, name, numpy.random.randint(0, 255, (50, 50), numpy.uint8))
+    size = os.path.getsize(os.path.join(directory, "a.png"))
+    cache = DC.DownloadCache(tempfile.mkdtemp(), max_bytes=size)
+    url_a = root + "/a.png"
+    url_b = root + "/b.png"
+    path_a = cache.get(url_a, DC.get_remote_signature(url_a), _download_to_temp_file, ".png")
+    path_b = cache.get(url_b, DC.get_remote_signature(url_b), _download_to_temp_file, ".png")
+    # Another worker may not have opened the first file yet
+    assert os.path.exists(path_a)
+    assert os.path.exists(path_b)
+    mtime = os.stat(path_a).st_mtime - DC.MIN_ENTRY_AGE - 1
+    os.utime(path_a, (mtime, mtime))
+    cache.evict()
+    assert not os.path.exists(path_a)
+
+
+def test_concurrent_download(server):
+    directory, root = server
+    write_image(directory, "image.png", numpy.zeros((10, 20), numpy.uint8))
+    url = root + "/image.png"
+    cache = DC.DownloadCache(tempfile.mkdtemp(), max_bytes=1024 * 1024)
+    signature = DC.get_remote_signature(url)
+    paths = []
+
+    def get():
+        other = DC.DownloadCache(cache.directory, max_bytes=1024 * 1024)
+        paths.append(other.get(url, signature, _download_to_temp_file, ".png"))
+
+    threads = [threading.Thread(target=get) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(paths)) == 1
+    assert CountingHandler.gets == 1
+
+
+def test_provider_reads_cached_copy(server):
+    directory, root = server
+    data = numpy.arange(200, dtype=numpy.uint8).reshape(10, 20)
+    write_image(directory, "image.png", data)
+    url = root + "/image.png"
+    temp_dir = cellprofiler_core.preferences.get_temporary_directory()
+    cellprofiler_core.preferences.set_temporary_directory(tempfile.mkdtemp())
+    try:
+        path = download_to_temp_file(url)
+        assert os.path.dirname(path) == os.path.join(
+            cellprofiler_core.preferences.get_temporary_directory(),
+            DC.CACHE_DIRECTORY_NAME,
+        )
+        for _ in range(2):
+            provider = MonochromeImage("image", url, None, None, None, rescale=False)
+            numpy.testing.assert_array_almost_equal(
+                provider.provide_image(None).pixel_data, data / 255.0
+            )
+            provider.release_memory()
+        assert os.path.exists(path)
+        assert CountingHandler.gets == 1
+    finally:
+        cellprofiler_core.preferences.set_temporary_directory(temp_dir)
+
+
+def test_numpy_provider_reads_cached_copy(server):
+    directory, root = server
+    data = numpy.arange(200, dtype=numpy.float64).reshape(10, 20) / 200
+    numpy.save(os.path.join(directory, "illum.npy"), data)
+    url = root + "/illum.npy"
+    temp_dir = cellprofiler_core.preferences.get_temporary_directory()
+    cellprofiler_core.preferences.set_temporary_directory(tempfile.mkdtemp())
+    try:
+        for _ in range(2):
+            provider = MonochromeImage("illum", url, None, None, None, rescale=False)
+            numpy.testing.assert_array_almost_equal(
+                provider.provide_image(None).pixel_data, data
+            )
+            path = provider.get_full_name()
+            assert DC.is_cached_download(path)
+            provider.release_memory()
+            assert os.path.exists(path)
+        assert CountingHandler.gets == 1
+    finally:
+        cellprofiler_core.preferences.set_temporary_directory(temp_dir)
@@ -338,6 +338,70 @@ class TestHDF5Dict(unittest.TestCase):
         del self.hdf5_dict[OBJECT_NAME, FEATURE_NAME]
         self.assertFalse(self.hdf5_dict.has_feature(OBJECT_NAME, FEATURE_NAME))
 
+    def test_10_01_buffered_write(self):
+        self.hdf5_dict.start_buffering()
+        self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 1] = np.array([1, 2, 3])
+        self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 2] = np.array([4.5])
+        self.hdf5_dict[OBJECT_NAME, ALT_FEATURE_NAME, 1] = "Hello"
+        self.assertNotIn(OBJECT_NAME, self.hdf5_dict.top_group)
+        self.assertTrue(self.hdf5_dict.has_feature(OBJECT_NAME, FEATURE_NAME))
+        self.assertTrue(self.hdf5_dict.has_data(OBJECT_NAME, FEATURE_NAME, 2))
+        self.assertFalse(self.hdf5_dict.has_data(OBJECT_NAME, FEATURE_NAME, 3))
+        np.testing.assert_array_equal(
+            self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 1], [1, 2, 3]
+        )
+        self.assertEqual(self.hdf5_dict[OBJECT_NAME, ALT_FEATURE_NAME, 1], "Hello")
+        self.hdf5_dict.stop_buffering()
+        self.assertEqual(
+            len(self.hdf5_dict.top_group[OBJECT_NAME][FEATURE_NAME]["index"]), 2
+        )
+        np.testing.assert_array_equal(
+            self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 1], [1.0, 2.0, 3.0]
+        )
+        self.assertEqual(self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 2], 4.5)
+        self.assertEqual(self.hdf5_dict[OBJECT_NAME, ALT_FEATURE_NAME, 1], "Hello")
+
+    def test_10_02_buffered_overwrite(self):
+        self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 1] = 1.5
+        self.hdf5_dict.start_buffering()
+        self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 1] = 2
+        self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 1] = 3
+        self.assertEqual(self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 1], 3.0)
+        self.hdf5_dict.flush()
+        self.assertEqual(self.hdf5_dict[OBJECT_NAME, FEATURE_NAME, 1], 3.0)
+        self.assertEqual(
+            len(self.hdf5_dict.top_group[OBJECT_NAME][FEATURE_NAME]["index"]), 1
+        )
+        self.hdf5_dict.stop_buffering()
+
+
+class TestFeatureIndex(unittest.TestCase):
+    def test_01_01_lookup(self):
+        index = H5DICT.FeatureIndex(
+            np.array([[3, 0, 2], [1, 2, 2], [-1, 2, 5], [4, 5, 6]])
+        )
+        self.assertEqual(len(index), 3)
+        self.assertIn(1, index)
+        self.assertNotIn(2, index)
+        self.assertNotIn(-1, index)
+        np.testing.assert_array_equal(index.keys(), [1, 3, 4])
+        starts, stops, present = index.lookup([4, 2, 3, 1, 10])
+        np.testing.assert_array_equal(present, [True, False, True, True, False])
+        np.testing.assert_array_equal(starts[present], [5, 0, 2])
+        np.testing.assert_array_equal(stops[present], [6, 2, 2])
+
+    def test_01_02_update(self):
+        index = H5DICT.FeatureIndex(np.array([[1, 0, 2]]))
+        slots = index.update(np.array([[1, 2, 4], [100, 4, 5]]))
+        np.testing.assert_array_equal(slots, [0, 1])
+        self.assertEqual(len(index), 2)
+        starts, stops, present = index.lookup([1, 100])
+        np.testing.assert_array_equal(starts, [2, 4])
+        np.testing.assert_array_equal(stops, [4, 5])
+        del index[1]
+        self.assertNotIn(1, index)
+        self.assertEqual(len(index), 1)
+
 
 class TestHDF5FileList(unittest.TestCase):
     def setUp(self):
@@ -771,6 +835,27 @@ class TestHDF5FileList(unittest.TestCase):
                 numpy.testing.assert_array_equal(expected_meta, actual_meta)
                 numpy.testing.assert_array_equal(expected_name, actual_name)
 
+    def test_10_05_add_metadata_batch(self):
+        urls = [
+            "file://foo/foo.jpg",
+            "file://foo/bar.jpg",
+            "file://baz/baz.jpg",
+            "file://baz/qux.jpg",
+        ]
+        filelist = self.filelist
+        filelist.add_files_to_filelist(urls)
+        entries = [
+            (url, numpy.array([i + 1, 1, 1, 10 * i, 20 * i]), ["series%d" % i])
+            for i, url in enumerate(urls[:3])
+        ]
+        filelist.add_metadata_batch(entries)
+        for url, metadata, names in entries:
+            actual_meta, actual_names = filelist.get_metadata(url)
+            numpy.testing.assert_array_equal(metadata, actual_meta)
+            self.assertSequenceEqual(names, actual_names)
+        actual_meta, actual_names = filelist.get_metadata(urls[3])
+        self.assertTrue(numpy.all(actual_meta == -1))
+
     def test_11_01_hasnt_files(self):
         self.assertFalse(self.filelist.has_files())
 
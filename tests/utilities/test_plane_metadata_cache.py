@@ -0,0 +1,160 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import imageio
+import numpy
+
+import cellprofiler_core.pipeline
+import cellprofiler_core.preferences
+import cellprofiler_core.reader
+import cellprofiler_core.utilities.plane_metadata_cache as PMC
+from cellprofiler_core.constants.image import MD_SIZE_S, MD_SIZE_C, MD_SIZE_Z, MD_SIZE_T, MD_SIZE_Y, MD_SIZE_X, \
+    MD_SERIES_NAME
+from cellprofiler_core.utilities.pathname import pathname2url
+
+READER = "cellprofiler_core.readers.imageio_reader.ImageIOReader:1:read_tif=False"
+
+
+class TestPlaneMetadataCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = PMC.PlaneMetadataCache(os.path.join(self.directory, "cache.sqlite"))
+        self.meta_dict = {
+            MD_SIZE_S: 2,
+            MD_SIZE_C: [3, 1],
+            MD_SIZE_Z: [1, 4],
+            MD_SIZE_T: [1, 1],
+            MD_SIZE_Y: [21, 40],
+            MD_SIZE_X: [31, 50],
+            MD_SERIES_NAME: ["first", "second"],
+        }
+
+    def tearDown(self):
+        self.cache.close()
+
+    def make_image(self, name, shape):
+        path = os.path.join(self.directory, name)
+        imageio.imwrite(path, numpy.zeros(shape, numpy.uint8))
+        return pathname2url(path)
+
+    def test_01_01_get_missing(self):
+        self.assertIsNone(self.cache.get("file:/foo/bar.tif", READER, "1:1"))
+
+    def test_01_02_put_get(self):
+        url = "file:/foo/bar.tif"
+        self.cache.put(url, READER, "1:1", self.meta_dict)
+        self.assertEqual(self.cache.get(url, READER, "1:1"), self.meta_dict)
+
+    def test_01_03_changed_signature(self):
+        url = "file:/foo/bar.tif"
+        self.cache.put(url, READER, "1:1", self.meta_dict)
+        self.assertIsNone(self.cache.get(url, READER, "1:2"))
+
+    def test_01_04_persistent(self):
+        url = "file:/foo/bar.tif"
+        self.cache.put(url, READER, "1:1", self.meta_dict)
+        other = PMC.PlaneMetadataCache(self.cache.path)
+        try:
+            self.assertEqual(other.get(url, READER, "1:1"), self.meta_dict)
+        finally:
+            other.close()
+
+    def test_01_05_clear(self):
+        url = "file:/foo/bar.tif"
+        self.cache.put(url, READER, "1:1", self.meta_dict)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(url, READER, "1:1"))
+
+    def test_01_06_other_reader(self):
+        url = "file:/foo/bar.tif"
+        self.cache.put(url, READER, "1:1", self.meta_dict)
+        other_reader = "cellprofiler_core.readers.bioformats_reader.BioformatsReader:1"
+        self.assertIsNone(self.cache.get(url, other_reader, "1:1"))
+        self.assertEqual(self.cache.get(url, READER, "1:1"), self.meta_dict)
+
+    def test_01_07_prune_max_entries(self):
+        self.cache.max_entries = 2
+        for i in range(3):
+            self.cache.put(f"file:/foo/bar{i}.tif", READER, "1:1", self.meta_dict)
+        self.cache.prune()
+        self.assertIsNone(self.cache.get("file:/foo/bar0.tif", READER, "1:1"))
+        self.assertEqual(self.cache.get("file:/foo/bar2.tif", READER, "1:1"), self.meta_dict)
+
+    def test_01_08_prune_max_age(self):
+        url = "file:/foo/bar.tif"
+        self.cache.put(url, READER, "1:1", self.meta_dict)
+        self.cache.max_age = -1
+        self.cache.prune()
+        self.assertIsNone(self.cache.get(url, READER, "1:1"))
+
+    def test_01_09_reader_signature_settings(self):
+        from cellprofiler_core.readers.imageio_reader import ImageIOReader
+
+        key = f"Reader.{ImageIOReader.reader_name}.read_tif"
+        settings = {}
+
+        def config_read_typed(k, key_type):
+            return settings.get(k)
+
+        with unittest.mock.patch.object(PMC, "config_read_typed", config_read_typed):
+            default = PMC.get_reader_signature(ImageIOReader)
+            settings[key] = False
+            signature = PMC.get_reader_signature(ImageIOReader)
+            settings[key] = True
+            self.assertNotEqual(signature, PMC.get_reader_signature(ImageIOReader))
+            self.assertIn(default, (signature, PMC.get_reader_signature(ImageIOReader)))
+
+    def test_02_01_file_signature(self):
+        url = self.make_image("foo.png", (10, 20))
+        signature = PMC.get_file_signature(url)
+        self.assertIsNotNone(signature)
+        self.assertEqual(signature, PMC.get_file_signature(url))
+        path = os.path.join(self.directory, "foo.png")
+        mtime = os.stat(path).st_mtime + 10
+        os.utime(path, (mtime, mtime))
+        self.assertNotEqual(signature, PMC.get_file_signature(url))
+
+    def test_02_02_missing_file_signature(self):
+        url = pathname2url(os.path.join(self.directory, "missing.png"))
+        self.assertIsNone(PMC.get_file_signature(url))
+
+    def test_02_03_remote_signature_off(self):
+        self.assertIsNone(PMC.get_plane_signature("http://example.com/foo.png"))
+
+    def test_03_01_extract_planes_from_cache(self):
+        temp_dir = cellprofiler_core.preferences.get_temporary_directory()
+        cellprofiler_core.preferences.set_temporary_directory(self.directory)
+        try:
+            self.check_extract_planes_from_cache()
+        finally:
+            cellprofiler_core.preferences.set_temporary_directory(temp_dir)
+
+    def check_extract_planes_from_cache(self):
+        url = self.make_image("bar.png", (21, 31, 3))
+        image_file = cellprofiler_core.pipeline.ImageFile(url)
+        image_file.extract_planes()
+        self.assertEqual(image_file.metadata[MD_SIZE_Y], [21])
+        cache = PMC.get_plane_metadata_cache()
+        signature = PMC.get_file_signature(url)
+        reader = PMC.get_reader_signature(
+            cellprofiler_core.reader.get_image_reader_class(image_file)
+        )
+        cached = cache.get(url, reader, signature)
+        self.assertEqual(cached[MD_SIZE_C], [3])
+        #
+        # Doctor the cache to show that the reader isn't consulted
+        #
+        cached[MD_SIZE_Y] = [99]
+        cache.put(url, reader, signature, cached)
+        image_file = cellprofiler_core.pipeline.ImageFile(url)
+        image_file.extract_planes()
+        self.assertEqual(image_file.metadata[MD_SIZE_Y], [99])
+        cellprofiler_core.preferences.set_cache_plane_metadata(False, globally=False)
+        try:
+            image_file = cellprofiler_core.pipeline.ImageFile(url)
+            image_file.extract_planes()
+            self.assertEqual(image_file.metadata[MD_SIZE_Y], [21])
+        finally:
+            cellprofiler_core.preferences.set_cache_plane_metadata(True, globally=False)
@@ -0,0 +1,252 @@
+import queue
+import socket
+import time
+
+import numpy
+import pytest
+import zmq
+
+import cellprofiler_core.preferences
+from cellprofiler_core.preferences import PAYLOAD_COMPRESSION_LZ4, PAYLOAD_COMPRESSION_ZLIB
+from cellprofiler_core.analysis.request import Display, Work
+from cellprofiler_core.utilities.zmq import (
+    _compression,
+    get_codec,
+    get_supported_codecs,
+    get_transfer_statistics,
+    json_decode,
+    json_encode,
+)
+from cellprofiler_core.utilities.zmq._boundary import Boundary, get_advertised_host
+from cellprofiler_core.utilities.zmq.communicable import Communicable
+from cellprofiler_core.utilities.zmq.communicable.reply import Reply
+from cellprofiler_core.utilities.zmq.communicable.reply.upstream_exit import BoundaryExited
+from cellprofiler_core.utilities.zmq.communicable.request import Request
+
+cellprofiler_core.preferences.set_headless()
+
+
+def test_arrays_are_read_only_views():
+    data = numpy.arange(12, dtype=numpy.float32).reshape(3, 4)
+    json_str, buffers = json_encode({"data": data})
+    buffers = [bytearray(memoryview(buf)) for buf in buffers]
+    result = json_decode(json_str, buffers)["data"]
+    numpy.testing.assert_array_equal(result, data)
+    assert not result.flags.writeable
+    assert not result.flags.owndata
+    with pytest.raises(ValueError):
+        result[0, 0] = 1
+    result = json_decode(json_str, buffers, copy=True)["data"]
+    assert result.flags.writeable
+    result[0, 0] = 1
+
+
+def test_narrow_integers():
+    data = numpy.arange(10, dtype=numpy.int64)
+    json_str, buffers = json_encode({"data": data}, narrow_integers=False)
+    assert json_decode(json_str, buffers)["data"].dtype == numpy.int64
+    json_str, buffers = json_encode({"data": data}, narrow_integers=True)
+    result = json_decode(json_str, buffers)["data"]
+    assert result.dtype == numpy.int32
+    numpy.testing.assert_array_equal(result, data)
+    # Values that don't fit are left alone
+    data[0] = 2 ** 40
+    json_str, buffers = json_encode({"data": data}, narrow_integers=True)
+    assert json_decode(json_str, buffers)["data"].dtype == numpy.int64
+
+
+def test_send_and_recv():
+    context = zmq.Context()
+    sender = context.socket(zmq.PAIR)
+    receiver = context.socket(zmq.PAIR)
+    try:
+        sender.bind("inproc://test_send_and_recv")
+        receiver.connect("inproc://test_send_and_recv")
+        image = numpy.random.RandomState(23).uniform(size=(20, 30))
+        Reply(image=image, labels=numpy.zeros((0, 3), int), name="foo").send(sender)
+        reply = Reply.recv(receiver)
+        numpy.testing.assert_array_equal(reply.image, image)
+        assert not reply.image.flags.writeable
+        assert reply.labels.shape == (0, 3)
+        assert reply.name == "foo"
+    finally:
+        sender.close()
+        receiver.close()
+        context.term()
+
+
+def test_display_arrays_are_writeable():
+    context = zmq.Context()
+    sender = context.socket(zmq.PAIR)
+    receiver = context.socket(zmq.PAIR)
+    try:
+        sender.bind("inproc://test_display_arrays_are_writeable")
+        receiver.connect("inproc://test_display_arrays_are_writeable")
+        image = numpy.zeros((20, 30))
+        Communicable.send(Display("analysis", display_data={"image": image}), sender)
+        request = Communicable.recv(receiver)
+        assert isinstance(request, Display)
+        request.display_data["image"][0, 0] = 1
+    finally:
+        sender.close()
+        receiver.close()
+        context.term()
+
+
+def test_recv_refuses_other_classes():
+    context = zmq.Context()
+    sender = context.socket(zmq.PAIR)
+    receiver = context.socket(zmq.PAIR)
+    try:
+        sender.bind("inproc://test_recv_refuses_other_classes")
+        receiver.connect("inproc://test_recv_refuses_other_classes")
+        for module, classname in (
+            (b"subprocess", b"Popen"),
+            (b"cellprofiler_core.utilities.zmq.communicable._communicable", b"sys"),
+            (b"cellprofiler_core.analysis.request", b"Nonexistent"),
+        ):
+            sender.send_multipart([module, classname, b'{"args": "ls"}'])
+            with pytest.raises(Communicable.InvalidMessage):
+                Communicable.recv(receiver)
+    finally:
+        sender.close()
+        receiver.close()
+        context.term()
+
+
+def test_boundary_token():
+    boundary = Boundary("tcp://127.0.0.1", token="secret")
+    upward_queue = queue.Queue()
+    boundary.register_analysis("analysis", upward_queue)
+    while not hasattr(boundary, "request_address"):
+        time.sleep(0.01)
+    context = zmq.Context()
+    worker = context.socket(zmq.REQ)
+    worker.setsockopt(zmq.LINGER, 0)
+    try:
+        worker.connect(boundary.request_address)
+        assert isinstance(Work("analysis").send(worker), BoundaryExited)
+        assert isinstance(Work("analysis").send(worker, token="wrong"), BoundaryExited)
+        assert upward_queue.empty()
+        Work("analysis").send_only(worker, token="secret")
+        req = upward_queue.get(timeout=10)
+        assert isinstance(req, Work)
+        assert not hasattr(req, "token")
+        req.reply(Reply(answer=42))
+        assert Reply.recv(worker).answer == 42
+    finally:
+        worker.close()
+        context.term()
+        boundary.join()
+
+
+def test_compression():
+    zeros = numpy.zeros((100, 100))
+    noise = numpy.random.RandomState(24).uniform(size=(100, 100))
+    small = numpy.zeros(10)
+    data = {"zeros": zeros, "noise": noise, "small": small, "buf": memoryview(bytes(10000))}
+    json_str, buffers = json_encode(data, codec=PAYLOAD_COMPRESSION_ZLIB, threshold=1000)
+    # The zeros compress, random numbers don't and the small array is
+    # below the threshold
+    assert len(buffers[0]) < zeros.nbytes / 10
+    assert isinstance(buffers[1], numpy.ndarray)
+    assert isinstance(buffers[2], numpy.ndarray)
+    assert len(buffers[3]) < 1000
+    result = json_decode(json_str, buffers)
+    numpy.testing.assert_array_equal(result["zeros"], zeros)
+    numpy.testing.assert_array_equal(result["noise"], noise)
+    numpy.testing.assert_array_equal(result["small"], small)
+    assert bytes(result["buf"]) == bytes(10000)
+    assert not result["zeros"].flags.writeable
+
+
+def test_get_codec():
+    cellprofiler_core.preferences.set_payload_compression(
+        PAYLOAD_COMPRESSION_LZ4, globally=False
+    )
+    try:
+        # lz4 is only sent to receivers known to have it
+        assert get_codec() == PAYLOAD_COMPRESSION_ZLIB
+        assert get_codec([PAYLOAD_COMPRESSION_ZLIB]) == PAYLOAD_COMPRESSION_ZLIB
+        assert get_codec([]) is None
+        if PAYLOAD_COMPRESSION_LZ4 in get_supported_codecs():
+            assert get_codec(get_supported_codecs()) == PAYLOAD_COMPRESSION_LZ4
+    finally:
+        cellprofiler_core.preferences.set_payload_compression(
+            cellprofiler_core.preferences.PAYLOAD_COMPRESSION_NONE, globally=False
+        )
+
+
+def test_reply_to_receiver_without_lz4(monkeypatch):
+    context = zmq.Context()
+    router = context.socket(zmq.ROUTER)
+    worker = context.socket(zmq.REQ)
+    cellprofiler_core.preferences.set_payload_compression(
+        PAYLOAD_COMPRESSION_LZ4, globally=False
+    )
+    cellprofiler_core.preferences.set_compression_threshold_kb(1, globally=False)
+    try:
+        router.bind("inproc://test_reply_to_receiver_without_lz4")
+        worker.connect("inproc://test_reply_to_receiver_without_lz4")
+        Request(codecs=[PAYLOAD_COMPRESSION_ZLIB]).send_only(worker)
+        req = Request.recv(router, routed=True)
+        # What the Boundary does with the codecs a worker advertises
+        req._peer_codecs = req.codecs
+        req.reply(Reply(image=numpy.zeros((100, 100))))
+        monkeypatch.setattr(_compression, "get_lz4", lambda: None)
+        reply = Reply.recv(worker)
+        numpy.testing.assert_array_equal(reply.image, numpy.zeros((100, 100)))
+    finally:
+        cellprofiler_core.preferences.set_payload_compression(
+            cellprofiler_core.preferences.PAYLOAD_COMPRESSION_NONE, globally=False
+        )
+        cellprofiler_core.preferences.set_compression_threshold_kb(
+            cellprofiler_core.preferences.DEFAULT_COMPRESSION_THRESHOLD_KB,
+            globally=False,
+        )
+        router.close()
+        worker.close()
+        context.term()
+
+
+def test_transfer_statistics():
+    statistics = get_transfer_statistics()
+    context = zmq.Context()
+    sender = context.socket(zmq.PAIR)
+    receiver = context.socket(zmq.PAIR)
+    try:
+        sender.bind("inproc://test_transfer_statistics")
+        receiver.connect("inproc://test_transfer_statistics")
+        cellprofiler_core.preferences.set_payload_compression(
+            PAYLOAD_COMPRESSION_ZLIB, globally=False
+        )
+        cellprofiler_core.preferences.set_compression_threshold_kb(
+            1, globally=False
+        )
+        statistics.reset()
+        Reply(image=numpy.zeros((100, 100))).send(sender)
+        reply = Reply.recv(receiver)
+        numpy.testing.assert_array_equal(reply.image, numpy.zeros((100, 100)))
+        assert statistics.messages_sent == 1
+        assert statistics.messages_received == 1
+        assert statistics.bytes_sent == statistics.bytes_received
+        assert statistics.bytes_sent < 100 * 100 * 8 / 10
+        assert statistics.bytes_before_compression == 100 * 100 * 8
+    finally:
+        cellprofiler_core.preferences.set_payload_compression(
+            cellprofiler_core.preferences.PAYLOAD_COMPRESSION_NONE, globally=False
+        )
+        cellprofiler_core.preferences.set_compression_threshold_kb(
+            cellprofiler_core.preferences.DEFAULT_COMPRESSION_THRESHOLD_KB,
+            globally=False,
+        )
+        sender.close()
+        receiver.close()
+        context.term()
+
+
+def test_advertised_host():
+    assert get_advertised_host("tcp://127.0.0.1") == "127.0.0.1"
+    assert get_advertised_host("tcp://10.1.2.3") == "10.1.2.3"
+    assert get_advertised_host("tcp://*") == socket.gethostname()
+    assert get_advertised_host("tcp://*", "node01") == "node01"
@@ -679,9 +679,8 @@ class TestAnalysisWorker(unittest.TestCase):
         req = self.awthread.recv(self.work_socket)
         self.assertIsInstance(req, anarequest.MeasurementsReport)
         self.assertSequenceEqual(req.image_set_numbers, [1])
-        m = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
-            req.buf
-        )
+        m = cellprofiler_core.measurement.MeasurementsDelta.from_state(req.delta)
+        self.assertSequenceEqual(m.image_numbers, req.image_set_numbers)
 
         req.reply(anareply.Ack())
         self.awthread.ecute()
@@ -764,9 +763,8 @@ class TestAnalysisWorker(unittest.TestCase):
         req = self.awthread.recv(self.work_socket)
         self.assertIsInstance(req, anarequest.MeasurementsReport)
         self.assertSequenceEqual(req.image_set_numbers, [2, 3])
-        m = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
-            req.buf
-        )
+        m = cellprofiler_core.measurement.MeasurementsDelta.from_state(req.delta)
+        self.assertSequenceEqual(m.image_numbers, req.image_set_numbers)
 
         req.reply(anareply.Ack())
         self.awthread.ecute()
@@ -859,9 +857,8 @@ class TestAnalysisWorker(unittest.TestCase):
         req = self.awthread.recv(self.work_socket)
         self.assertIsInstance(req, anarequest.MeasurementsReport)
         self.assertSequenceEqual(req.image_set_numbers, [2, 3])
-        m = cellprofiler_core.utilities.measurement.load_measurements_from_buffer(
-            req.buf
-        )
+        m = cellprofiler_core.measurement.MeasurementsDelta.from_state(req.delta)
+        self.assertSequenceEqual(m.image_numbers, req.image_set_numbers)
 
         req.reply(anareply.Ack())
         self.awthread.ecute()